@@ -0,0 +1,323 @@
+# TrackerPMU/benchmarks/run_benchmarks.py
+"""
+Headless benchmarks for the field page and data_manager data paths.
+
+    python benchmarks/run_benchmarks.py [--scales 1 10 100] [--repeat 3] [--only kpi ingest]
+                                        [--output results.json] [--compare baseline.json]
+
+Synthetic datasets are scaled from the bundled workbooks (BMC readings from the Govind
+compiled report, one copy of every BMC per scale step) and written to a scratch directory,
+so caches, journals and the SQLite database never touch the working tree. Results are
+saved as JSON; --compare prints each benchmark's median against an earlier run.
+
+The field page's data functions live in a Streamlit script and some were replaced while
+being optimized, so the benchmarks keep their names but time the code that now does the
+work, imported without the UI:
+
+    load_data                    dataset_frames(SharedDataset(version)), mapping a published ingestion
+    load_workplans               workplan_journal.load (snapshot plus journal replay)
+    save_workplans               workplan_journal.append (journaling an edited batch)
+    analyze_bmcs                 evaluate_kpis(history).by_kpi(), the low-performing BMCs per KPI
+    generate_actionable_targets  KpiReport.action_items() on an already evaluated report
+    get_next_task_id             data_manager.get_next_task_id, unchanged
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import data_manager  # noqa: E402
+import shared_dataset  # noqa: E402
+import workplan_journal  # noqa: E402
+from bmc_kpis import evaluate_kpis  # noqa: E402
+from bmc_latest import BmcLatestView  # noqa: E402
+from field_data import ROLE_SIGNATURES, dataset_frames, publish_dataset  # noqa: E402
+from ingest import ingest_workbooks  # noqa: E402
+from shared_dataset import SharedDataset  # noqa: E402
+from workbook_cache import CACHE_DIR  # noqa: E402
+from workplan_journal import WORKPLAN_COLUMNS  # noqa: E402
+from workplan_store import WorkplanStore  # noqa: E402
+
+SOURCE_REPORT = os.path.join(REPO_DIR, "GovindCompiledReport_June.xlsx")
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+DEFAULT_SCALES = [1, 10, 100]
+FARMERS_PER_SCALE = 2000
+WORKPLAN_DAYS_PER_SCALE = 60
+TASKS_PER_SCALE = 500
+SAVE_BATCH_ROWS = 20
+MEMBERS = ["Member A", "Member B", "Member C", "Member D", "Member E"]
+ACTIVITIES = ["Monitoring", "Training", "Assessment", "Governance"]
+SEED = 7
+
+
+# --- Synthetic data ---
+def bmc_readings(scale: int) -> pd.DataFrame:
+    """Daily BMC readings in the field page's schema, from the Govind compiled report, `scale` copies of each BMC."""
+    report = pd.read_excel(SOURCE_REPORT)
+    rng = np.random.default_rng(SEED)
+    base = pd.DataFrame({
+        "BMC_Name": report["MCC Name"].astype(str),
+        "District": "Pune",
+        "Capacity_Liters": report["Installed Capacity"],
+        "Daily_Collection_Liters": report["Milk Qty. (LTR)"],
+        "Quality_Fat_Percentage": report["FAT"],
+        "Quality_SNF_Percentage": report["SNF"],
+        "Quality_Adulteration_Flag": np.where(report["Antibiotic Positive Qty"] > 0, "Yes", "No"),
+        "Quality_Target_Fat": 3.8,
+        "Quality_Target_SNF": 8.2,
+        "Utilization_Target_Percentage": 80,
+        "Animal_Welfare_Compliance_Score_BMC": rng.uniform(2.5, 5, len(report)).round(1),
+        "Women_Empowerment_Participation_Rate_BMC": rng.integers(20, 90, len(report)),
+        "Date": pd.to_datetime(report["Date"]).dt.strftime("%Y-%m-%d"),
+    })
+    # Rows sharing a BMC code are separate chillers of one centre.
+    chiller = report.groupby(["BMC Code", "Date"]).cumcount()
+    ids = "BMC" + report["BMC Code"].astype(str) + "-" + chiller.astype(str)
+    copies = [base.assign(BMC_ID=ids + f"-{copy}") for copy in range(scale)]
+    return pd.concat(copies, ignore_index=True)[["BMC_ID"] + list(base.columns)]
+
+
+def farmers(scale: int, bmc_ids: np.ndarray) -> pd.DataFrame:
+    rng = np.random.default_rng(SEED)
+    n = FARMERS_PER_SCALE * scale
+    return pd.DataFrame({
+        "Farmer_ID": [f"F{i:07d}" for i in range(n)],
+        "Farmer_Name": [f"Farmer {i}" for i in range(n)],
+        "Village": rng.choice(["Nandgaon", "Lonikand", "Shirur", "Daund"], n),
+        "District": "Pune",
+        "BMC_ID": rng.choice(bmc_ids, n),
+        "Milk_Production_Liters_Daily": rng.integers(5, 40, n),
+        "Cattle_Count": rng.integers(1, 12, n),
+        "Women_Empowerment_Flag": rng.choice(["Yes", "No"], n),
+        "Animal_Welfare_Score": rng.integers(1, 6, n),
+    })
+
+
+def workplans(scale: int) -> pd.DataFrame:
+    rng = np.random.default_rng(SEED)
+    days = pd.date_range("2025-01-01", periods=WORKPLAN_DAYS_PER_SCALE * scale, freq="D").date
+    index = pd.MultiIndex.from_product([days, MEMBERS, ACTIVITIES], names=WORKPLAN_COLUMNS[:3])
+    df = index.to_frame(index=False)
+    df["Target"] = rng.integers(1, 10, len(df))
+    df["Achieved"] = rng.integers(0, 10, len(df))
+    return df
+
+
+def write_workbook(path: str, sheets: Dict[str, pd.DataFrame]):
+    """Writes plain sheets with openpyxl's streaming writer (much faster than DataFrame.to_excel)."""
+    wb = Workbook(write_only=True)
+    for name, df in sheets.items():
+        ws = wb.create_sheet(name)
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False):
+            ws.append([value.item() if isinstance(value, np.generic) else value for value in row])
+    wb.save(path)
+
+
+# --- Timing ---
+def measure(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Runs `fn` `repeat` times (after `setup` each time, untimed) and summarizes the wall times."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "mean_s": round(statistics.fmean(times), 6),
+        "repeat": repeat,
+    }
+
+
+# --- Benchmarks ---
+def bench_ingest(scale: int, repeat: int, data: dict) -> Dict[str, dict]:
+    path = os.path.abspath("KSHEERSAGAR LTD File.xlsx")
+    write_workbook(path, {
+        "Farmers": data["farmers"],
+        "BMCs": data["bmcs"],
+        "Teams": pd.DataFrame(columns=ROLE_SIGNATURES["field_team"].columns),
+        "Training": pd.DataFrame(columns=ROLE_SIGNATURES["training"].columns),
+    })
+    drop_cache = lambda: shutil.rmtree(CACHE_DIR, ignore_errors=True)  # noqa: E731
+    results = {"ingest_cold": measure(lambda: ingest_workbooks([path], ROLE_SIGNATURES), repeat, setup=drop_cache)}
+    results["ingest_warm"] = measure(lambda: ingest_workbooks([path], ROLE_SIGNATURES), repeat)
+    data["ingestion"] = ingest_workbooks([path], ROLE_SIGNATURES)
+    return results
+
+
+def bench_load_data(scale: int, repeat: int, data: dict) -> Dict[str, dict]:
+    """Publishing an ingestion, then a fresh process's load_data(): mapping the published frames."""
+    if "ingestion" not in data:
+        bench_ingest(scale, 1, data)
+    version = f"bench-{scale}"
+    results = {"publish_dataset": measure(
+        lambda: publish_dataset(version, data["ingestion"]), repeat,
+        setup=lambda: shutil.rmtree(shared_dataset.DATASET_DIR, ignore_errors=True),
+    )}
+    results["load_data"] = measure(lambda: dataset_frames(SharedDataset(version)), repeat)
+    return results
+
+
+def bench_kpis(scale: int, repeat: int, data: dict) -> Dict[str, dict]:
+    bmcs = data["bmcs"]
+    report = evaluate_kpis(bmcs)
+    return {
+        "analyze_bmcs": measure(lambda: evaluate_kpis(bmcs).by_kpi(), repeat),
+        "generate_actionable_targets": measure(report.action_items, repeat),
+        "bmc_latest_view": measure(lambda: BmcLatestView(bmcs).latest(), repeat),
+    }
+
+
+def bench_workplans(scale: int, repeat: int, data: dict) -> Dict[str, dict]:
+    history = data["workplans"]
+    path = os.path.abspath("daily_workplans.csv")
+    history.to_csv(path, index=False)
+    open(path + ".journal", "w").close()
+    batch = history.tail(SAVE_BATCH_ROWS).assign(Achieved=lambda df: df["Achieved"] + 1)
+    store = WorkplanStore(history)
+    day = history["Date"].iloc[len(history) // 2]
+    return {
+        "load_workplans": measure(lambda: workplan_journal.load(path), repeat),
+        "save_workplans": measure(lambda: workplan_journal.append(path, batch), repeat),
+        "workplan_store_build": measure(lambda: WorkplanStore(history), repeat),
+        "workplan_rollups": measure(
+            lambda: [store.aggregates.rollup(period, day) for period in ("week", "month", "quarter")], repeat
+        ),
+    }
+
+
+def bench_tasks(scale: int, repeat: int, data: dict) -> Dict[str, dict]:
+    rng = np.random.default_rng(SEED)
+    employees = data_manager.fetch_employee_names()
+    n = TASKS_PER_SCALE * scale
+    with data_manager.transaction() as conn:
+        conn.execute("DELETE FROM tasks")
+        conn.executemany(
+            "INSERT INTO tasks (id, employee, name, description, status, due_date) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (task_id, str(rng.choice(employees)), f"Task {task_id}", "", str(rng.choice(["To Do", "In Progress", "Done"])),
+                 (datetime.date(2025, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 365)))).isoformat())
+                for task_id in data_manager.allocate_ids(conn, "tasks", n)
+            ],
+        )
+    return {
+        "get_next_task_id": measure(data_manager.get_next_task_id, repeat),
+        "insert_task": measure(
+            lambda: data_manager.insert_task(employees[0], "Benchmark task", "", datetime.date(2025, 6, 1)), repeat
+        ),
+        "fetch_tasks_employee": measure(lambda: data_manager.fetch_tasks(employee=employees[0]), repeat),
+        "kanban_first_page": measure(lambda: (
+            data_manager.summarize_tasks_by_status(employees[0], ["To Do", "In Progress", "Done"], datetime.date(2025, 6, 1)),
+            [data_manager.fetch_task_page(employees[0], status) for status in ["To Do", "In Progress", "Done"]],
+        ), repeat),
+        "query_tasks_team_overdue": measure(lambda: data_manager.query_tasks(
+            statuses=["To Do", "In Progress"], due_to=datetime.date(2025, 6, 1), manager="Rupesh Mukherjee"
+        ), repeat),
+        "query_tasks_text": measure(lambda: data_manager.query_tasks(text="Task 12"), repeat),
+    }
+
+
+BENCHMARKS = {
+    "ingest": bench_ingest,
+    "load_data": bench_load_data,
+    "kpi": bench_kpis,
+    "workplans": bench_workplans,
+    "tasks": bench_tasks,
+}
+
+
+# --- Runner ---
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales: List[int], repeat: int, only: List[str]) -> dict:
+    rows = []
+    root = tempfile.mkdtemp(prefix="pmu-bench-")
+    cwd = os.getcwd()
+    # data_manager keeps one connection per thread, so the scratch database is shared by all scales.
+    data_manager.DB_PATH = os.path.join(root, "pmu_tracker.db")
+    try:
+        for scale in scales:
+            workdir = os.path.join(root, f"{scale}x")
+            os.makedirs(workdir)
+            os.chdir(workdir)
+            bmcs = bmc_readings(scale)
+            data = {"bmcs": bmcs, "farmers": farmers(scale, bmcs["BMC_ID"].unique()), "workplans": workplans(scale)}
+            sizes = {"bmc_rows": len(bmcs), "farmer_rows": len(data["farmers"]), "workplan_rows": len(data["workplans"])}
+            for group in only:
+                for name, summary in BENCHMARKS[group](scale, repeat, data).items():
+                    rows.append({"benchmark": name, "group": group, "scale": scale, **sizes, **summary})
+                    print(f"{name:<28} {scale:>4}x  median {summary['median_s']:.4f}s  min {summary['min_s']:.4f}s", flush=True)
+            os.chdir(root)
+            shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scales": scales,
+        "results": rows,
+    }
+
+
+def compare(current: dict, baseline: dict):
+    """Prints current vs baseline medians; ratios above 1 are slowdowns."""
+    before = {(row["benchmark"], row["scale"]): row["median_s"] for row in baseline["results"]}
+    print(f"\nvs {baseline.get('commit') or 'baseline'} ({baseline.get('created')})")
+    for row in current["results"]:
+        old = before.get((row["benchmark"], row["scale"]))
+        if old:
+            print(f"{row['benchmark']:<28} {row['scale']:>4}x  {old:.4f}s -> {row['median_s']:.4f}s  x{row['median_s'] / old:.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--output", help="JSON file to write (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = run(args.scales, args.repeat, args.only)
+    output = args.output or os.path.join(RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved {len(results['results'])} results to {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
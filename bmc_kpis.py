@@ -0,0 +1,341 @@
+# TrackerPMU/bmc_kpis.py
+import os
+import tomllib
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bmc_latest import latest_per_bmc, with_derived_metrics
+
+THRESHOLDS_FILE = "kpi_thresholds.toml"
+
+KPIS = ['Quality', 'Utilization', 'Animal_Welfare', 'Women_Empowerment']
+DISPLAY_COLUMNS = ['BMC_ID', 'BMC_Name', 'District', 'Reason']
+VIOLATION_COLUMNS = ['Row', 'BMC_ID', 'BMC_Name', 'District', 'KPI', 'Metric', 'Value', 'Threshold', 'Reason']
+# Compiled rules kept across registry reloads: enough for a few versions of a full rule file.
+COMPILED_CHECK_CACHE_SIZE = 256
+
+
+class KpiCheck(NamedTuple):
+    """One threshold test. A BMC breaches it when its metric is below the threshold,
+    or, for flag checks, when the metric reads 'yes'. With `target_column` set, a BMC's
+    own target in that column replaces the threshold wherever it is filled in."""
+    kpi: str
+    metric: str
+    threshold: float
+    reason: str
+    flag: bool = False
+    target_column: Optional[str] = None
+
+
+# Built-in rules, used when THRESHOLDS_FILE is absent or defines no [[rule]] tables.
+KPI_CHECKS: List[KpiCheck] = [
+    KpiCheck('Quality', 'Quality_Fat_Percentage', 3.5, 'Low Fat/SNF or Adulteration'),
+    KpiCheck('Quality', 'Quality_SNF_Percentage', 7.8, 'Low Fat/SNF or Adulteration'),
+    KpiCheck('Quality', 'Quality_Adulteration_Flag', 1.0, 'Low Fat/SNF or Adulteration', flag=True),
+    KpiCheck('Utilization', 'Utilization_Percentage_Calculated', 70.0, 'Low Utilization'),
+    KpiCheck('Animal_Welfare', 'Animal_Welfare_Compliance_Score_BMC', 4.0, 'Low Animal Welfare Score'),
+    KpiCheck('Women_Empowerment', 'Women_Empowerment_Participation_Rate_BMC', 55.0, 'Low Women Empowerment Rate'),
+]
+
+ACTION_TEMPLATES: Dict[str, str] = {
+    'Quality': (
+        "BMC {BMC_ID} (District: {District}) has **Low Quality** (Fat: {Quality_Fat_Percentage}%, "
+        "SNF: {Quality_SNF_Percentage}%, Adulteration: {Quality_Adulteration_Flag}). "
+        "**Action:** Field team to visit for quality checks, farmer awareness on clean milk production. "
+        "**Target:** Increase Fat to >3.8% and SNF to >8.0% within 1 month."
+    ),
+    'Utilization': (
+        "BMC {BMC_ID} (District: {District}) has **Low Utilization** ({Utilization_Percentage_Calculated:.2f}%). "
+        "**Action:** Identify reasons for low collection, farmer mobilization, improve logistics. "
+        "**Target:** Increase utilization to {Utilization_Target_Percentage}% (or +5% points) within 2 months."
+    ),
+    'Animal_Welfare': (
+        "BMC {BMC_ID} (District: {District}) has **Low Animal Welfare Score** ({Animal_Welfare_Compliance_Score_BMC}). "
+        "**Action:** Conduct farmer training on animal health, hygiene, and shelter. "
+        "**Target:** Improve average animal welfare score to >4.5 within 3 months."
+    ),
+    'Women_Empowerment': (
+        "BMC {BMC_ID} (District: {District}) has **Low Women Empowerment Participation** "
+        "({Women_Empowerment_Participation_Rate_BMC:.2f}%). "
+        "**Action:** Organize women's self-help group meetings, promote female farmer participation. "
+        "**Target:** Increase women empowerment participation rate to >65% within 3 months."
+    ),
+}
+
+# Substituted for template fields whose column is missing or empty.
+TEMPLATE_DEFAULTS = {'Utilization_Target_Percentage': '80'}
+
+
+def _numeric_values(column: pd.Series) -> np.ndarray:
+    return pd.to_numeric(column, errors='coerce').to_numpy(float)
+
+
+def _flag_values(column: pd.Series) -> np.ndarray:
+    if pd.api.types.is_bool_dtype(column.dtype):
+        return column.fillna(False).to_numpy(float)
+    return (column.astype(str).str.strip().str.lower() == 'yes').to_numpy(float)
+
+
+class _Lookup(NamedTuple):
+    """Override thresholds keyed by District or BMC_ID, looked up for a whole column at once."""
+    keys: pd.Index
+    values: np.ndarray  # one slot per key plus a trailing NaN for keys without an override
+
+    @classmethod
+    def build(cls, overrides: Tuple[Tuple[str, float], ...]) -> Optional['_Lookup']:
+        if not overrides:
+            return None
+        keys, values = zip(*overrides)
+        return cls(pd.Index(keys), np.append(np.asarray(values, dtype=float), np.nan))
+
+    def __call__(self, column: pd.Series) -> np.ndarray:
+        return self.values[self.keys.get_indexer(column.astype(str))]
+
+
+def _overlay(thresholds: np.ndarray, replacements: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(replacements), thresholds, replacements)
+
+
+class CompiledCheck:
+    """
+    A KpiCheck lowered to array operations: the metric reader and breach comparison are
+    picked once, and the per-district and per-BMC overrides become index lookups.
+    """
+    __slots__ = ('check', '_read', '_breached', '_district', '_bmc')
+
+    def __init__(self, check: KpiCheck, district_overrides: Tuple[Tuple[str, float], ...],
+                 bmc_overrides: Tuple[Tuple[str, float], ...]):
+        self.check = check
+        self._read = _flag_values if check.flag else _numeric_values
+        self._breached = np.greater_equal if check.flag else np.less
+        self._district = _Lookup.build(district_overrides)
+        self._bmc = _Lookup.build(bmc_overrides)
+
+    def values(self, latest: pd.DataFrame) -> np.ndarray:
+        """The metric as floats; NaN (never a breach) when the column is missing."""
+        if self.check.metric not in latest.columns:
+            return np.full(len(latest), np.nan)
+        return self._read(latest[self.check.metric])
+
+    def thresholds(self, latest: pd.DataFrame) -> np.ndarray:
+        """
+        Per-row thresholds. Later sources win: the rule's default, the district override,
+        the BMC's own target column (when the rule opts in), then the BMC override.
+        """
+        thresholds = np.full(len(latest), float(self.check.threshold))
+        if self._district is not None and 'District' in latest.columns:
+            thresholds = _overlay(thresholds, self._district(latest['District']))
+        if self.check.target_column and self.check.target_column in latest.columns:
+            thresholds = _overlay(thresholds, _numeric_values(latest[self.check.target_column]))
+        if self._bmc is not None and 'BMC_ID' in latest.columns:
+            thresholds = _overlay(thresholds, self._bmc(latest['BMC_ID']))
+        return thresholds
+
+    def evaluate(self, latest: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Metric values, thresholds and the breach mask for every row."""
+        values, thresholds = self.values(latest), self.thresholds(latest)
+        with np.errstate(invalid='ignore'):
+            return values, thresholds, self._breached(values, thresholds)
+
+
+@lru_cache(maxsize=COMPILED_CHECK_CACHE_SIZE)
+def compile_check(
+    check: KpiCheck,
+    district_overrides: Tuple[Tuple[str, float], ...] = (),
+    bmc_overrides: Tuple[Tuple[str, float], ...] = (),
+) -> CompiledCheck:
+    """Compiles a rule once per distinct definition; unchanged rules are reused across recent reloads."""
+    return CompiledCheck(check, district_overrides, bmc_overrides)
+
+
+class KpiRegistry(NamedTuple):
+    """Compiled rules, in evaluation order, and the action template per KPI."""
+    checks: List[CompiledCheck]
+    templates: Dict[str, str]
+
+    @property
+    def kpis(self) -> List[str]:
+        extra = [check.check.kpi for check in self.checks if check.check.kpi not in KPIS]
+        return KPIS + list(dict.fromkeys(extra))
+
+
+def _overrides_for(overrides: Dict[str, Dict[str, float]], metric: str) -> Tuple[Tuple[str, float], ...]:
+    return tuple(sorted(
+        (str(key), float(metrics[metric])) for key, metrics in overrides.items() if metric in metrics
+    ))
+
+
+def parse_registry(config: dict) -> KpiRegistry:
+    """
+    Builds a registry from parsed TOML: [[rule]] tables, [overrides.district|bmc.<key>] and
+    [actions]. Raises ValueError for an action template with a malformed field.
+    """
+    rules = config.get('rule')
+    checks = [KpiCheck(**rule) for rule in rules] if rules else KPI_CHECKS
+    overrides = config.get('overrides', {})
+    district, bmc = overrides.get('district', {}), overrides.get('bmc', {})
+    compiled = [
+        compile_check(check, _overrides_for(district, check.metric), _overrides_for(bmc, check.metric))
+        for check in checks
+    ]
+    templates = {**ACTION_TEMPLATES, **config.get('actions', {})}
+    for kpi, template in templates.items():
+        _check_template(kpi, template)
+    return KpiRegistry(compiled, templates)
+
+
+_registries: Dict[str, Tuple[Tuple[int, int], KpiRegistry]] = {}
+
+
+def load_registry(path: str = THRESHOLDS_FILE) -> KpiRegistry:
+    """
+    Loads the KPI rules from a TOML file, falling back to the built-in KPI_CHECKS when it
+    does not exist. The file is re-read only after its mtime or size changes.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return parse_registry({})
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _registries.get(os.path.abspath(path))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with open(path, "rb") as f:
+        registry = parse_registry(tomllib.load(f))
+    _registries[os.path.abspath(path)] = (version, registry)
+    return registry
+
+
+def _text(latest: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in latest.columns:
+        return np.full(len(latest), 'N/A', dtype=object)
+    values = latest[column]
+    return values.astype(str).where(values.notna(), 'N/A').to_numpy(object)
+
+
+class KpiReport(NamedTuple):
+    """Latest record per BMC plus a long-format table of every threshold it breaches."""
+    latest: pd.DataFrame
+    violations: pd.DataFrame
+    registry: KpiRegistry
+
+    def by_kpi(self) -> Dict[str, pd.DataFrame]:
+        """Low-performing BMCs per KPI, one row per BMC, for display."""
+        deduped = self.violations.drop_duplicates(subset=['KPI', 'Row'])
+        return {
+            kpi: deduped.loc[deduped['KPI'] == kpi, DISPLAY_COLUMNS].reset_index(drop=True)
+            for kpi in self.registry.kpis
+        }
+
+    def action_items(self) -> List[str]:
+        """Actionable targets for every flagged BMC, rendered per KPI from the registry's templates."""
+        items: List[str] = []
+        deduped = self.violations.drop_duplicates(subset=['KPI', 'Row'])
+        for kpi in self.registry.kpis:
+            template = self.registry.templates.get(kpi)
+            rows = deduped.loc[deduped['KPI'] == kpi, 'Row'].to_numpy()
+            if template and len(rows):
+                items.extend(render(template, self.latest.iloc[rows]))
+        return items
+
+
+def evaluate_kpis(bmc_df: pd.DataFrame, registry: Optional[KpiRegistry] = None) -> KpiReport:
+    """Evaluates the latest record of each BMC in a full reading history."""
+    return evaluate_latest(with_derived_metrics(latest_per_bmc(bmc_df)), registry)
+
+
+def evaluate_latest(latest: pd.DataFrame, registry: Optional[KpiRegistry] = None) -> KpiReport:
+    """
+    Tests one record per BMC (e.g. BmcLatestView.latest()) against every rule in one
+    broadcast comparison over (BMCs x rules) value and threshold matrices.
+    """
+    registry = registry or load_registry()
+    if latest.empty or 'BMC_ID' not in latest.columns or not registry.checks:
+        return KpiReport(latest, pd.DataFrame(columns=VIOLATION_COLUMNS), registry)
+
+    checks = [compiled.check for compiled in registry.checks]
+    values, thresholds, breached = (np.column_stack(parts) for parts in zip(*(
+        compiled.evaluate(latest) for compiled in registry.checks
+    )))
+    # Rule-major order, like the old per-rule filters concatenated per KPI: by_kpi() lists a
+    # KPI's BMCs by the first rule they breach, then by row.
+    cols, rows = np.nonzero(breached.T)
+
+    violations = pd.DataFrame({
+        'Row': rows,
+        'BMC_ID': _text(latest, 'BMC_ID')[rows],
+        'BMC_Name': _text(latest, 'BMC_Name')[rows],
+        'District': _text(latest, 'District')[rows],
+        'KPI': np.array([check.kpi for check in checks], dtype=object)[cols],
+        'Metric': np.array([check.metric for check in checks], dtype=object)[cols],
+        'Value': values[rows, cols],
+        'Threshold': thresholds[rows, cols],
+        'Reason': np.array([check.reason for check in checks], dtype=object)[cols],
+    }, columns=VIOLATION_COLUMNS)
+    return KpiReport(latest, violations, registry)
+
+
+# Format types that only take integers; whole-number floats are printed through int().
+_INTEGER_TYPES = set('bcdoxX')
+
+
+def _format_value(value, spec: str) -> str:
+    """One field as str.format would print it; numbers stored as text are formatted as numbers."""
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+    if spec[-1:] in _INTEGER_TYPES and isinstance(value, float) and value.is_integer():
+        value = int(value)
+    try:
+        return format(value, spec)
+    except (TypeError, ValueError):
+        return str(value)  # e.g. a numeric spec on a text cell
+
+
+def _field_text(frame: pd.DataFrame, field: str, spec: str) -> pd.Series:
+    default = TEMPLATE_DEFAULTS.get(field, 'N/A')
+    if field not in frame.columns:
+        return pd.Series(default, index=frame.index, dtype=object)
+    column = frame[field]
+    if pd.api.types.is_bool_dtype(column.dtype):
+        column = column.map({True: 'Yes', False: 'No'})
+    if spec:
+        formatted = [_format_value(value, spec) for value in column.to_numpy(object)]
+        return pd.Series(formatted, index=frame.index, dtype=object).where(column.notna(), default)
+    return column.astype(str).astype(object).where(column.notna(), default)
+
+
+def _check_template(kpi: str, template: str):
+    """Raises ValueError for a template str.format could not render, e.g. a malformed field or format spec."""
+    try:
+        fields = list(Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"action template for {kpi}: {e}") from None
+    for _, field, spec, _ in fields:
+        if not spec:
+            continue
+        for sample in (0.0, 0, ''):
+            try:
+                format(sample, spec)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"action template for {kpi}: invalid format spec {spec!r} for field {field!r}")
+
+
+def render(template: str, frame: pd.DataFrame) -> List[str]:
+    """Renders a str.format-style template for every row, a column at a time."""
+    text = pd.Series('', index=frame.index, dtype=object)
+    for literal, field, spec, _ in Formatter().parse(template):
+        if literal:
+            text = text + literal
+        if field is not None:
+            text = text + _field_text(frame, field, spec)
+    return text.tolist()
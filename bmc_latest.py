@@ -0,0 +1,184 @@
+# TrackerPMU/bmc_latest.py
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOWS = [7, 30]  # days, ending at each BMC's latest reading
+ROLLING_METRICS = {
+    'Fat': 'Quality_Fat_Percentage',
+    'SNF': 'Quality_SNF_Percentage',
+    'Collection': 'Daily_Collection_Liters',
+    'Utilization': 'Utilization_Percentage_Calculated',
+}
+ROLLING_COLUMNS = [f"Mean_{name}_{days}d" for days in ROLLING_WINDOWS for name in ROLLING_METRICS]
+
+
+def with_derived_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds Utilization_Percentage_Calculated when collection and capacity are both present."""
+    if 'Daily_Collection_Liters' in df.columns and 'Capacity_Liters' in df.columns:
+        collection = pd.to_numeric(df['Daily_Collection_Liters'], errors='coerce')
+        capacity = pd.to_numeric(df['Capacity_Liters'], errors='coerce')
+        df = df.assign(Utilization_Percentage_Calculated=collection / capacity * 100)
+    return df
+
+
+def latest_per_bmc(bmc_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keeps each BMC's most recent record (all rows when there is no Date column). Rows with a
+    missing or unparseable Date only win for a BMC that has no dated row at all.
+    """
+    if 'Date' not in bmc_df.columns or 'BMC_ID' not in bmc_df.columns or bmc_df.empty:
+        return bmc_df.reset_index(drop=True)
+    dates = pd.to_datetime(bmc_df['Date'], errors='coerce')
+    # lexsort puts NaT after every real date; ranking dated rows above undated ones keeps NaT first.
+    order = np.lexsort((dates.to_numpy(), dates.notna().to_numpy(), bmc_df['BMC_ID'].astype(str).to_numpy()))
+    ordered = bmc_df.iloc[order].assign(Date=dates.iloc[order].to_numpy())
+    return ordered.drop_duplicates(subset=['BMC_ID'], keep='last').reset_index(drop=True)
+
+
+def _day_numbers(dates: pd.Series) -> np.ndarray:
+    """Days since the epoch; -1 for missing dates."""
+    days = pd.to_datetime(dates, errors='coerce')
+    return np.where(days.isna(), -1, days.to_numpy('datetime64[D]').astype(np.int64))
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """One hash per row, to tell whether a reloaded history only adds rows to the one already folded in."""
+    if df.empty:
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _metric_matrix(df: pd.DataFrame) -> np.ndarray:
+    """(rows x ROLLING_METRICS) floats, NaN where a metric column is missing."""
+    return np.column_stack([
+        pd.to_numeric(df[column], errors='coerce').to_numpy(float) if column in df.columns
+        else np.full(len(df), np.nan)
+        for column in ROLLING_METRICS.values()
+    ])
+
+
+class BmcLatestView:
+    """
+    Materialized latest reading per BMC, with rolling 7/30-day metric means.
+    Built from the full history once; afterwards `append` only touches the BMCs in the
+    new readings, keeping at most the last 30 days of readings per BMC. `sync` keeps a
+    long-lived view current with a reloaded history by appending just its new rows.
+    """
+
+    def __init__(self, history: Optional[pd.DataFrame] = None):
+        self.revision = 0
+        self.lock = threading.RLock()
+        history = history if history is not None else pd.DataFrame()
+        self._build(history)
+        self._row_hashes = _row_hashes(history)
+        self._version: Optional[str] = None
+
+    def _build(self, history: pd.DataFrame):
+        self._latest = pd.DataFrame()
+        self._windows: Dict[str, Dict[int, np.ndarray]] = {}  # BMC -> day number -> metrics
+        self._rolling: Dict[str, np.ndarray] = {}  # BMC -> values in ROLLING_COLUMNS order
+        self._materialized = (-1, pd.DataFrame())
+        if history.empty:
+            return
+        self._latest = with_derived_metrics(latest_per_bmc(history))
+        if 'BMC_ID' not in history.columns or 'Date' not in history.columns:
+            return
+        history = with_derived_metrics(history)
+        bmc_ids = history['BMC_ID'].astype(str).to_numpy()
+        days = _day_numbers(history['Date'])
+        latest_days = pd.Series(days).groupby(bmc_ids).transform('max').to_numpy()
+        recent = (days >= 0) & (days > latest_days - max(ROLLING_WINDOWS))
+
+        metrics = _metric_matrix(history[recent])
+        for bmc_id, day, values in zip(bmc_ids[recent], days[recent].tolist(), metrics):
+            self._windows.setdefault(bmc_id, {})[day] = values
+        for bmc_id in self._windows:
+            self._refresh(bmc_id)
+
+    def _refresh(self, bmc_id: str):
+        """Drops readings older than the longest window and recomputes this BMC's means."""
+        window = self._windows[bmc_id]
+        newest = max(window)
+        for day in [day for day in window if day <= newest - max(ROLLING_WINDOWS)]:
+            del window[day]
+        days = np.fromiter(window, dtype=np.int64, count=len(window))
+        values = np.vstack(list(window.values()))
+        means = []
+        for length in ROLLING_WINDOWS:
+            in_window = values[days > newest - length]
+            with np.errstate(invalid='ignore'):
+                counts = np.sum(~np.isnan(in_window), axis=0)
+                means.append(np.where(counts > 0, np.nansum(in_window, axis=0) / np.maximum(counts, 1), np.nan))
+        self._rolling[bmc_id] = np.concatenate(means)
+
+    def sync(self, history: pd.DataFrame, version: Optional[str] = None):
+        """
+        Catches up with a reloaded reading history. When it starts with every row already
+        folded in (new daily readings appended to the workbook), only the new rows go
+        through `append`; an edited or reordered history is rebuilt from scratch. A sync
+        with the version already seen is a no-op.
+        """
+        with self.lock:
+            if version is not None and version == self._version:
+                return
+            hashes = _row_hashes(history)
+            seen = len(self._row_hashes)
+            if seen and len(hashes) >= seen and np.array_equal(hashes[:seen], self._row_hashes):
+                self._append(history.iloc[seen:])
+            else:
+                self._build(history)
+                self.revision += 1
+            self._row_hashes = hashes
+            self._version = version
+
+    def append(self, readings: pd.DataFrame):
+        """Folds newly arrived daily readings in; a later reading for the same BMC and day replaces the earlier one."""
+        with self.lock:
+            self._append(readings)
+            self._row_hashes = np.concatenate([self._row_hashes, _row_hashes(readings)])
+
+    def _append(self, readings: pd.DataFrame):
+        if readings.empty or 'BMC_ID' not in readings.columns:
+            return
+        readings = with_derived_metrics(readings)
+        if self._latest.empty:
+            self._latest = latest_per_bmc(readings)
+        else:
+            # Only the BMCs in this batch are re-ranked; everyone else's row is kept as is.
+            touched = self._latest['BMC_ID'].isin(readings['BMC_ID'])
+            newer = latest_per_bmc(pd.concat([self._latest[touched], readings], ignore_index=True))
+            self._latest = pd.concat([self._latest[~touched], newer], ignore_index=True)
+
+        if 'Date' in readings.columns:
+            touched = set()
+            days = _day_numbers(readings['Date']).tolist()
+            for bmc_id, day, values in zip(readings['BMC_ID'].astype(str), days, _metric_matrix(readings)):
+                if day < 0:
+                    continue
+                self._windows.setdefault(bmc_id, {})[day] = values
+                touched.add(bmc_id)
+            for bmc_id in touched:
+                self._refresh(bmc_id)
+        self.revision += 1
+
+    def rolling(self) -> pd.DataFrame:
+        """Rolling means per BMC, one row per BMC."""
+        bmc_ids = sorted(self._rolling)
+        values = np.vstack([self._rolling[bmc_id] for bmc_id in bmc_ids]) if bmc_ids else np.empty((0, len(ROLLING_COLUMNS)))
+        return pd.DataFrame(values, columns=ROLLING_COLUMNS).assign(BMC_ID=bmc_ids)[['BMC_ID'] + ROLLING_COLUMNS]
+
+    def latest(self) -> pd.DataFrame:
+        """Latest record per BMC, joined with its rolling means, sorted by BMC_ID. Rebuilt only after a change."""
+        with self.lock:
+            if self._materialized[0] == self.revision:
+                return self._materialized[1]
+            latest = self._latest
+            if not latest.empty and 'BMC_ID' in latest.columns:
+                latest = latest.sort_values('BMC_ID', key=lambda ids: ids.astype(str)).reset_index(drop=True)
+                rolling = self.rolling().set_index('BMC_ID').reindex(latest['BMC_ID'].astype(str))
+                latest = latest.assign(**{column: rolling[column].to_numpy() for column in ROLLING_COLUMNS})
+            self._materialized = (self.revision, latest)
+            return latest
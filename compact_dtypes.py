@@ -0,0 +1,65 @@
+# TrackerPMU/compact_dtypes.py
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Text columns with at most this share of distinct values are stored as categoricals.
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+FLAG_VALUES = {"yes": True, "no": False}
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of a frame, including string payloads."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _as_flag(col: pd.Series) -> Optional[pd.Series]:
+    """Yes/No text as booleans (nullable when there are blanks); None if the column is not a flag."""
+    present = col.dropna()
+    if present.empty:
+        return None
+    lowered = present.astype(str).str.strip().str.lower()
+    if not lowered.isin(FLAG_VALUES.keys()).all():
+        return None
+    flags = col.astype(str).str.strip().str.lower().map(FLAG_VALUES)
+    return flags.astype(bool) if len(present) == len(col) else flags.astype("boolean")
+
+
+def _downcast_float(col: pd.Series) -> pd.Series:
+    values = col.to_numpy()
+    finite = values[~np.isnan(values)]
+    if len(finite) == len(values) and np.array_equal(finite, np.round(finite)):
+        return pd.to_numeric(col, downcast="integer") if len(finite) else col
+    narrowed = values.astype(np.float32)
+    # Only where every value survives the round trip exactly.
+    if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+        return pd.Series(narrowed, index=col.index, name=col.name)
+    return col
+
+
+def compact_column(col: pd.Series) -> pd.Series:
+    """Smallest safe representation of one column: bool, categorical, or a narrower number."""
+    dtype = col.dtype
+    if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return col
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.to_numeric(col, downcast="integer")
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        return _downcast_float(col)
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        flags = _as_flag(col)
+        if flags is not None:
+            return flags
+        if len(col) > 1 and col.nunique(dropna=True) <= CATEGORY_MAX_UNIQUE_RATIO * len(col):
+            return col.astype("category")
+    return col
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns a copy of `df` with every column in its most compact safe dtype."""
+    compacted = df.copy(deep=False)
+    for i in range(df.shape[1]):
+        compacted.isetitem(i, compact_column(df.iloc[:, i]))
+    return compacted
+
@@ -0,0 +1,60 @@
+# TrackerPMU/conftest.py
+import threading
+
+import pandas as pd
+import pytest
+
+import data_manager
+import ingest_jobs
+import shared_dataset
+import sheet_index
+import workbook_cache
+from workplan_journal import WORKPLAN_COLUMNS
+
+
+@pytest.fixture
+def task_db(tmp_path, monkeypatch):
+    """A freshly seeded task database in a scratch directory, with no connection carried over."""
+    monkeypatch.setattr(data_manager, "DB_PATH", str(tmp_path / "pmu_tracker.db"))
+    monkeypatch.setattr(data_manager, "_local", threading.local())
+    monkeypatch.setattr(data_manager, "_schema_ready_pid", None)
+    return data_manager
+
+
+@pytest.fixture
+def job_queue(tmp_path, monkeypatch):
+    """An empty ingest job queue in a scratch directory."""
+    monkeypatch.setattr(ingest_jobs, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ingest_jobs, "JOBS_DB", str(tmp_path / "ingest_jobs.db"))
+    monkeypatch.setattr(ingest_jobs, "_local", threading.local())
+    return ingest_jobs
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """An empty workbook cache (Feather sheets, stat files and sheet indexes)."""
+    path = tmp_path / "cache"
+    monkeypatch.setattr(workbook_cache, "CACHE_DIR", str(path))
+    monkeypatch.setattr(sheet_index, "CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def dataset_dir(tmp_path, monkeypatch):
+    """An empty shared dataset directory with nothing published."""
+    path = tmp_path / "dataset"
+    monkeypatch.setattr(shared_dataset, "DATASET_DIR", str(path))
+    return path
+
+
+def write_workbook(path, sheets):
+    """Writes `sheets` (sheet name -> DataFrame) as an .xlsx workbook at `path`."""
+    with pd.ExcelWriter(path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return str(path)
+
+
+def workplan_rows(*rows):
+    """A workplan frame from (Date, member, activity, target, achieved) tuples."""
+    return pd.DataFrame(list(rows), columns=WORKPLAN_COLUMNS)
@@ -1,9 +1,19 @@
 # TrackerPMU/data_manager.py
-import streamlit as st
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, TypedDict
+
 import pandas as pd
-from datetime import date
 
-@st.cache_resource(ttl=3600) # Cache the resource for 1 hour
+from single_flight import single_flight
+
+DB_PATH = "pmu_tracker.db"
+
+@single_flight(ttl=3600) # Cache for 1 hour; refreshed in the background after that
 def get_initial_employee_data():
     """Loads and caches the initial comprehensive employee data."""
     employee_full_details = {
@@ -37,73 +47,695 @@ def get_initial_employee_data():
     }
     return employee_full_details
 
-@st.cache_data(ttl=3600) # Cache the data for 1 hour
-def get_initial_tasks_data():
-    """Loads and caches the initial task data."""
-    tasks_data = {
-        
-        "Rupesh Mukherjee": [],
-        "Shifali Sharma": [],
-        "Kuntal Dutta": [],
-        "Sachin WadapaLliwar": [],
-        "Dr. Guru Mohan Reddy": [],
-        "K Balaji": [],
-        "Bhavya Kharoo": [],
-        "Gautam Bagada": [],
-        "Ajay Vaghela": [],
-        "Samadhan Bangale": [],
-        "Prabodh Pate": [],
-        "Ramalakshmi Somanchi": [],
-        "Aditya Yuvaraj": [],
-        "Bhushan Sananse": [],
-        "Nilesh Rajkumar Dhanwate": [],
-        "Ranu Laoddha": [],
-        "Pari Sharma": [],
-        "Muskan Kaushal": [],
-        "Kriti Suneha": [],
-        "Nikhitha VK": [],
-        "Sandeep GS": [],
-        "Aniket Grover": [],
-        "Subhrat Ghoshal": [],
-        "Hrushikesh Tilekar": [],
-
-       
-        "Jhelum Chowdhury": [],
-        "Jaweriah Hazrana": [],
-        "Dr. Ramakrishna": [],
-
-        
-        "Rupesh Mukherjee": [
-            {"id": 1, "name": "Finalize Project Alpha Scope", "description": "Meet with stakeholders to define final project scope.", "status": "To Do", "due_date": date(2025, 7, 10)},
-            {"id": 2, "name": "Q3 Planning Review", "description": "Review Q3 plans with department heads.", "status": "In Progress", "due_date": date(2025, 7, 15)},
-        ],
-        "Shifali Sharma": [
-            {"id": 3, "name": "Onboard New PM", "description": "Complete onboarding for the new project manager.", "status": "In Progress", "due_date": date(2025, 6, 28)},
-            {"id": 4, "name": "Update Risk Register", "description": "Review and update project risk register for all active programs.", "status": "To Do", "due_date": date(2025, 7, 5)},
-        ],
-        "Kuntal Dutta": [
-            {"id": 5, "name": "Client X Meeting Prep", "description": "Prepare agenda and presentation for Client X meeting.", "status": "Done", "due_date": date(2025, 6, 20)},
+SEED_TASKS = {
+    "Rupesh Mukherjee": [
+        {"id": 1, "name": "Finalize Project Alpha Scope", "description": "Meet with stakeholders to define final project scope.", "status": "To Do", "due_date": date(2025, 7, 10)},
+        {"id": 2, "name": "Q3 Planning Review", "description": "Review Q3 plans with department heads.", "status": "In Progress", "due_date": date(2025, 7, 15)},
+    ],
+    "Shifali Sharma": [
+        {"id": 3, "name": "Onboard New PM", "description": "Complete onboarding for the new project manager.", "status": "In Progress", "due_date": date(2025, 6, 28)},
+        {"id": 4, "name": "Update Risk Register", "description": "Review and update project risk register for all active programs.", "status": "To Do", "due_date": date(2025, 7, 5)},
+    ],
+    "Kuntal Dutta": [
+        {"id": 5, "name": "Client X Meeting Prep", "description": "Prepare agenda and presentation for Client X meeting.", "status": "Done", "due_date": date(2025, 6, 20)},
+    ],
+}
+
+SEED_PROGRAMS = {
+    "SAKSHAM": {
+        "budget": 250000.00,
+        "tasks": [
+            {"id": 1, "name": "Phase 1 Rollout", "spent": 50000.00, "description": "Execute initial rollout in selected regions."},
+            {"id": 2, "name": "Beneficiary Registration", "spent": 15000.00, "description": "Register new beneficiaries and collect data."}
+        ]
+    },
+    "Heritage": {
+        "budget": 180000.00,
+        "tasks": [
+            {"id": 1, "name": "Site Assessment", "spent": 20000.00, "description": "Conduct preliminary assessment of historical sites."},
+            {"id": 2, "name": "Restoration Planning", "spent": 10000.00, "description": "Develop detailed restoration plans."}
+        ]
+    },
+    "KS 1.0": {
+        "budget": 120000.00,
+        "tasks": [
+            {"id": 1, "name": "Curriculum Development", "spent": 30000.00, "description": "Design educational curriculum modules."}
+        ]
+    },
+    "KS 2.0": {
+        "budget": 150000.00,
+        "tasks": [
+            {"id": 1, "name": "Technology Integration", "spent": 25000.00, "description": "Integrate new learning technologies."}
+        ]
+    },
+    "Water Program": {
+        "budget": 300000.00,
+        "tasks": [
+            {"id": 1, "name": "Well Drilling", "spent": 75000.00, "description": "Drill new water wells in target villages."},
+            {"id": 2, "name": "Community Engagement", "spent": 10000.00, "description": "Engage local communities for water management."}
+        ]
+    },
+    "Education Program": {
+        "budget": 200000.00,
+        "tasks": [
+            {"id": 1, "name": "Teacher Training", "spent": 40000.00, "description": "Conduct training workshops for educators."},
+            {"id": 2, "name": "Material Distribution", "spent": 18000.00, "description": "Distribute educational materials to schools."}
         ]
     }
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+-- Last id handed out per table. Ids are never reused, even after the newest row is deleted.
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS employees (
+    name TEXT PRIMARY KEY,
+    title TEXT,
+    department TEXT,
+    reporting_to TEXT,
+    email TEXT,
+    phone TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_employees_reporting_to ON employees (reporting_to);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    employee TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'To Do',
+    due_date TEXT NOT NULL
+);
+-- Serves one employee's tasks per Kanban column, already in due-date order; its
+-- (employee) prefix replaces the old single-column index.
+CREATE INDEX IF NOT EXISTS idx_tasks_employee_status_due ON tasks (employee, status, due_date);
+DROP INDEX IF EXISTS idx_tasks_employee;
+-- Cross-employee queries: one status within a due-date window ("In Progress due this week").
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date);
+DROP INDEX IF EXISTS idx_tasks_status;
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    location TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_employee_timestamp ON attendance (employee, timestamp);
+
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee TEXT NOT NULL,
+    datetime TEXT NOT NULL,
+    purpose TEXT NOT NULL DEFAULT '',
+    agenda TEXT NOT NULL DEFAULT '',
+    mom TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_employee ON meetings (employee);
+CREATE INDEX IF NOT EXISTS idx_meetings_datetime ON meetings (datetime);
+
+CREATE TABLE IF NOT EXISTS programs (
+    name TEXT PRIMARY KEY,
+    budget REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS program_tasks (
+    program TEXT NOT NULL REFERENCES programs (name) ON DELETE CASCADE,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    spent REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (program, id)
+);
+"""
+
+# Trigram full-text index over task names and descriptions, kept in sync by triggers. Optional:
+# SQLite builds without FTS5 (or older than 3.34) fall back to LIKE scans in query_tasks().
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    name, description, content='tasks', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF name, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+    INSERT INTO tasks_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+END;
+"""
+
+
+class Task(TypedDict):
+    id: int
+    employee: str
+    name: str
+    description: str
+    status: str
+    due_date: date
+
+
+# Keyset pagination position: (due_date ISO, id) of the last task on the previous page.
+Cursor = Tuple[str, int]
+
+
+class TaskPage(NamedTuple):
+    tasks: List[Task]
+    offset: int  # tasks in the column before this page
+    next_cursor: Optional[Cursor]  # None on the last page
+
+
+class StatusSummary(TypedDict):
+    count: int
+    overdue: int
+    next_due: Optional[date]
+
+
+class AttendanceRecord(TypedDict):
+    timestamp: str
+    type: str
+    location: str
+
+
+class Meeting(TypedDict):
+    id: int
+    employee: str
+    datetime: datetime
+    purpose: str
+    agenda: str
+    mom: str
+
+
+class ProgramTask(TypedDict):
+    id: int
+    name: str
+    description: str
+    spent: float
+
+
+class Program(TypedDict):
+    budget: float
+    tasks: List[ProgramTask]
+
+
+# --- Storage engine ---
+# One SQLite connection per thread of each worker process. WAL mode lets the
+# Streamlit processes behind the load balancer read while another one writes.
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready_pid = None
+_has_fts = False
+
+
+def get_connection() -> sqlite3.Connection:
+    """Returns this thread's pooled connection, opening (and migrating) the database on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+
+    # Autocommit mode: writes go through transaction(), which takes the write lock up front.
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    _ensure_schema(conn)
+    _local.conn = conn
+    _local.pid = os.getpid()
+    return conn
+
+
+@contextmanager
+def transaction():
+    """
+    Runs a block of writes as one transaction on this thread's connection.
+    BEGIN IMMEDIATE takes the write lock at the start, so read-then-write blocks
+    cannot interleave with another process's writes.
+    """
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _ensure_schema(conn: sqlite3.Connection):
+    global _schema_ready_pid, _has_fts
+    with _schema_lock:
+        if _schema_ready_pid == os.getpid():
+            return
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            _has_fts = True
+        except sqlite3.OperationalError:
+            _has_fts = False
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seeded = conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')").rowcount
+            if seeded:
+                _seed(conn)
+            # Databases created before the sequence table continue after their highest id.
+            conn.execute("INSERT OR IGNORE INTO sequences (name, value) SELECT 'tasks', COALESCE(MAX(id), 0) FROM tasks")
+            # Tasks written before the full-text index existed are indexed once.
+            if _has_fts and conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('tasks_fts', '1')").rowcount:
+                conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        _schema_ready_pid = os.getpid()
+
+
+def _seed(conn: sqlite3.Connection):
+    """Loads the initial PMU data into a freshly created database."""
+    for name, details in get_initial_employee_data().items():
+        conn.execute(
+            "INSERT OR IGNORE INTO employees (name, title, department, reporting_to, email, phone, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, details["Title"], details["Department"], details["Reporting To"], details["Email"], details["Phone"], details["Status"]),
+        )
+    for employee, tasks in SEED_TASKS.items():
+        for task in tasks:
+            conn.execute(
+                "INSERT OR IGNORE INTO tasks (id, employee, name, description, status, due_date) VALUES (?, ?, ?, ?, ?, ?)",
+                (task["id"], employee, task["name"], task["description"], task["status"], task["due_date"].isoformat()),
+            )
+    for program, details in SEED_PROGRAMS.items():
+        conn.execute("INSERT OR IGNORE INTO programs (name, budget) VALUES (?, ?)", (program, details["budget"]))
+        for task in details["tasks"]:
+            conn.execute(
+                "INSERT OR IGNORE INTO program_tasks (program, id, name, description, spent) VALUES (?, ?, ?, ?, ?)",
+                (program, task["id"], task["name"], task["description"], task["spent"]),
+            )
+
+
+# --- Employees ---
+# Employees are only written by the seed, so every session can share one list.
+@single_flight(ttl=300)
+def fetch_employee_names() -> List[str]:
+    """Returns all employee names in alphabetical order."""
+    rows = get_connection().execute("SELECT name FROM employees ORDER BY name").fetchall()
+    return [row["name"] for row in rows]
+
+
+@single_flight(ttl=300)
+def fetch_managers() -> List[str]:
+    """Employees with at least one direct report, in alphabetical order."""
+    rows = get_connection().execute(
+        "SELECT DISTINCT reporting_to FROM employees WHERE reporting_to IN (SELECT name FROM employees) ORDER BY reporting_to"
+    ).fetchall()
+    return [row["reporting_to"] for row in rows]
+
+
+# --- Tasks ---
+def _task(row: sqlite3.Row) -> Task:
+    return Task(
+        id=row["id"],
+        employee=row["employee"],
+        name=row["name"],
+        description=row["description"],
+        status=row["status"],
+        due_date=date.fromisoformat(row["due_date"]),
+    )
+
+
+def fetch_tasks(employee: Optional[str] = None, status: Optional[str] = None) -> List[Task]:
+    """Returns tasks, optionally narrowed to one employee and/or status, ordered by due date."""
+    query = "SELECT * FROM tasks"
+    clauses, params = [], []
+    if employee is not None:
+        clauses.append("employee = ?")
+        params.append(employee)
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY due_date, id"
+    return [_task(row) for row in get_connection().execute(query, params).fetchall()]
+
+
+def summarize_tasks_by_status(employee: str, statuses: List[str], today: date) -> Dict[str, StatusSummary]:
+    """Per-status task count, overdue count and next upcoming due date, answered from the index alone."""
+    summaries = {status: StatusSummary(count=0, overdue=0, next_due=None) for status in statuses}
+    rows = get_connection().execute(
+        """
+        SELECT status, COUNT(*) AS count, SUM(due_date < :today) AS overdue,
+               MIN(CASE WHEN due_date >= :today THEN due_date END) AS next_due
+        FROM tasks WHERE employee = :employee GROUP BY status
+        """,
+        {"employee": employee, "today": today.isoformat()},
+    ).fetchall()
+    for row in rows:
+        if row["status"] in summaries:
+            summaries[row["status"]] = StatusSummary(
+                count=row["count"],
+                overdue=row["overdue"],
+                next_due=date.fromisoformat(row["next_due"]) if row["next_due"] else None,
+            )
+    return summaries
+
+
+def fetch_task_page(employee: str, status: str, after: Optional[Cursor] = None, limit: int = 20) -> TaskPage:
+    """
+    One page of a Kanban column in due-date order, starting after `after`. Keyset pagination
+    walks the (employee, status, due_date) index, so a deep page costs the same as the first,
+    and tasks added or moved elsewhere in the column do not shift the cards already shown.
+    """
+    conn = get_connection()
+    if after is None:
+        rows = conn.execute(
+            "SELECT * FROM tasks WHERE employee = ? AND status = ? ORDER BY due_date, id LIMIT ?",
+            (employee, status, limit + 1),
+        ).fetchall()
+        offset = 0
+    else:
+        rows = conn.execute(
+            "SELECT * FROM tasks WHERE employee = ? AND status = ? AND (due_date, id) > (?, ?) ORDER BY due_date, id LIMIT ?",
+            (employee, status, after[0], after[1], limit + 1),
+        ).fetchall()
+        offset = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE employee = ? AND status = ? AND (due_date, id) <= (?, ?)",
+            (employee, status, after[0], after[1]),
+        ).fetchone()[0]
+    tasks = [_task(row) for row in rows[:limit]]
+    next_cursor = (rows[limit - 1]["due_date"], rows[limit - 1]["id"]) if len(rows) > limit else None
+    return TaskPage(tasks, offset, next_cursor)
+
+
+TASK_COLUMNS = ["id", "employee", "name", "description", "status", "due_date"]
+# Sort keys accepted by query_tasks(); id breaks ties so pages never overlap.
+TASK_SORTS = {
+    "due_date": "due_date, id",
+    "employee": "employee, due_date, id",
+    "status": "status, due_date, id",
+    "name": "name, id",
+    "id": "id",
+}
+# The trigram tokenizer cannot match shorter search strings.
+FTS_MIN_LENGTH = 3
+
+
+class TaskQueryResult(NamedTuple):
+    tasks: pd.DataFrame  # TASK_COLUMNS, due_date as datetime64
+    total: int  # matching tasks across all pages
+
+
+def query_tasks(
+    statuses: Optional[List[str]] = None,
+    due_from: Optional[date] = None,
+    due_to: Optional[date] = None,
+    manager: Optional[str] = None,
+    include_manager: bool = False,
+    employees: Optional[List[str]] = None,
+    text: Optional[str] = None,
+    sort: str = "due_date",
+    descending: bool = False,
+    limit: int = 50,
+    offset: int = 0,
+) -> TaskQueryResult:
+    """
+    Tasks across employees matching every given filter, one page at a time. `manager` keeps
+    the tasks of everyone in that manager's reporting line (direct and indirect reports,
+    walked with a recursive CTE); `text` searches task names and descriptions.
+    """
+    if sort not in TASK_SORTS:
+        raise ValueError(f"Unknown sort {sort!r}; expected one of {sorted(TASK_SORTS)}")
+    ctes, clauses, params = [], [], {}
+    if statuses is not None:
+        clauses.append(f"status IN ({', '.join(f':status{i}' for i in range(len(statuses)))})")
+        params.update({f"status{i}": status for i, status in enumerate(statuses)})
+    if due_from is not None:
+        clauses.append("due_date >= :due_from")
+        params["due_from"] = due_from.isoformat()
+    if due_to is not None:
+        clauses.append("due_date <= :due_to")
+        params["due_to"] = due_to.isoformat()
+    if manager is not None:
+        ctes.append(
+            """team(name) AS (
+                SELECT name FROM employees WHERE reporting_to = :manager
+                UNION
+                SELECT employees.name FROM employees JOIN team ON employees.reporting_to = team.name
+            )"""
+        )
+        team = "employee IN (SELECT name FROM team)"
+        clauses.append(f"({team} OR employee = :manager)" if include_manager else team)
+        params["manager"] = manager
+    if employees is not None:
+        clauses.append(f"employee IN ({', '.join(f':employee{i}' for i in range(len(employees)))})")
+        params.update({f"employee{i}": employee for i, employee in enumerate(employees)})
+    text = (text or "").strip()
+    if text:
+        if _has_fts and len(text) >= FTS_MIN_LENGTH:
+            clauses.append("id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH :text)")
+            params["text"] = '"' + text.replace('"', '""') + '"'
+        else:
+            clauses.append("(name LIKE :text ESCAPE '\\' OR description LIKE :text ESCAPE '\\')")
+            params["text"] = "%" + re.sub(r"([%_\\])", r"\\\1", text) + "%"
+
+    with_clause = f"WITH RECURSIVE {', '.join(ctes)} " if ctes else ""
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    order = ", ".join(f"{key} DESC" for key in TASK_SORTS[sort].split(", ")) if descending else TASK_SORTS[sort]
+    conn = get_connection()
+    total = conn.execute(f"{with_clause}SELECT COUNT(*) FROM tasks{where}", params).fetchone()[0]
+    rows = conn.execute(
+        f"{with_clause}SELECT {', '.join(TASK_COLUMNS)} FROM tasks{where} ORDER BY {order} LIMIT :limit OFFSET :offset",
+        {**params, "limit": limit, "offset": offset},
+    ).fetchall()
+    tasks = pd.DataFrame([tuple(row) for row in rows], columns=TASK_COLUMNS)
+    tasks["due_date"] = pd.to_datetime(tasks["due_date"])
+    return TaskQueryResult(tasks, total)
+
+
+def allocate_ids(conn: sqlite3.Connection, sequence: str, count: int = 1) -> range:
+    """
+    Reserves `count` consecutive ids from a sequence. Call inside transaction(): the write
+    lock it holds makes the reservation unique across every thread and server process.
+    """
+    value = conn.execute(
+        "UPDATE sequences SET value = value + ? WHERE name = ? RETURNING value", (count, sequence)
+    ).fetchone()[0]
+    return range(value - count + 1, value + 1)
+
+
+def insert_task(employee: str, name: str, description: str, due_date: date, status: str = "To Do") -> int:
+    """Adds a task and returns its id."""
+    with transaction() as conn:
+        task_id = allocate_ids(conn, "tasks")[0]
+        conn.execute(
+            "INSERT INTO tasks (id, employee, name, description, status, due_date) VALUES (?, ?, ?, ?, ?, ?)",
+            (task_id, employee, name, description, status, due_date.isoformat()),
+        )
+    return task_id
+
+
+def update_task_status(task_id: int, status: str) -> bool:
+    """Moves a task to a new status. Returns False if the task does not exist."""
+    with transaction() as conn:
+        return conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (status, task_id)).rowcount > 0
+
+
+def delete_task(task_id: int) -> bool:
+    """Deletes a task. Returns False if the task does not exist."""
+    with transaction() as conn:
+        return conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount > 0
+
+
+EDITABLE_TASK_FIELDS = ("name", "description", "status", "due_date")
+TASK_STATUSES = ("To Do", "In Progress", "Done")
+BULK_ACTIONS = ["No bulk action", "Set status", "Move due date", "Delete"]
+
+
+def bulk_task_changes(
+    original: pd.DataFrame, edited: pd.DataFrame, action: str, target_status: str, shift_days: int
+) -> Tuple[Dict[int, Dict[str, object]], List[int]]:
+    """
+    Diffs an edited task grid (EDITABLE_TASK_FIELDS plus id and a "selected" flag) against the
+    rows it was built from and applies a BULK_ACTIONS action to the selected rows. Returns
+    (task id -> changed fields, ids to delete), ready for apply_task_changes(); unchanged rows
+    are left out.
+    """
+    updates, deletes = {}, []
+    for before, after in zip(original.to_dict("records"), edited.to_dict("records")):
+        after["due_date"] = pd.Timestamp(after["due_date"]).date()
+        # A cleared description cell comes back as None; the column is NOT NULL.
+        if pd.isna(after["description"]):
+            after["description"] = ""
+        fields = {
+            field: after[field]
+            for field in EDITABLE_TASK_FIELDS
+            if after[field] != before[field]
+        }
+        if after["selected"]:
+            if action == "Delete":
+                deletes.append(before["id"])
+                continue
+            if action == "Set status" and target_status != before["status"]:
+                fields["status"] = target_status
+            elif action == "Move due date" and shift_days:
+                fields["due_date"] = after["due_date"] + timedelta(days=shift_days)
+        if fields:
+            updates[before["id"]] = fields
+    return updates, deletes
+
+
+def apply_task_changes(updates: Dict[int, Dict[str, object]], deletes: Iterable[int] = ()) -> Tuple[int, int]:
+    """
+    Applies field edits (task id -> changed fields) and deletes as one transaction, so a bulk
+    edit lands completely or not at all. Unknown fields or statuses raise ValueError before
+    anything is written. Returns the (updated, deleted) task counts.
+    """
+    deletes = set(deletes)
+    statements = []
+    for task_id, fields in updates.items():
+        if task_id in deletes or not fields:
+            continue
+        unknown = set(fields) - set(EDITABLE_TASK_FIELDS)
+        if unknown:
+            raise ValueError(f"Task fields cannot be edited: {sorted(unknown)}")
+        if "status" in fields and fields["status"] not in TASK_STATUSES:
+            raise ValueError(f"Task {task_id}: unknown status {fields['status']!r}")
+        values = {field: value.isoformat() if field == "due_date" else value for field, value in fields.items()}
+        assignments = ", ".join(f"{field} = ?" for field in values)
+        statements.append((f"UPDATE tasks SET {assignments} WHERE id = ?", (*values.values(), task_id)))
+    with transaction() as conn:
+        updated = sum(conn.execute(query, params).rowcount for query, params in statements)
+        deleted = conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deletes]).rowcount
+    return updated, deleted
+
+
+def get_next_task_id() -> int:
+    """The id the next insert_task() will get, unless another session inserts first."""
+    return get_connection().execute("SELECT value + 1 FROM sequences WHERE name = 'tasks'").fetchone()[0]
+
+
+# --- Attendance ---
+def fetch_attendance(employee: str) -> List[AttendanceRecord]:
+    """Returns an employee's attendance records, newest first."""
+    rows = get_connection().execute(
+        "SELECT timestamp, type, location FROM attendance WHERE employee = ? ORDER BY timestamp DESC", (employee,)
+    ).fetchall()
+    return [AttendanceRecord(timestamp=row["timestamp"], type=row["type"], location=row["location"]) for row in rows]
+
+
+def insert_attendance(employee: str, timestamp: datetime, record_type: str, location: str):
+    """Records a check-in or check-out."""
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO attendance (employee, timestamp, type, location) VALUES (?, ?, ?, ?)",
+            (employee, timestamp.isoformat(), record_type, location),
+        )
+
+
+# --- One-on-one meetings ---
+def _meeting(row: sqlite3.Row) -> Meeting:
+    return Meeting(
+        id=row["id"],
+        employee=row["employee"],
+        datetime=datetime.fromisoformat(row["datetime"]),
+        purpose=row["purpose"],
+        agenda=row["agenda"],
+        mom=row["mom"],
+    )
+
+
+def fetch_meetings(employee: Optional[str] = None) -> List[Meeting]:
+    """Returns meetings in chronological order, optionally for one employee."""
+    if employee is None:
+        rows = get_connection().execute("SELECT * FROM meetings ORDER BY datetime").fetchall()
+    else:
+        rows = get_connection().execute(
+            "SELECT * FROM meetings WHERE employee = ? ORDER BY datetime", (employee,)
+        ).fetchall()
+    return [_meeting(row) for row in rows]
+
+
+def get_meeting(meeting_id: int) -> Optional[Meeting]:
+    """Returns one meeting by id, or None."""
+    row = get_connection().execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+    return _meeting(row) if row else None
+
+
+def insert_meeting(employee: str, meeting_datetime: datetime, purpose: str) -> int:
+    """Schedules a meeting and returns its id."""
+    with transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO meetings (employee, datetime, purpose) VALUES (?, ?, ?)",
+            (employee, meeting_datetime.isoformat(), purpose),
+        )
+    return cursor.lastrowid
+
+
+def update_meeting_notes(meeting_id: int, agenda: str, mom: str) -> bool:
+    """Saves a meeting's agenda and minutes."""
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE meetings SET agenda = ?, mom = ? WHERE id = ?", (agenda, mom, meeting_id)
+        ).rowcount > 0
+
+
+def delete_meeting(meeting_id: int) -> bool:
+    """Deletes a meeting."""
+    with transaction() as conn:
+        return conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,)).rowcount > 0
+
+
+# --- Programs ---
+def fetch_programs() -> Dict[str, Program]:
+    """Returns every program with its budget and tasks."""
+    conn = get_connection()
+    programs = {
+        row["name"]: Program(budget=row["budget"], tasks=[])
+        for row in conn.execute("SELECT name, budget FROM programs ORDER BY name")
+    }
+    for row in conn.execute("SELECT * FROM program_tasks ORDER BY program, id"):
+        programs[row["program"]]["tasks"].append(
+            ProgramTask(id=row["id"], name=row["name"], description=row["description"], spent=row["spent"])
+        )
+    return programs
+
+
+def insert_program(name: str, budget: float) -> bool:
+    """Adds a program. Returns False if a program with that name already exists."""
+    with transaction() as conn:
+        return conn.execute("INSERT OR IGNORE INTO programs (name, budget) VALUES (?, ?)", (name, budget)).rowcount > 0
+
+
+def update_program_budget(name: str, budget: float) -> bool:
+    """Changes a program's budget."""
+    with transaction() as conn:
+        return conn.execute("UPDATE programs SET budget = ? WHERE name = ?", (budget, name)).rowcount > 0
+
+
+def insert_program_task(program: str, name: str, description: str, spent: float) -> int:
+    """Adds a task under a program and returns its per-program id."""
+    with transaction() as conn:
+        next_id = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM program_tasks WHERE program = ?", (program,)
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT INTO program_tasks (program, id, name, description, spent) VALUES (?, ?, ?, ?, ?)",
+            (program, next_id, name, description, spent),
+        )
+    return next_id
+
 
-    
-    all_employees = sorted(list(get_initial_employee_data().keys()))
-    for emp_name in all_employees:
-        if emp_name not in tasks_data:
-            tasks_data[emp_name] = []
-
-    return tasks_data
-
-@st.cache_data(ttl=3600) # Cache attendance data for 1 hour
-def get_initial_attendance_data():
-    """Loads and caches initial attendance data."""
-    return {}
-
-def get_next_task_id(current_tasks_data):
-    """Calculates the next available task ID."""
-    max_id = 0
-    for employee_tasks in current_tasks_data.values():
-        for task in employee_tasks:
-            if task['id'] > max_id:
-                max_id = task['id']
-    return max_id + 1 if max_id > 0 else 1
+def update_program_task_spent(program: str, task_id: int, spent: float) -> bool:
+    """Updates the amount spent on a program task."""
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE program_tasks SET spent = ? WHERE program = ? AND id = ?", (spent, program, task_id)
+        ).rowcount > 0
@@ -0,0 +1,274 @@
+# TrackerPMU/excel_stream.py
+import hashlib
+import re
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+CHUNK_SIZE = 5000
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_SHARED_STRING_REF = re.compile(rb'<(?:\w+:)?c\b[^>]*\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)<')
+
+
+def sheet_names(path: str) -> List[str]:
+    """Lists a workbook's sheet names from workbook.xml, without opening any sheet."""
+    with zipfile.ZipFile(path) as zf:
+        root = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    return [sheet.get("name") for sheet in root.iter(f"{_MAIN_NS}sheet")]
+
+
+def _sheet_members(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """Maps sheet names to their worksheet XML members inside the package."""
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{_PKG_REL_NS}Relationship")}
+    members = {}
+    for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+        target = targets[sheet.get(f"{_REL_NS}id")]
+        members[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    return members
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    root = ElementTree.fromstring(zf.read("xl/sharedStrings.xml"))
+    return ["".join(t.text or "" for t in si.iter(f"{_MAIN_NS}t")) for si in root.iter(f"{_MAIN_NS}si")]
+
+
+def sheet_digests(path: str) -> Dict[str, str]:
+    """
+    Content hash of every sheet, read from the package without parsing any cells: the sheet's
+    XML, the shared strings it references, and the styles part (number formats decide which
+    cells are dates). A sheet's digest only changes when its parsed values could.
+    """
+    with zipfile.ZipFile(path) as zf:
+        shared = _shared_strings(zf)
+        styles = str(zf.getinfo("xl/styles.xml").CRC) if "xl/styles.xml" in zf.namelist() else ""
+        digests = {}
+        for name, member in _sheet_members(zf).items():
+            data = zf.read(member)
+            digest = hashlib.sha256(data)
+            digest.update(styles.encode())
+            for index in dict.fromkeys(_SHARED_STRING_REF.findall(data)):
+                digest.update(b"\0" + shared[int(index)].encode())
+            digests[name] = digest.hexdigest()
+    return digests
+
+
+def _cell_value(value):
+    # Same cell conversion pandas' openpyxl reader applies: whole floats become ints.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value == "":
+        return None
+    return value
+
+
+def _trim(row) -> list:
+    values = [_cell_value(v) for v in row]
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def _header_names(header_row: list) -> list:
+    """Names header cells like pandas does: 'Unnamed: i' for blanks, '.n' suffixes for repeats."""
+    names = []
+    counts: Dict[str, int] = {}
+    for i, value in enumerate(header_row):
+        name = f"Unnamed: {i}" if value is None else value
+        key = str(name)
+        if key in counts:
+            counts[key] += 1
+            name = f"{key}.{counts[key]}"
+        else:
+            counts[key] = 0
+        names.append(name)
+    return names
+
+
+def _open(path: str):
+    return openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+
+def _read_header(wb, sheet_name: str, header: int) -> list:
+    for row in wb[sheet_name].iter_rows(min_row=header + 1, max_row=header + 1, values_only=True):
+        return _header_names(_trim(row))
+    return []
+
+
+def read_header(path: str, sheet_name: str, header: int = 0) -> list:
+    """Returns a sheet's column names by reading only its header row."""
+    wb = _open(path)
+    try:
+        return _read_header(wb, sheet_name, header)
+    finally:
+        wb.close()
+
+
+def read_headers(path: str, header: int = 0) -> Dict[str, list]:
+    """Returns the column names of every sheet, reading only the header rows."""
+    wb = _open(path)
+    try:
+        return {name: _read_header(wb, name, header) for name in wb.sheetnames}
+    finally:
+        wb.close()
+
+
+def _infer_column(col: pd.Series) -> pd.Series:
+    """Types an object column the way pandas' Excel parser would (numeric text becomes numbers)."""
+    if col.isna().all():
+        return pd.Series(np.nan, index=col.index, name=col.name)
+    try:
+        return pd.to_numeric(col)
+    except (ValueError, TypeError):
+        return col.where(col.notna(), np.nan).infer_objects()
+
+
+def _frame(records: List[list], names: list, keep: Optional[List[int]], dtypes: Optional[Dict]) -> pd.DataFrame:
+    width = len(names)
+    records = [r + [None] * (width - len(r)) for r in records]
+    if keep is not None:
+        records = [[r[i] for i in keep] for r in records]
+        names = [names[i] for i in keep]
+    df = pd.DataFrame.from_records(records, columns=names)
+    dtypes = dtypes or {}
+    for i, col in enumerate(df.columns):
+        if col in dtypes:
+            df.isetitem(i, df.iloc[:, i].astype(dtypes[col]))
+        elif df.dtypes.iloc[i] == object or pd.api.types.is_string_dtype(df.dtypes.iloc[i]):
+            df.isetitem(i, _infer_column(df.iloc[:, i]))
+    return df
+
+
+def _iter_chunks(wb, sheet_name: str, columns, dtypes, chunksize: int, header: int) -> Iterator[pd.DataFrame]:
+    rows = wb[sheet_name].iter_rows(min_row=header + 1, values_only=True)
+    header_row = next(rows, None)
+    if header_row is None:
+        return
+    names = _header_names(_trim(header_row))
+    wanted = set(columns) if columns is not None else None
+
+    records: List[list] = []
+    pending_blank = 0
+    for row in rows:
+        values = _trim(row)
+        if not values:
+            # Blank rows are only kept when data follows them (pandas drops trailing blanks).
+            pending_blank += 1
+            continue
+        records.extend([] for _ in range(pending_blank))
+        pending_blank = 0
+        if len(values) > len(names):
+            names = names + _header_names([None] * len(values))[len(names):]
+        records.append(values)
+        if len(records) >= chunksize:
+            keep = [i for i, n in enumerate(names) if n in wanted] if wanted is not None else None
+            yield _frame(records, names, keep, dtypes)
+            records = []
+
+    if records:
+        keep = [i for i, n in enumerate(names) if n in wanted] if wanted is not None else None
+        yield _frame(records, names, keep, dtypes)
+
+
+def iter_sheet_chunks(
+    path: str,
+    sheet_name: str,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict] = None,
+    chunksize: int = CHUNK_SIZE,
+    header: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams one sheet row by row and yields it as DataFrame chunks of up to `chunksize` rows.
+    Only `columns` (by header name) are kept when given, and `dtypes` is applied to each chunk,
+    so memory is bounded by the chunk size rather than the sheet size.
+    """
+    wb = _open(path)
+    try:
+        yield from _iter_chunks(wb, sheet_name, columns, dtypes, chunksize, header)
+    finally:
+        wb.close()
+
+
+def _sheet_chunks(wb, sheet_name: str, columns, dtypes, chunksize: int, header: int) -> Iterator[pd.DataFrame]:
+    """Like _iter_chunks, but an empty sheet yields one empty chunk carrying its header."""
+    empty = True
+    for chunk in _iter_chunks(wb, sheet_name, columns, dtypes, chunksize, header):
+        empty = False
+        yield chunk
+    if empty:
+        yield pd.DataFrame(columns=_read_header(wb, sheet_name, header))
+
+
+def _read_sheet(wb, sheet_name: str, columns, dtypes, header: int) -> pd.DataFrame:
+    chunks = list(_sheet_chunks(wb, sheet_name, columns, dtypes, CHUNK_SIZE, header))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def read_sheet(
+    path: str,
+    sheet_name: str,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict] = None,
+    header: int = 0,
+) -> pd.DataFrame:
+    """Reads one sheet through the streaming reader and returns it as a single DataFrame."""
+    wb = _open(path)
+    try:
+        return _read_sheet(wb, sheet_name, columns, dtypes, header)
+    finally:
+        wb.close()
+
+
+def iter_sheets(
+    path: str,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    dtypes: Optional[Dict[str, Dict]] = None,
+    chunksize: int = CHUNK_SIZE,
+) -> Iterator[Tuple[str, Iterator[pd.DataFrame]]]:
+    """
+    Streams the requested sheets (all when `sheets` is None) in one pass over the workbook,
+    yielding (sheet name, chunk iterator) pairs. As with itertools.groupby, a sheet's chunks
+    must be consumed before advancing to the next sheet. Every sheet yields at least one chunk,
+    so an empty sheet still reports its header.
+    """
+    columns = columns or {}
+    dtypes = dtypes or {}
+    wb = _open(path)
+    try:
+        names = wb.sheetnames if sheets is None else sheets
+        for name in names:
+            yield name, _sheet_chunks(wb, name, columns.get(name), dtypes.get(name), chunksize, 0)
+    finally:
+        wb.close()
+
+
+def read_sheets(
+    path: str,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    dtypes: Optional[Dict[str, Dict]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Reads only the requested sheets (all when `sheets` is None); `columns` and `dtypes`
+    are per-sheet mappings. Drop-in for `pd.read_excel(path, sheet_name=...)` dict loads.
+    """
+    columns = columns or {}
+    dtypes = dtypes or {}
+    wb = _open(path)
+    try:
+        names = wb.sheetnames if sheets is None else sheets
+        return {name: _read_sheet(wb, name, columns.get(name), dtypes.get(name), 0) for name in names}
+    finally:
+        wb.close()
@@ -0,0 +1,140 @@
+# TrackerPMU/field_data.py
+import os
+from io import StringIO
+from typing import List, Tuple
+
+import pandas as pd
+
+import ingest_jobs
+import shared_dataset
+from compact_dtypes import compact_frame
+from ingest import IngestResult, ingest_workbooks, validate_ingestion
+from partner_reports import build_reports
+from shared_dataset import SharedDataset, dataset_version
+from sheet_index import signature_from_csv
+from workbook_cache import workbook_key
+
+EXCEL_FILE_PATH = "KSHEERSAGAR LTD File.xlsx"
+COMPILED_REPORT_PATHS = [
+    "GovindCompiledReport_June.xlsx",
+    "SDDPLCompiledReport_June.xlsx",
+]
+
+FARMER_IDENTIFIER = "Farmer"
+BMC_IDENTIFIER = "BMC"
+FIELD_TEAM_IDENTIFIER = "FieldTeam"
+TRAINING_IDENTIFIER = "Training"
+
+FALLBACK_FARMERS_CSV = """
+Farmer_ID,Farmer_Name,Village,District,BMC_ID,Milk_Production_Liters_Daily,Cattle_Count,Women_Empowerment_Flag,Animal_Welfare_Score
+F001,Rajesh Kumar,Nandgaon,Pune,BMC001,15,5,No,4
+F002,Priya Sharma,Lonikand,Pune,BMC002,22,8,Yes,5
+F003,Amit Singh,Shirur,Pune,BMC001,18,6,No,3
+"""
+FALLBACK_BMCS_CSV = """
+BMC_ID,BMC_Name,District,Capacity_Liters,Daily_Collection_Liters,Quality_Fat_Percentage,Quality_SNF_Percentage,Quality_Adulteration_Flag,Quality_Target_Fat,Quality_Target_SNF,Utilization_Target_Percentage,Animal_Welfare_Compliance_Score_BMC,Women_Empowerment_Participation_Rate_BMC,Date
+BMC001,Nandgaon BMC,Pune,1000,750,3.5,8.0,No,3.8,8.2,80,4.0,50,2025-07-15
+BMC002,Lonikand BMC,Pune,1200,800,3.2,7.8,Yes,3.8,8.2,80,4.5,70,2025-07-15
+BMC003,Daund BMC,Pune,800,700,3.9,8.1,No,3.8,8.2,80,4.2,60,2025-07-15
+"""
+FALLBACK_FIELD_TEAMS_CSV = """
+Team_ID,Team_Leader,District_Coverage,Max_BMC_Coverage,Training_Type,Training_Date,BMC_ID_Trained,Farmer_ID_Trained,Training_Outcome_Score
+FT001,Ravi Kumar,Pune,5,Quality Improvement,2025-06-01,BMC001,,85
+"""
+
+FALLBACK_TRAINING_DATA = """
+Training_Topic,Aug'23,Sep'23,Oct'23,Nov'23,Dec'23,Jan'24,Feb'24,Mar'24,Apr'24,May'24,Jun'24,Jul'24,Aug'24,Sep'24,Oct'24,Nov'24,Dec'24,Sum_Till_Date
+Farmer's Training on AW (25 mins),92,31,15,19,11,17,17,6,17,17,21,28,20,15,20,17,17,380
+Women Farmer's Training on Dairy Business (25 mins),73,32,30,16,16,41,42,14,43,43,66,58,56,42,42,63,93,770
+Farmer's Training on Breeding and Nutrition (25 mins),83,31,15,40,43,71,46,18,48,54,82,81,94,54,63,70,70,963
+Farmer's Training on Clean Milk Prod. (25 mins),107,67,41,65,52,66,42,18,60,71,92,88,91,81,97,76,74,1188
+Farmer's Training on AW (25 mins) (Women),7,22,34,18,28,23,17,6,14,16,28,18,11,18,29,13,28,330
+Women Farmer's Training on Dairy Business (25 mins) (Women),6,20,32,15,28,18,13,5,14,12,22,16,9,15,25,10,23,283
+Farmer's Training on Breeding and Nutrition (25 mins) (Women),6,24,36,18,28,23,17,6,18,16,27,19,12,18,29,13,24,334
+Farmer's Training on CMP (25 mins) (Women),7,24,35,18,28,23,18,6,5,10,28,17,12,19,29,13,28,320
+"""
+
+SUMMARY_DATA = """
+Training_Topic,Jan'24,Feb'24,Mar'24,Apr'24,May'24,Jun'24,Jul'24,Aug'24,Sep'24,Oct'24,Nov'24,Dec'24,Total_Training,No_of_Farmers
+Farmer's Training on AW (25 mins),40,34,12,31,33,49,46,31,33,49,30,45,433,3464
+Women Farmer's Training on Dairy Business (25 mins),120,101,68,119,123,94,135,122,125,138,112,124,1381,11048
+Farmer's Training on Breeding and Nutrition (25 mins),94,63,24,66,70,109,100,106,72,92,83,94,973,7784
+Farmer's Training on CMP (25 mins),89,60,24,65,81,120,105,103,100,126,89,102,1064,8512
+Total,343,258,128,281,307,372,386,362,330,405,314,365,3851,30808
+"""
+
+# Sheets are matched to roles by these column signatures, taken from the fallback samples.
+ROLE_SIGNATURES = {
+    "farmer": signature_from_csv(FARMER_IDENTIFIER, FALLBACK_FARMERS_CSV),
+    "bmc": signature_from_csv(BMC_IDENTIFIER, FALLBACK_BMCS_CSV),
+    "field_team": signature_from_csv(FIELD_TEAM_IDENTIFIER, FALLBACK_FIELD_TEAMS_CSV),
+    "training": signature_from_csv(TRAINING_IDENTIFIER, FALLBACK_TRAINING_DATA),
+}
+
+
+def ingestion_paths() -> List[str]:
+    return [EXCEL_FILE_PATH] + [path for path in COMPILED_REPORT_PATHS if os.path.exists(path)]
+
+
+def current_dataset_version() -> str:
+    """Identifies the workbooks on disk; workbook hashes are only recomputed when a file changes."""
+    return dataset_version(*[workbook_key(path) for path in ingestion_paths()], repr(ROLE_SIGNATURES))
+
+
+def publish_dataset(version: str, ingestion: IngestResult):
+    workbook = os.path.basename(EXCEL_FILE_PATH)
+    frames = {role: ingestion.role_frame(workbook, role) for role in ROLE_SIGNATURES}
+    frames["ingest_timings"] = ingestion.timings
+    shared_dataset.publish(frames, version)
+
+
+def run_ingest_job(job: ingest_jobs.Job, report: ingest_jobs.Report) -> List[str]:
+    """
+    Ingestion worker entry point: parses the workbooks (sheets fan out to a process pool),
+    validates the role sheets, publishes the shared dataset and consolidates partner reports.
+    """
+    paths = ingestion_paths()
+    # The workbooks may have changed again since the job was queued; publish what is parsed.
+    version = current_dataset_version()
+    report(0.05, "Parsing workbooks")
+    ingestion = ingest_workbooks(
+        paths, ROLE_SIGNATURES,
+        progress=lambda parsed, total: report(0.05 + 0.75 * parsed / total, f"Parsed {parsed} of {total} sheets"),
+    )
+    report(0.85, "Validating role sheets")
+    issues = validate_ingestion(ingestion, ROLE_SIGNATURES, os.path.basename(EXCEL_FILE_PATH))
+    report(0.9, "Publishing dataset")
+    publish_dataset(version, ingestion)
+    report(0.95, "Consolidating partner reports")
+    build_reports(paths, version)
+    return issues
+
+
+# farmer, bmc, field team, training and training summary frames.
+FieldFrames = Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]
+# Cache key standing in for a dataset version while the page shows fallback_frames().
+FALLBACK_VERSION = "fallback"
+
+
+def dataset_frames(dataset: SharedDataset) -> FieldFrames:
+    """The field page's frames from a published dataset. They are shared and must not be modified in place."""
+    farmer_df = dataset.frame("farmer")
+    bmc_df = dataset.frame("bmc")
+    field_team_df = dataset.frame("field_team")
+    training_df = dataset.frame("training")
+
+    # Assuming summary data might be in the same training sheet or a separate one
+    # For now, let's assume if 'Total_Training' and 'No_of_Farmers' columns exist, it's summary_df
+    summary_df = pd.DataFrame()
+    if 'Total_Training' in training_df.columns and 'No_of_Farmers' in training_df.columns:
+        summary_df = training_df
+        # If summary data is on a different sheet, you'd need to identify it similarly
+    return farmer_df, bmc_df, field_team_df, training_df, summary_df
+
+
+def fallback_frames() -> FieldFrames:
+    """The embedded dummy data, for when no workbook has been ingested."""
+    csvs = [FALLBACK_FARMERS_CSV, FALLBACK_BMCS_CSV, FALLBACK_FIELD_TEAMS_CSV, FALLBACK_TRAINING_DATA, SUMMARY_DATA]
+    # Compacted like ingested sheets, so the page sees the same dtypes whichever source it reads.
+    farmer_df, bmc_df, field_team_df, training_df, summary_df = (compact_frame(pd.read_csv(StringIO(csv))) for csv in csvs)
+    return farmer_df, bmc_df, field_team_df, training_df, summary_df
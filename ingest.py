@@ -0,0 +1,126 @@
+# TrackerPMU/ingest.py
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from compact_dtypes import compact_frame, memory_bytes
+from sheet_index import RoleSignature, SheetIndex, load_index, normalize_column, record_dtypes, role_sheets
+from workbook_cache import is_sheet_cached, load_headers, load_workbook
+
+TIMING_COLUMNS = ["Workbook", "Sheet", "Rows", "Columns", "Seconds", "Source", "Before_MB", "After_MB"]
+
+
+class IngestResult(NamedTuple):
+    """Everything one ingestion run produced, keyed by (workbook, sheet)."""
+    frames: Dict[Tuple[str, str], pd.DataFrame]
+    roles: Dict[str, Dict[str, str]]  # workbook -> role -> sheet name
+    timings: pd.DataFrame
+
+    def role_frame(self, workbook: str, role: str) -> pd.DataFrame:
+        """Returns the sheet that plays `role` in `workbook`, or an empty frame."""
+        sheet_name = self.roles.get(workbook, {}).get(role)
+        if sheet_name is None:
+            return pd.DataFrame()
+        return self.frames[(workbook, sheet_name)]
+
+
+def _parse_sheet(path: str, sheet_name: str, dtypes: Dict[str, str]) -> Tuple[float, int]:
+    """Worker entry point: parses one sheet into the columnar cache and reports its timing."""
+    start = time.perf_counter()
+    load_workbook(path, sheet_names=[sheet_name], dtypes={sheet_name: dtypes})
+    return time.perf_counter() - start, os.getpid()
+
+
+def _parse_source(pid: int, typed: bool) -> str:
+    return f"parsed (pid {pid}, dtype hints)" if typed else f"parsed (pid {pid})"
+
+
+def ingest_workbooks(
+    paths: List[str],
+    signatures: Dict[str, RoleSignature],
+    max_workers: Optional[int] = None,
+    all_sheets: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> IngestResult:
+    """
+    Ingests the role sheets of every workbook (every sheet with `all_sheets`), parsing
+    uncached sheets in parallel worker processes. Roles come from the sheet index, which
+    only reads header rows, and parses replay the index's dtype hints. Workers write their
+    sheet to the columnar cache and only send timings back; the merged dataset is then
+    memory-mapped from the cache in this process and compacted (see compact_dtypes).
+    `progress(parsed, total)` is called as each uncached sheet finishes parsing.
+    """
+    roles: Dict[str, Dict[str, str]] = {}
+    indexes: Dict[str, SheetIndex] = {}
+    wanted: Dict[str, List[str]] = {}
+    for path in paths:
+        index = load_index(path, signatures)
+        indexes[path] = index
+        roles[os.path.basename(path)] = index.roles
+        wanted[path] = list(load_headers(path)) if all_sheets else role_sheets(index)
+
+    parse_times: Dict[Tuple[str, str], Tuple[float, str]] = {}
+    to_parse = [
+        (path, sheet, indexes[path].dtypes.get(sheet, {}))
+        for path in paths for sheet in wanted[path] if not is_sheet_cached(path, sheet)
+    ]
+    if len(to_parse) > 1:
+        workers = min(len(to_parse), max_workers or os.cpu_count() or 1)
+        # Spawned (not forked) workers: the Streamlit server process is multi-threaded.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(_parse_sheet, path, sheet, hints): (path, sheet, bool(hints)) for path, sheet, hints in to_parse}
+            for done, future in enumerate(as_completed(futures), 1):
+                path, sheet, typed = futures[future]
+                seconds, pid = future.result()
+                parse_times[(path, sheet)] = (seconds, _parse_source(pid, typed))
+                if progress:
+                    progress(done, len(to_parse))
+    elif to_parse:
+        path, sheet, hints = to_parse[0]
+        seconds, pid = _parse_sheet(path, sheet, hints)
+        parse_times[(path, sheet)] = (seconds, _parse_source(pid, bool(hints)))
+        if progress:
+            progress(1, 1)
+
+    frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+    timing_rows = []
+    for path in paths:
+        workbook = os.path.basename(path)
+        start = time.perf_counter()
+        loaded = load_workbook(path, sheet_names=wanted[path]) if wanted[path] else {}
+        read_seconds = (time.perf_counter() - start) / max(len(loaded), 1)
+        for sheet_name, df in loaded.items():
+            # Categoricals, booleans and narrow numbers, so every copy handed to a session is small.
+            frames[(workbook, sheet_name)] = compact_frame(df)
+            seconds, source = parse_times.get((path, sheet_name), (read_seconds, "cache"))
+            timing_rows.append([
+                workbook, sheet_name, len(df), len(df.columns), round(seconds, 4), source,
+                round(memory_bytes(df) / 2**20, 3), round(memory_bytes(frames[(workbook, sheet_name)]) / 2**20, 3),
+            ])
+        parsed = {sheet: df for sheet, df in loaded.items() if (path, sheet) in parse_times}
+        if parsed:
+            record_dtypes(path, parsed)
+
+    return IngestResult(frames, roles, pd.DataFrame(timing_rows, columns=TIMING_COLUMNS))
+
+
+def validate_ingestion(result: IngestResult, signatures: Dict[str, RoleSignature], workbook: str) -> List[str]:
+    """Findings for `workbook`: roles with no sheet, empty role sheets and missing expected columns."""
+    issues = []
+    for role, signature in signatures.items():
+        sheet_name = result.roles.get(workbook, {}).get(role)
+        if sheet_name is None:
+            issues.append(f"{workbook}: no sheet found for the {role} role.")
+            continue
+        df = result.frames[(workbook, sheet_name)]
+        if df.empty:
+            issues.append(f"{workbook}: sheet '{sheet_name}' ({role}) has no rows.")
+        present = {normalize_column(col) for col in df.columns}
+        missing = [col for col in signature.columns if normalize_column(col) not in present]
+        if missing:
+            issues.append(f"{workbook}: sheet '{sheet_name}' ({role}) is missing {', '.join(missing)}.")
+    return issues
@@ -0,0 +1,265 @@
+# TrackerPMU/ingest_jobs.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional
+
+from workbook_cache import CACHE_DIR
+
+JOBS_DB = os.path.join(CACHE_DIR, "ingest_jobs.db")
+POLL_SECONDS = 1.0
+# A running job whose worker has not reported for this long is assumed dead and re-queued.
+STALE_SECONDS = 300
+# How often a worker touches its job's heartbeat while running it, whatever the job reports.
+HEARTBEAT_SECONDS = 30
+ACTIVE_STATUSES = ("queued", "running")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    issues TEXT NOT NULL DEFAULT '[]',
+    error TEXT,
+    worker_pid INTEGER,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_version ON jobs (version, id);
+"""
+
+
+class Job(NamedTuple):
+    id: int
+    version: str
+    status: str  # queued | running | done | failed
+    progress: float  # 0..1
+    message: str
+    issues: List[str]  # validation findings of a completed job
+    error: Optional[str]
+    worker: Optional[str]  # id of the IngestWorker holding the claim
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+
+# Progress callback handed to job runners: (fraction done, message).
+Report = Callable[[float, str], None]
+
+_local = threading.local()
+
+
+def get_connection() -> sqlite3.Connection:
+    """This thread's connection to the job queue, opened (and migrated) on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    try:
+        # Queues created before claims were owned by a worker id.
+        conn.execute("ALTER TABLE jobs ADD COLUMN worker TEXT")
+    except sqlite3.OperationalError:
+        pass  # already there
+    _local.conn = conn
+    _local.pid = os.getpid()
+    return conn
+
+
+@contextmanager
+def transaction():
+    """BEGIN IMMEDIATE, so claiming a job cannot race another server process."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        version=row["version"],
+        status=row["status"],
+        progress=row["progress"],
+        message=row["message"],
+        issues=json.loads(row["issues"]),
+        error=row["error"],
+        worker=row["worker"],
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+    )
+
+
+def submit(version: str, retry: bool = False) -> Job:
+    """
+    Queues an ingestion of `version` unless one is already queued or running. A version whose
+    last job failed is only queued again with `retry`, so a broken workbook is not re-parsed
+    on every rerun.
+    """
+    with transaction() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE version = ? ORDER BY id DESC LIMIT 1", (version,)).fetchone()
+        if row is not None and (row["status"] in ACTIVE_STATUSES or (row["status"] == "failed" and not retry)):
+            return _job(row)
+        job_id = conn.execute(
+            "INSERT INTO jobs (version, created_at) VALUES (?, ?)", (version, time.time())
+        ).lastrowid
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+
+def claim(worker: str) -> Optional[Job]:
+    """Marks the oldest queued (or abandoned running) job as running under `worker` and returns it."""
+    now = time.time()
+    with transaction() as conn:
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE status = 'queued' OR (status = 'running' AND heartbeat < ?) ORDER BY id LIMIT 1",
+            (now - STALE_SECONDS,),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', progress = 0, message = 'Starting', worker_pid = ?, worker = ?, started_at = ?, heartbeat = ? WHERE id = ?",
+            (os.getpid(), worker, now, now, row["id"]),
+        )
+        return _job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+
+# The writes below only apply while `worker` still holds the claim: a worker presumed dead and
+# re-queued must not overwrite the progress or result of the worker that re-claimed its job.
+def heartbeat(job_id: int, worker: str) -> bool:
+    """Marks the job as still alive. False once the claim has been lost."""
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time(), job_id, worker),
+        ).rowcount > 0
+
+
+def report_progress(job_id: int, worker: str, progress: float, message: str) -> bool:
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE jobs SET progress = ?, message = ?, heartbeat = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (progress, message, time.time(), job_id, worker),
+        ).rowcount > 0
+
+
+def complete(job_id: int, worker: str, issues: List[str]) -> bool:
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE jobs SET status = 'done', progress = 1, message = 'Published', issues = ?, finished_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(issues), time.time(), job_id, worker),
+        ).rowcount > 0
+
+
+def fail(job_id: int, worker: str, error: str) -> bool:
+    with transaction() as conn:
+        return conn.execute(
+            "UPDATE jobs SET status = 'failed', message = 'Failed', error = ?, finished_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (error, time.time(), job_id, worker),
+        ).rowcount > 0
+
+
+def latest_job(version: Optional[str] = None) -> Optional[Job]:
+    """The newest job, optionally for one version."""
+    if version is None:
+        row = get_connection().execute("SELECT * FROM jobs ORDER BY id DESC LIMIT 1").fetchone()
+    else:
+        row = get_connection().execute("SELECT * FROM jobs WHERE version = ? ORDER BY id DESC LIMIT 1", (version,)).fetchone()
+    return _job(row) if row is not None else None
+
+
+def last_completed() -> Optional[Job]:
+    row = get_connection().execute("SELECT * FROM jobs WHERE status = 'done' ORDER BY id DESC LIMIT 1").fetchone()
+    return _job(row) if row is not None else None
+
+
+class IngestWorker:
+    """
+    Background thread that drains the job queue. `run(job, report)` does the work (the parse
+    itself fans out to ingest's process pool) and returns validation findings; a raised
+    exception fails the job. Any server process may run one; claims are exclusive, and a
+    heartbeat thread keeps a claim alive through long phases that report no progress.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Job, Report], List[str]],
+        interval: float = POLL_SECONDS,
+        heartbeat_interval: float = HEARTBEAT_SECONDS,
+    ):
+        self._run_job = run
+        self._interval = interval
+        self._heartbeat_interval = heartbeat_interval
+        self.id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "IngestWorker":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ingest-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Checks the queue now instead of at the next poll (e.g. right after a submit)."""
+        self._wake.set()
+
+    def run_once(self) -> Optional[Job]:
+        """Claims and runs one job; returns it, or None when the queue is empty."""
+        job = claim(self.id)
+        if job is None:
+            return None
+        done = threading.Event()
+        beat = threading.Thread(target=self._beat, args=(job.id, done), name=f"ingest-heartbeat-{job.id}", daemon=True)
+        beat.start()
+        try:
+            issues = self._run_job(job, lambda progress, message: report_progress(job.id, self.id, progress, message))
+        except Exception as e:
+            fail(job.id, self.id, f"{type(e).__name__}: {e}")
+        else:
+            complete(job.id, self.id, issues)
+        finally:
+            done.set()
+            beat.join()
+        return job
+
+    def _beat(self, job_id: int, done: threading.Event):
+        while not done.wait(self._heartbeat_interval):
+            try:
+                if not heartbeat(job_id, self.id):
+                    return  # claim lost; the job's result will be discarded
+            except sqlite3.Error:
+                pass  # queue briefly unavailable; the next beat retries
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_once() is not None:
+                    continue
+            except sqlite3.Error:
+                pass  # queue briefly unavailable (e.g. locked); retry on the next poll
+            self._wake.wait(self._interval)
+            self._wake.clear()
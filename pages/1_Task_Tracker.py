@@ -1,106 +1,151 @@
+import sqlite3
 import streamlit as st
 import pandas as pd
 from datetime import date
 
-tasks_data = {
-    
-    "Rupesh Mukherjee": [],
-    "Shifali Sharma": [],
-    "Kuntal Dutta": [],
-    "Sachin WadapaLliwar": [],
-    "Dr. Guru Mohan Reddy": [],
-    "K Balaji": [],
-    "Bhavya Kharoo": [],
-    "Gautam Bagada": [],
-    "Ajay Vaghela": [],
-    "Samadhan Bangale": [],
-    "Prabodh Pate": [],
-    "Ramalakshmi Somanchi": [],
-    "Aditya Yuvaraj": [],
-    "Bhushan Sananse": [],
-    "Nilesh Rajkumar Dhanwate": [],
-    "Ranu Laddha": [],
-    "Pari Sharma": [],
-    "Muskan Kaushal": [],
-    "Kriti Suneha": [],
-    "Nikhitha VK": [],
-    "Sandeep GS": [],
-    "Aniket Grover": [],
-    "Subhrat Ghoshal": [],
-    "Hrushikesh Tilekar": [],
-
-    
-    "Jhelum Chowdhury": [],
-    "Jaweriah Hazrana": [],
-    "Dr. Ramakrishna": [], 
-
-    "Rupesh Mukherjee": [
-        {"id": 1, "name": "Finalize Project Alpha Scope", "description": "Meet with stakeholders to define final project scope.", "status": "To Do", "due_date": date(2025, 7, 10)},
-        {"id": 2, "name": "Q3 Planning Review", "description": "Review Q3 plans with department heads.", "status": "In Progress", "due_date": date(2025, 7, 15)},
-    ],
-    "Shifali Sharma": [
-        {"id": 3, "name": "Onboard New PM", "description": "Complete onboarding for the new project manager.", "status": "In Progress", "due_date": date(2025, 6, 28)},
-        {"id": 4, "name": "Update Risk Register", "description": "Review and update project risk register for all active programs.", "status": "To Do", "due_date": date(2025, 7, 5)},
-    ],
-    "Kuntal Dutta": [
-        {"id": 5, "name": "Client X Meeting Prep", "description": "Prepare agenda and presentation for Client X meeting.", "status": "Done", "due_date": date(2025, 6, 20)},
-    ]
-}
-
-if 'tasks' not in st.session_state:
-    st.session_state.tasks = tasks_data
-
-if 'next_task_id' not in st.session_state:
-    max_id = 0
-    for employee_tasks in st.session_state.tasks.values():
-        for task in employee_tasks:
-            if task['id'] > max_id:
-                max_id = task['id']
-    st.session_state.next_task_id = max_id + 1 if max_id > 0 else 1 
+import data_manager
+
+KANBAN_PAGE_SIZES = [10, 20, 50]
+# Finished work rarely needs attention, so that column starts collapsed to its summary.
+COLLAPSED_BY_DEFAULT = {"Done"}
 
 
 def add_task(employee_name, task_name, description, due_date):
     """Adds a new task for the given employee."""
-    new_task = {
-        "id": st.session_state.next_task_id,
-        "name": task_name,
-        "description": description,
-        "status": "To Do", 
-        "due_date": due_date
-    }
-    
-    if employee_name not in st.session_state.tasks:
-        st.session_state.tasks[employee_name] = []
-    st.session_state.tasks[employee_name].append(new_task)
-    st.session_state.next_task_id += 1
+    data_manager.insert_task(employee_name, task_name, description, due_date)
     st.success(f"Task '{task_name}' added for {employee_name}!")
 
 def update_task_status(employee_name, task_id, new_status):
     """Updates the status of a specific task."""
-    found = False
-    for tasks_list in st.session_state.tasks.values():
-        for task in tasks_list:
-            if task['id'] == task_id:
-                task['status'] = new_status
-                found = True
-                st.success(f"Task '{task['name']}' status updated to '{new_status}'!")
-                return
-    if not found:
+    if data_manager.update_task_status(task_id, new_status):
+        st.success(f"Task status updated to '{new_status}'!")
+    else:
         st.error("Task not found.")
 
 def delete_task(employee_name, task_id):
     """Deletes a task for a given employee."""
-    if employee_name in st.session_state.tasks:
-        initial_len = len(st.session_state.tasks[employee_name])
-        st.session_state.tasks[employee_name] = [
-            task for task in st.session_state.tasks[employee_name] if task['id'] != task_id
-        ]
-        if len(st.session_state.tasks[employee_name]) < initial_len:
-            st.success("Task deleted successfully!")
-        else:
-            st.warning("Task not found for this employee.")
+    if data_manager.delete_task(task_id):
+        st.success("Task deleted successfully!")
     else:
-        st.warning("Employee not found.")
+        st.warning("Task not found for this employee.")
+
+def column_summary(status, summary):
+    """One-line server-side summary of a column, shown even when its cards are not rendered."""
+    parts = [f"{summary['count']} task(s)"]
+    if status != "Done":
+        if summary["overdue"]:
+            parts.append(f"{summary['overdue']} overdue")
+        if summary["next_due"] is not None:
+            parts.append(f"next due {summary['next_due'].strftime('%Y-%m-%d')}")
+    return " · ".join(parts)
+
+def render_task_card(employee_name, task, kanban_statuses):
+    """The expander with status and delete controls for one task."""
+    with st.expander(f"**{task['name']}**"):
+        st.markdown(f"**Description:** {task['description']}")
+        st.markdown(f"**Due Date:** {task['due_date'].strftime('%Y-%m-%d')}")
+        st.markdown(f"**Task ID:** `{task['id']}`")
+
+        new_status = st.selectbox(
+            "Change Status",
+            kanban_statuses,
+            index=kanban_statuses.index(task['status']),
+            key=f"status_select_{task['id']}"
+        )
+        if new_status != task['status']:
+            update_task_status(employee_name, task['id'], new_status)
+            st.rerun()
+
+        if st.button("Delete Task", key=f"delete_button_{task['id']}"):
+            delete_task(employee_name, task['id'])
+            st.rerun()
+
+def render_column(employee_name, status, summary, kanban_statuses, page_size):
+    """
+    A Kanban column showing one page of cards. Widgets are only built for the cards on the
+    page; the rest of the column is represented by its summary and the paging cursors.
+    """
+    st.subheader(f"{status} ({summary['count']})")
+    st.caption(column_summary(status, summary))
+    st.markdown("---")
+
+    if not summary["count"]:
+        st.info("No tasks here!")
+        return
+    if not st.toggle("Show cards", value=status not in COLLAPSED_BY_DEFAULT, key=f"kanban_expanded_{employee_name}_{status}"):
+        return
+
+    # Cursors of the pages before the current one, so "Previous" can step back.
+    cursors = st.session_state.setdefault(f"kanban_cursors_{employee_name}_{status}", [])
+    page = data_manager.fetch_task_page(employee_name, status, cursors[-1] if cursors else None, page_size)
+    while not page.tasks and cursors:
+        # Every card on this page was moved or deleted; fall back to the page before it.
+        cursors.pop()
+        page = data_manager.fetch_task_page(employee_name, status, cursors[-1] if cursors else None, page_size)
+
+    for task in page.tasks:
+        render_task_card(employee_name, task, kanban_statuses)
+
+    st.caption(f"Showing {page.offset + 1}–{page.offset + len(page.tasks)} of {summary['count']}")
+    previous_col, next_col = st.columns(2)
+    with previous_col:
+        if cursors:
+            st.button("◀ Previous", key=f"kanban_previous_{employee_name}_{status}", on_click=cursors.pop)
+    with next_col:
+        if page.next_cursor is not None:
+            st.button("Next ▶", key=f"kanban_next_{employee_name}_{status}", on_click=cursors.append, args=(page.next_cursor,))
+
+def render_bulk_editor(employee_name, kanban_statuses):
+    """
+    Grid of all the employee's tasks. Edits and the bulk action are held by the form until
+    "Apply Changes", then written in one transaction followed by a single rerun.
+    """
+    tasks = data_manager.fetch_tasks(employee=employee_name)
+    if not tasks:
+        st.info(f"{employee_name} currently has no tasks. Add one using the sidebar form!")
+        return
+    original = pd.DataFrame(tasks, columns=["id", *data_manager.EDITABLE_TASK_FIELDS]).assign(selected=False)
+    # Bumped after every apply, so the grid restarts from the saved tasks instead of replaying old edits.
+    version = st.session_state.get("bulk_edit_version", 0)
+
+    with st.form("bulk_edit_form"):
+        edited = st.data_editor(
+            original,
+            key=f"bulk_editor_{employee_name}_{version}",
+            hide_index=True,
+            disabled=["id"],
+            column_order=["selected", "id", "name", "description", "status", "due_date"],
+            column_config={
+                "selected": st.column_config.CheckboxColumn("Select"),
+                "id": st.column_config.NumberColumn("Task ID", format="%d"),
+                "name": st.column_config.TextColumn("Task Name", required=True),
+                "description": st.column_config.TextColumn("Description"),
+                "status": st.column_config.SelectboxColumn("Status", options=kanban_statuses, required=True),
+                "due_date": st.column_config.DateColumn("Due Date", format="YYYY-MM-DD", required=True),
+            },
+        )
+        action_col, status_col, shift_col = st.columns(3)
+        with action_col:
+            action = st.selectbox("Apply to selected tasks", data_manager.BULK_ACTIONS)
+        with status_col:
+            target_status = st.selectbox("New status", kanban_statuses)
+        with shift_col:
+            shift_days = st.number_input("Move due date by (days)", value=7, step=1)
+        submitted = st.form_submit_button("Apply Changes")
+
+    if submitted:
+        updates, deletes = data_manager.bulk_task_changes(original, edited, action, target_status, int(shift_days))
+        if not updates and not deletes:
+            st.info("No changes to apply.")
+            return
+        try:
+            updated, deleted = data_manager.apply_task_changes(updates, deletes)
+        except (sqlite3.Error, ValueError) as e:
+            st.error(f"No changes were saved: {e}")
+            return
+        st.session_state["bulk_edit_version"] = version + 1
+        st.toast(f"Updated {updated} and deleted {deleted} task(s).")
+        st.rerun()
 
 
 st.set_page_config(layout="wide", page_title="Project Task Tracker")
@@ -108,7 +153,7 @@ st.set_page_config(layout="wide", page_title="Project Task Tracker")
 st.title("🚀 Project Management Task Tracker")
 st.markdown("---")
 
-employee_names = sorted(list(st.session_state.tasks.keys()))
+employee_names = data_manager.fetch_employee_names()
 if not employee_names:
     st.warning("No employees loaded. Please add employees to the initial data.")
     st.stop() 
@@ -132,44 +177,24 @@ with st.sidebar.form("new_task_form"):
 
 st.sidebar.markdown("---")
 st.sidebar.info("Select an employee to view and manage their tasks. Use the form above to add new tasks.")
+
+kanban_statuses = list(data_manager.TASK_STATUSES)
+view = st.sidebar.radio("View", ["Kanban Board", "Bulk Edit"], key="task_view")
+
+if view == "Bulk Edit":
+    st.header(f"Bulk Edit Tasks for {selected_employee}")
+    render_bulk_editor(selected_employee, kanban_statuses)
+    st.stop()
+
 st.header(f"Kanban Board for {selected_employee}")
+page_size = st.sidebar.selectbox("Cards per column", KANBAN_PAGE_SIZES, index=1)
+summaries = data_manager.summarize_tasks_by_status(selected_employee, kanban_statuses, date.today())
 
-if selected_employee not in st.session_state.tasks or not st.session_state.tasks[selected_employee]:
+if not any(summary["count"] for summary in summaries.values()):
     st.info(f"{selected_employee} currently has no tasks. Add one using the sidebar form!")
 else:
-
-    employee_tasks = st.session_state.tasks[selected_employee]
-
-    
-    status_columns = st.columns(3) 
-    kanban_statuses = ["To Do", "In Progress", "Done"]
+    status_columns = st.columns(3)
 
     for i, status in enumerate(kanban_statuses):
         with status_columns[i]:
-            st.subheader(status)
-            st.markdown("---")
-
-            tasks_in_status = [task for task in employee_tasks if task['status'] == status]
-
-            if not tasks_in_status:
-                st.info("No tasks here!")
-            else:
-                for task in tasks_in_status:
-                    with st.expander(f"**{task['name']}**"):
-                        st.markdown(f"**Description:** {task['description']}")
-                        st.markdown(f"**Due Date:** {task['due_date'].strftime('%Y-%m-%d')}")
-                        st.markdown(f"**Task ID:** `{task['id']}`") 
-                        
-                        new_status = st.selectbox(
-                            "Change Status",
-                            kanban_statuses,
-                            index=kanban_statuses.index(task['status']),
-                            key=f"status_select_{task['id']}" 
-                        )
-                        if new_status != task['status']:
-                            update_task_status(selected_employee, task['id'], new_status)
-                            st.rerun() 
-                        
-                        if st.button("Delete Task", key=f"delete_button_{task['id']}"):
-                            delete_task(selected_employee, task['id'])
-                            st.rerun() 
+            render_column(selected_employee, status, summaries[status], kanban_statuses, page_size)
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 
+import data_manager
+
 st.set_page_config(
     page_title="Programs Dashboard",
     page_icon="📊",
@@ -10,60 +12,18 @@ st.set_page_config(
 st.title("📊 Programs Dashboard")
 st.markdown("Overview and management of current projects/programs, including budget and spent tracking.")
 
-if 'programs_data' not in st.session_state:
-    st.session_state.programs_data = {
-        "SAKSHAM": {
-            "budget": 250000.00,
-            "tasks": [
-                {"id": 1, "name": "Phase 1 Rollout", "spent": 50000.00, "description": "Execute initial rollout in selected regions."},
-                {"id": 2, "name": "Beneficiary Registration", "spent": 15000.00, "description": "Register new beneficiaries and collect data."}
-            ]
-        },
-        "Heritage": {
-            "budget": 180000.00, 
-            "tasks": [
-                {"id": 1, "name": "Site Assessment", "spent": 20000.00, "description": "Conduct preliminary assessment of historical sites."},
-                {"id": 2, "name": "Restoration Planning", "spent": 10000.00, "description": "Develop detailed restoration plans."}
-            ]
-        },
-        "KS 1.0": {
-            "budget": 120000.00, 
-            "tasks": [
-                {"id": 1, "name": "Curriculum Development", "spent": 30000.00, "description": "Design educational curriculum modules."}
-            ]
-        },
-        "KS 2.0": {
-            "budget": 150000.00, 
-            "tasks": [
-                {"id": 1, "name": "Technology Integration", "spent": 25000.00, "description": "Integrate new learning technologies."}
-            ]
-        },
-        "Water Program": {
-            "budget": 300000.00, 
-            "tasks": [
-                {"id": 1, "name": "Well Drilling", "spent": 75000.00, "description": "Drill new water wells in target villages."},
-                {"id": 2, "name": "Community Engagement", "spent": 10000.00, "description": "Engage local communities for water management."}
-            ]
-        },
-        "Education Program": {
-            "budget": 200000.00, 
-            "tasks": [
-                {"id": 1, "name": "Teacher Training", "spent": 40000.00, "description": "Conduct training workshops for educators."},
-                {"id": 2, "name": "Material Distribution", "spent": 18000.00, "description": "Distribute educational materials to schools."}
-            ]
-        }
-    }
+programs_data = data_manager.fetch_programs()
 
 def calculate_program_financials(program_name):
-    program = st.session_state.programs_data[program_name]
+    program = programs_data[program_name]
     total_spent = sum(task['spent'] for task in program['tasks'])
     remaining_budget = program['budget'] - total_spent
     return total_spent, remaining_budget
 
 st.header("📈 Program Financial Overview")
-if st.session_state.programs_data:
+if programs_data:
     overview_data = []
-    for program_name, program_details in st.session_state.programs_data.items():
+    for program_name, program_details in programs_data.items():
         total_spent, remaining_budget = calculate_program_financials(program_name)
         overview_data.append({
             "Program": program_name,
@@ -79,7 +39,7 @@ else:
 st.markdown("---")
 
 st.header("➕ Add/Manage Programs")
-program_names_list = sorted(list(st.session_state.programs_data.keys())) # Renamed to avoid conflict
+program_names_list = sorted(list(programs_data.keys())) # Renamed to avoid conflict
 
 with st.expander("Add New Program"):
     with st.form("add_program_form"):
@@ -88,11 +48,7 @@ with st.expander("Add New Program"):
         add_program_button = st.form_submit_button("Add Program")
 
         if add_program_button:
-            if new_program_name and new_program_name not in st.session_state.programs_data:
-                st.session_state.programs_data[new_program_name] = {
-                    "budget": new_program_budget,
-                    "tasks": []
-                }
+            if new_program_name and data_manager.insert_program(new_program_name, new_program_budget):
                 st.success(f"Program '{new_program_name}' added with budget ₹ {new_program_budget:,.2f}.")
                 st.rerun()
             elif new_program_name:
@@ -105,7 +61,7 @@ if program_names_list:
     selected_program = st.selectbox("Choose a Program", program_names_list, key="selected_program_details")
 
     if selected_program:
-        current_program = st.session_state.programs_data[selected_program]
+        current_program = programs_data[selected_program]
         total_spent_for_selected, remaining_budget_for_selected = calculate_program_financials(selected_program)
 
         st.subheader(f"Details for: {selected_program}")
@@ -118,7 +74,7 @@ if program_names_list:
             updated_budget = st.number_input("New Program Budget (₹)", min_value=0.00, value=current_program['budget'], step=1000.00, key=f"update_budget_{selected_program}")
             update_budget_button = st.form_submit_button("Update Budget")
             if update_budget_button:
-                st.session_state.programs_data[selected_program]['budget'] = updated_budget
+                data_manager.update_program_budget(selected_program, updated_budget)
                 st.success(f"Budget for '{selected_program}' updated to ₹ {updated_budget:,.2f}.")
                 st.rerun()
 
@@ -140,14 +96,7 @@ if program_names_list:
 
             if add_task_button:
                 if new_task_name:
-                    next_task_id = (max([t['id'] for t in current_program['tasks']]) + 1) if current_program['tasks'] else 1
-                    new_task = {
-                        "id": next_task_id,
-                        "name": new_task_name,
-                        "description": new_task_description,
-                        "spent": initial_spent
-                    }
-                    st.session_state.programs_data[selected_program]['tasks'].append(new_task)
+                    data_manager.insert_program_task(selected_program, new_task_name, new_task_description, initial_spent)
 
             
                     st.toast(
@@ -176,10 +125,7 @@ if program_names_list:
                         update_spent_button = st.form_submit_button("Update Task Spent")
 
                         if update_spent_button: 
-                            for i, task in enumerate(st.session_state.programs_data[selected_program]['tasks']):
-                                if task['id'] == selected_task_id:
-                                    st.session_state.programs_data[selected_program]['tasks'][i]['spent'] = new_spent_amount
-                                    break
+                            data_manager.update_program_task_spent(selected_program, selected_task_id, new_spent_amount)
                             st.success(f"Spent for task '{current_task['name']}' updated to ₹ {new_spent_amount:,.2f}.")
                             st.rerun()
                 else:
@@ -1,8 +1,11 @@
 import streamlit as st
+import pandas as pd
 from datetime import datetime
 import json
 import os
 import pytz 
+
+import data_manager
 st.set_page_config(layout="wide", page_title="Attendance Marker")
 
 st.title("⏰ Attendance Marker")
@@ -10,10 +13,6 @@ st.markdown("---")
 
 ATTENDANCE_FILE = "attendance_records.json" 
 
-
-if 'attendance_records' not in st.session_state:
-    st.session_state.attendance_records = {} 
-
 employee_names = sorted([
     "Rupesh Mukherjee", "Shifali Sharma", "Kuntal Dutta", "Sachin WadapaLliwar",
     "Dr. Guru Mohan Reddy", "K Balaji", "Bhavya Kharoo", "Gautam Bagada",
@@ -40,14 +39,7 @@ col1, col2 = st.columns(2)
 with col1:
     if st.button("Check In 👋"):
         if selected_employee_attendance:
-            record = {
-                "timestamp": current_time_ist.isoformat(),
-                "type": "Check-In",
-                "location": current_location_input
-            }
-            if selected_employee_attendance not in st.session_state.attendance_records:
-                st.session_state.attendance_records[selected_employee_attendance] = []
-            st.session_state.attendance_records[selected_employee_attendance].append(record)
+            data_manager.insert_attendance(selected_employee_attendance, current_time_ist, "Check-In", current_location_input)
             st.success(f"Checked In for {selected_employee_attendance} at {current_time_ist.strftime('%H:%M:%S')} from {current_location_input}!")
         else:
             st.error("Please select your name.")
@@ -55,14 +47,7 @@ with col1:
 with col2:
     if st.button("Check Out 👋"):
         if selected_employee_attendance:
-            record = {
-                "timestamp": current_time_ist.isoformat(),
-                "type": "Check-Out",
-                "location": current_location_input
-            }
-            if selected_employee_attendance not in st.session_state.attendance_records:
-                st.session_state.attendance_records[selected_employee_attendance] = []
-            st.session_state.attendance_records[selected_employee_attendance].append(record)
+            data_manager.insert_attendance(selected_employee_attendance, current_time_ist, "Check-Out", current_location_input)
             st.success(f"Checked Out for {selected_employee_attendance} at {current_time_ist.strftime('%H:%M:%S')} from {current_location_input}!")
         else:
             st.error("Please select your name.")
@@ -70,11 +55,11 @@ with col2:
 st.markdown("---")
 st.subheader(f"Attendance History for {selected_employee_attendance}")
 
-if selected_employee_attendance in st.session_state.attendance_records and st.session_state.attendance_records[selected_employee_attendance]:
+attendance_records = data_manager.fetch_attendance(selected_employee_attendance)
+if attendance_records:
     
-    attendance_df = pd.DataFrame(st.session_state.attendance_records[selected_employee_attendance])
+    attendance_df = pd.DataFrame(attendance_records)
     attendance_df['timestamp'] = pd.to_datetime(attendance_df['timestamp']) 
-    attendance_df = attendance_df.sort_values(by='timestamp', ascending=False)
     st.dataframe(attendance_df, use_container_width=True)
 else:
     st.info("No attendance records found for this employee yet.")
@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
+import data_manager
+
 st.set_page_config(
     page_title="One-on-One Meetings",
     page_icon="🤝",
@@ -11,8 +13,7 @@ st.set_page_config(
 st.title("🤝 One-on-One Meeting Management")
 st.markdown("Streamline your one-on-one discussions with employees.")
 
-if 'meetings' not in st.session_state:
-    st.session_state.meetings = []
+meetings = data_manager.fetch_meetings()
 
 employee_names = sorted([
     "Rupesh Mukherjee",
@@ -73,15 +74,7 @@ if employee_names:
 
                 meeting_datetime = datetime.combine(meeting_date, parsed_time)
 
-                new_meeting = {
-                    "id": len(st.session_state.meetings) + 1, 
-                    "employee": selected_employee,
-                    "datetime": meeting_datetime,
-                    "purpose": meeting_purpose,
-                    "agenda": "", 
-                    "mom": ""  
-                }
-                st.session_state.meetings.append(new_meeting)
+                data_manager.insert_meeting(selected_employee, meeting_datetime, meeting_purpose)
                 st.success(f"Meeting with **{selected_employee}** scheduled for **{meeting_datetime.strftime('%Y-%m-%d %I:%M %p')}**!")
                 st.rerun() 
             except ValueError as e:
@@ -93,11 +86,9 @@ st.markdown("---")
 
 
 st.header("📋 Upcoming Meetings")
-if st.session_state.meetings:
+if meetings:
     
-    sorted_meetings = sorted(st.session_state.meetings, key=lambda x: x['datetime'])
-
-    meetings_df = pd.DataFrame(sorted_meetings)
+    meetings_df = pd.DataFrame(meetings)
     
     meetings_df['datetime'] = pd.to_datetime(meetings_df['datetime'])
 
@@ -134,8 +125,8 @@ else:
 st.markdown("---") 
 
 st.header("📝 Meeting Agenda & MoM Taker")
-if st.session_state.meetings:
-    sorted_meetings_for_mom = sorted(st.session_state.meetings, key=lambda x: x['datetime'], reverse=True) # Show recent first
+if meetings:
+    sorted_meetings_for_mom = meetings[::-1] # Show recent first
 
     meeting_options = [
         f"{m['datetime'].strftime('%Y-%m-%d %I:%M %p')} - {m['employee']} (ID: {m['id']})"
@@ -155,7 +146,7 @@ if st.session_state.meetings:
 
         current_meeting = None
         if selected_meeting_id is not None:
-            current_meeting = next((m for m in st.session_state.meetings if m['id'] == selected_meeting_id), None)
+            current_meeting = data_manager.get_meeting(selected_meeting_id)
 
         if current_meeting:
             st.subheader(f"Managing Meeting with {current_meeting['employee']} on {current_meeting['datetime'].strftime('%Y-%m-%d %I:%M %p')}")
@@ -187,16 +178,12 @@ if st.session_state.meetings:
 
                 if save_button:
                     
-                    for i, m in enumerate(st.session_state.meetings):
-                        if m['id'] == current_meeting['id']:
-                            st.session_state.meetings[i]['agenda'] = updated_agenda
-                            st.session_state.meetings[i]['mom'] = updated_mom
-                            break
+                    data_manager.update_meeting_notes(current_meeting['id'], updated_agenda, updated_mom)
                     st.success("Agenda and MoM saved successfully!")
                     st.rerun() 
                 elif delete_button:
                     
-                    st.session_state.meetings = [m for m in st.session_state.meetings if m['id'] != current_meeting['id']]
+                    data_manager.delete_meeting(current_meeting['id'])
                     st.warning(f"Meeting with {current_meeting['employee']} deleted.")
                     st.rerun() 
         else:
@@ -214,8 +201,8 @@ st.header("📅 Individual Employee Calendar")
 if employee_names:
     selected_employee_calendar = st.selectbox("Select Employee to View Calendar", employee_names, key="calendar_employee")
 
-    if st.session_state.meetings:
-        employee_meetings = [m for m in st.session_state.meetings if m['employee'] == selected_employee_calendar]
+    if meetings:
+        employee_meetings = data_manager.fetch_meetings(employee=selected_employee_calendar)
         if employee_meetings:
             employee_meetings_df = pd.DataFrame(employee_meetings)
             employee_meetings_df['datetime'] = pd.to_datetime(employee_meetings_df['datetime']) 
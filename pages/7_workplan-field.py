@@ -1,55 +1,30 @@
 import streamlit as st
 import pandas as pd
 import os
-from io import StringIO
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
 import datetime
-
-# --- Constants and Fallback Data (existing code) ---
-EXCEL_FILE_PATH = "KSHEERSAGAR LTD File.xlsx"
-
-FARMER_IDENTIFIER = "Farmer"
-BMC_IDENTIFIER = "BMC"
-FIELD_TEAM_IDENTIFIER = "FieldTeam"
-TRAINING_IDENTIFIER = "Training"
-
-FALLBACK_FARMERS_CSV = """
-Farmer_ID,Farmer_Name,Village,District,BMC_ID,Milk_Production_Liters_Daily,Cattle_Count,Women_Empowerment_Flag,Animal_Welfare_Score
-F001,Rajesh Kumar,Nandgaon,Pune,BMC001,15,5,No,4
-F002,Priya Sharma,Lonikand,Pune,BMC002,22,8,Yes,5
-F003,Amit Singh,Shirur,Pune,BMC001,18,6,No,3
-"""
-FALLBACK_BMCS_CSV = """
-BMC_ID,BMC_Name,District,Capacity_Liters,Daily_Collection_Liters,Quality_Fat_Percentage,Quality_SNF_Percentage,Quality_Adulteration_Flag,Quality_Target_Fat,Quality_Target_SNF,Utilization_Target_Percentage,Animal_Welfare_Compliance_Score_BMC,Women_Empowerment_Participation_Rate_BMC,Date
-BMC001,Nandgaon BMC,Pune,1000,750,3.5,8.0,No,3.8,8.2,80,4.0,50,2025-07-15
-BMC002,Lonikand BMC,Pune,1200,800,3.2,7.8,Yes,3.8,8.2,80,4.5,70,2025-07-15
-BMC003,Daund BMC,Pune,800,700,3.9,8.1,No,3.8,8.2,80,4.2,60,2025-07-15
-"""
-FALLBACK_FIELD_TEAMS_CSV = """
-Team_ID,Team_Leader,District_Coverage,Max_BMC_Coverage,Training_Type,Training_Date,BMC_ID_Trained,Farmer_ID_Trained,Training_Outcome_Score
-FT001,Ravi Kumar,Pune,5,Quality Improvement,2025-06-01,BMC001,,85
-"""
-
-FALLBACK_TRAINING_DATA = """
-Training_Topic,Aug'23,Sep'23,Oct'23,Nov'23,Dec'23,Jan'24,Feb'24,Mar'24,Apr'24,May'24,Jun'24,Jul'24,Aug'24,Sep'24,Oct'24,Nov'24,Dec'24,Sum_Till_Date
-Farmer's Training on AW (25 mins),92,31,15,19,11,17,17,6,17,17,21,28,20,15,20,17,17,380
-Women Farmer's Training on Dairy Business (25 mins),73,32,30,16,16,41,42,14,43,43,66,58,56,42,42,63,93,770
-Farmer's Training on Breeding and Nutrition (25 mins),83,31,15,40,43,71,46,18,48,54,82,81,94,54,63,70,70,963
-Farmer's Training on Clean Milk Prod. (25 mins),107,67,41,65,52,66,42,18,60,71,92,88,91,81,97,76,74,1188
-Farmer's Training on AW (25 mins) (Women),7,22,34,18,28,23,17,6,14,16,28,18,11,18,29,13,28,330
-Women Farmer's Training on Dairy Business (25 mins) (Women),6,20,32,15,28,18,13,5,14,12,22,16,9,15,25,10,23,283
-Farmer's Training on Breeding and Nutrition (25 mins) (Women),6,24,36,18,28,23,17,6,18,16,27,19,12,18,29,13,24,334
-Farmer's Training on CMP (25 mins) (Women),7,24,35,18,28,23,18,6,5,10,28,17,12,19,29,13,28,320
-"""
-
-SUMMARY_DATA = """
-Training_Topic,Jan'24,Feb'24,Mar'24,Apr'24,May'24,Jun'24,Jul'24,Aug'24,Sep'24,Oct'24,Nov'24,Dec'24,Total_Training,No_of_Farmers
-Farmer's Training on AW (25 mins),40,34,12,31,33,49,46,31,33,49,30,45,433,3464
-Women Farmer's Training on Dairy Business (25 mins),120,101,68,119,123,94,135,122,125,138,112,124,1381,11048
-Farmer's Training on Breeding and Nutrition (25 mins),94,63,24,66,70,109,100,106,72,92,83,94,973,7784
-Farmer's Training on CMP (25 mins),89,60,24,65,81,120,105,103,100,126,89,102,1064,8512
-Total,343,258,128,281,307,372,386,362,330,405,314,365,3851,30808
-"""
+from functools import partial
+
+import ingest_jobs
+import shared_dataset
+import workplan_journal
+from bmc_kpis import evaluate_latest, load_registry, parse_registry
+from bmc_latest import ROLLING_COLUMNS, BmcLatestView
+from field_data import (
+    EXCEL_FILE_PATH, FALLBACK_VERSION, FieldFrames, current_dataset_version, dataset_frames, fallback_frames,
+    ingestion_paths, run_ingest_job,
+)
+from partner_reports import COMPILED_SOURCE, KPI_SHEET_SOURCE, PartnerReports, published_reports
+from shared_dataset import SharedDataset
+from single_flight import SingleFlight
+from training_cube import TrainingCube
+from workplan_aggregates import period_key
+from workplan_export import EXPORT_FORMATS, ExportCache, file_name, mime_type
+from workbook_watcher import WorkbookWatcher
+from workplan_store import WorkplanStore
+
+# Seconds a workbook version check is reused by other sessions before it is revalidated.
+VERSION_TTL_SECONDS = 2.0
 
 # --- Workplan specific constants and data storage ---
 WORKPLAN_FILE_PATH = "daily_workplans.csv"
@@ -80,81 +55,132 @@ ACTIVITIES = [
 # --- Existing Data Loading Functions ---
 st.set_page_config(layout="wide")
 
-@st.cache_data(show_spinner="Loading Ksheersagar data...")
-def load_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]: # Corrected line
+@st.cache_resource
+def dataset_version_loader() -> SingleFlight:
+    """
+    current_dataset_version() shared by every session in the process: concurrent reruns wait on
+    one workbook check, and its result is served (and revalidated in the background) after that.
+    """
+    return SingleFlight(current_dataset_version, ttl=VERSION_TTL_SECONDS)
+
+@st.cache_resource
+def start_ingest_worker() -> ingest_jobs.IngestWorker:
+    """One ingestion worker per server process; workbooks are never parsed on a script thread."""
+    return ingest_jobs.IngestWorker(run_ingest_job).start()
+
+def refresh_dataset(changed_paths: List[str]):
+    """Watcher callback: queues an ingestion of the new workbook version for the worker."""
+    version = current_dataset_version()
+    dataset = shared_dataset.current()
+    if dataset is None or dataset.version != version:
+        ingest_jobs.submit(version)
+
+@st.cache_resource
+def start_workbook_watcher() -> WorkbookWatcher:
+    """One background watcher per server process; new workbook versions are published without blocking a rerun."""
+    return WorkbookWatcher(ingestion_paths, refresh_dataset).start()
+
+def resolve_dataset_version() -> Optional[str]:
+    """
+    The last published dataset version. A newer version of the workbooks on disk is queued
+    for the ingestion worker instead of being parsed on this rerun. None until the first
+    ingestion has completed.
     """
-    Attempts to load data from an Excel file and split it into DataFrames, then falls back to embedded dummy CSV data.
+    os.stat(EXCEL_FILE_PATH)  # FileNotFoundError -> fallback data
+    start_workbook_watcher()
+    worker = start_ingest_worker()
+    dataset = shared_dataset.current()
+    version = dataset_version_loader()()
+    if dataset is None or dataset.version != version:
+        ingest_jobs.submit(version)
+        worker.wake()
+    return dataset.version if dataset is not None else None
+
+@st.cache_resource(max_entries=2)
+def load_shared_dataset(version: str) -> SharedDataset:
+    """Maps a published dataset version; every session in this process shares the returned handle."""
+    return SharedDataset(version)
+
+def load_versioned_data() -> Tuple[str, FieldFrames]:
+    """
+    Reads the last completed ingestion (the shared dataset built from the Excel file), then falls back to embedded
+    dummy CSV data. Returns the dataset version the frames came from (FALLBACK_VERSION for the dummy data) with
+    the frames, so caches keyed on the version never mix the two. The frames are shared across sessions and must
+    not be modified in place.
     """
     try:
-        all_data_df = pd.read_excel(EXCEL_FILE_PATH, sheet_name=None) # Load all sheets
-        
-        # Determine which sheet contains which identifier
-        farmer_sheet_name = None
-        bmc_sheet_name = None
-        field_team_sheet_name = None
-        training_sheet_name = None
-        
-        for sheet_name, df_sheet in all_data_df.items():
-            # Check for column names containing the identifier
-            if any(FARMER_IDENTIFIER.lower() in str(col).lower() for col in df_sheet.columns):
-                farmer_sheet_name = sheet_name
-            if any(BMC_IDENTIFIER.lower() in str(col).lower() for col in df_sheet.columns):
-                bmc_sheet_name = sheet_name
-            if any(FIELD_TEAM_IDENTIFIER.lower() in str(col).lower() for col in df_sheet.columns):
-                field_team_sheet_name = sheet_name
-            if any(TRAINING_IDENTIFIER.lower() in str(col).lower() for col in df_sheet.columns):
-                training_sheet_name = sheet_name
-        
-        farmer_df = all_data_df.get(farmer_sheet_name, pd.DataFrame())
-        bmc_df = all_data_df.get(bmc_sheet_name, pd.DataFrame())
-        field_team_df = all_data_df.get(field_team_sheet_name, pd.DataFrame())
-        training_df = all_data_df.get(training_sheet_name, pd.DataFrame())
-        
-        # Assuming summary data might be in the same training sheet or a separate one
-        # For now, let's assume if 'Total_Training' and 'No_of_Farmers' columns exist, it's summary_df
-        summary_df = pd.DataFrame()
-        if training_sheet_name:
-            if 'Total_Training' in all_data_df[training_sheet_name].columns and 'No_of_Farmers' in all_data_df[training_sheet_name].columns:
-                summary_df = all_data_df[training_sheet_name]
-            # If summary data is on a different sheet, you'd need to identify it similarly
-            
+        version = resolve_dataset_version()
+        if version is None:
+            raise LookupError("The Ksheersagar workbook is being ingested in the background")
+        frames = dataset_frames(load_shared_dataset(version))
         st.success("Data loaded and split from the Excel file!")
-        return farmer_df, bmc_df, field_team_df, training_df, summary_df
+        return version, frames
 
     except FileNotFoundError:
         st.warning("Excel file not found. Falling back to dummy data.")
+    except LookupError as e:
+        st.info(f"{e}; showing dummy data until it completes.")
     except Exception as e:
         st.error(f"Error loading/splitting data from the Excel file: {e}. Falling back to dummy data.")
 
     try:
-        farmer_df = pd.read_csv(StringIO(FALLBACK_FARMERS_CSV))
-        bmc_df = pd.read_csv(StringIO(FALLBACK_BMCS_CSV))
-        field_team_df = pd.read_csv(StringIO(FALLBACK_FIELD_TEAMS_CSV))
-        training_df = pd.read_csv(StringIO(FALLBACK_TRAINING_DATA))
-        summary_df = pd.read_csv(StringIO(SUMMARY_DATA))
-        return farmer_df, bmc_df, field_team_df, training_df, summary_df
+        return FALLBACK_VERSION, fallback_frames()
     except Exception as e:
         st.error(f"Critical error: Could not load even fallback dummy data. Error: {e}")
         st.stop()
 
+def load_data() -> FieldFrames:
+    """
+    The farmer, BMC, field team, training and training summary frames, as before. Not wrapped in st.cache_data:
+    the frames are already memory-mapped once per process, and a cached copy would pin a stale dataset version.
+    """
+    return load_versioned_data()[1]
+
+@st.cache_resource
+def bmc_view() -> BmcLatestView:
+    """One latest-reading view per server process, shared by every session."""
+    return BmcLatestView()
+
+def load_bmc_view(version: str, bmc_df: pd.DataFrame) -> BmcLatestView:
+    """Latest reading and rolling averages per BMC; a new dataset version only folds in its new readings."""
+    view = bmc_view()
+    with st.spinner("Updating latest BMC readings..."):
+        view.sync(bmc_df, version)
+    return view
+
+@st.cache_resource(show_spinner="Building training cube...", max_entries=2)
+def load_training_cubes(version: str, _training_df: pd.DataFrame, _summary_df: pd.DataFrame) -> Tuple[TrainingCube, TrainingCube]:
+    """Long-format monthly breakdown and summary cubes, built once per dataset version."""
+    return TrainingCube.from_wide(_training_df), TrainingCube.from_wide(_summary_df)
+
+@st.cache_resource(max_entries=2)
+def load_partner_reports(version: str) -> PartnerReports:
+    """
+    The partner/year Parquet partitions the ingestion job consolidated for a dataset version. They are never
+    built on a script thread: until the job has published them this raises LookupError, which is not cached.
+    """
+    reports = published_reports(version)
+    if reports is None:
+        raise LookupError(f"Partner reports for dataset {version} are not published yet")
+    return reports
+
+@st.cache_data(max_entries=32)
+def compare_partners(version: str, metric: str, partners: Tuple[str, ...], start, end, source: str) -> pd.DataFrame:
+    return load_partner_reports(version).compare(metric, list(partners), start, end, source)
+
 # --- Workplan Data Handling Functions ---
 def load_workplans() -> pd.DataFrame:
-    """Loads daily workplans from a CSV file."""
-    if os.path.exists(WORKPLAN_FILE_PATH):
-        try:
-            df = pd.read_csv(WORKPLAN_FILE_PATH)
-            # Ensure 'Date' column is datetime
-            df['Date'] = pd.to_datetime(df['Date']).dt.date # Store as date only
-            return df
-        except Exception as e:
-            st.error(f"Error loading workplans: {e}")
-            return pd.DataFrame(columns=['Date', 'Field Team Member', 'Activity', 'Target', 'Achieved'])
-    return pd.DataFrame(columns=['Date', 'Field Team Member', 'Activity', 'Target', 'Achieved'])
+    """Loads daily workplans: the CSV snapshot replayed with the append-only journal."""
+    try:
+        return workplan_journal.load(WORKPLAN_FILE_PATH)
+    except Exception as e:
+        st.error(f"Error loading workplans: {e}")
+        return pd.DataFrame(columns=workplan_journal.WORKPLAN_COLUMNS)
 
 def save_workplans(df: pd.DataFrame):
-    """Saves daily workplans to a CSV file."""
+    """Saves changed workplan rows by appending them to the workplan journal."""
     try:
-        df.to_csv(WORKPLAN_FILE_PATH, index=False)
+        workplan_journal.append(WORKPLAN_FILE_PATH, df)
         st.success("Workplan saved successfully!")
     except Exception as e:
         st.error(f"Error saving workplan: {e}")
@@ -163,120 +189,13 @@ def get_admin_status():
     """Checks admin status based on session state."""
     return st.session_state.get('is_admin', False)
 
-# --- Existing Analysis and Target Generation Functions ---
-def analyze_bmcs(bmc_df: pd.DataFrame, farmer_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-    """
-    Analyzes BMC data against KPIs and identifies low-performing BMCs.
-    Returns a dictionary of low-performing BMCs for each KPI.
-    """
-    if 'Date' in bmc_df.columns:
-        bmc_df['Date'] = pd.to_datetime(bmc_df['Date'])
-        latest_bmc_df = bmc_df.loc[bmc_df.groupby('BMC_ID')['Date'].idxmax()]
-    else:
-        latest_bmc_df = bmc_df.copy()
-
-    low_performing_bmcs = {
-        'Quality': pd.DataFrame(),
-        'Utilization': pd.DataFrame(),
-        'Animal_Welfare': pd.DataFrame(),
-        'Women_Empowerment': pd.DataFrame()
-    }
-
-    QUALITY_FAT_THRESHOLD = 3.5
-    QUALITY_SNF_THRESHOLD = 7.8
-
-    low_quality_fat = latest_bmc_df[latest_bmc_df['Quality_Fat_Percentage'] < QUALITY_FAT_THRESHOLD]
-    low_quality_snf = latest_bmc_df[latest_bmc_df['Quality_SNF_Percentage'] < QUALITY_SNF_THRESHOLD]
-    adulteration_issues = latest_bmc_df[latest_bmc_df['Quality_Adulteration_Flag'].astype(str).str.lower() == 'yes']
-
-    low_performing_bmcs['Quality'] = pd.concat([low_quality_fat, low_quality_snf, adulteration_issues]).drop_duplicates(
-        subset=['BMC_ID'])
-    if not low_performing_bmcs['Quality'].empty:
-        low_performing_bmcs['Quality']['Reason'] = 'Low Fat/SNF or Adulteration'
-
-    if 'Daily_Collection_Liters' in latest_bmc_df.columns and 'Capacity_Liters' in latest_bmc_df.columns:
-        latest_bmc_df['Utilization_Percentage_Calculated'] = (
-                                                                latest_bmc_df['Daily_Collection_Liters'] /
-                                                                latest_bmc_df['Capacity_Liters']) * 100
-        
-        UTILIZATION_THRESHOLD = 70.0
-        low_performing_bmcs['Utilization'] = latest_bmc_df[
-            latest_bmc_df['Utilization_Percentage_Calculated'] < UTILIZATION_THRESHOLD]
-        if not low_performing_bmcs['Utilization'].empty:
-            low_performing_bmcs['Utilization']['Reason'] = 'Low Utilization'
-
-    
-    
-    ANIMAL_WELFARE_THRESHOLD = 4.0
-    if 'Animal_Welfare_Compliance_Score_BMC' in latest_bmc_df.columns:
-        low_performing_bmcs['Animal_Welfare'] = latest_bmc_df[
-            latest_bmc_df['Animal_Welfare_Compliance_Score_BMC'] < ANIMAL_WELFARE_THRESHOLD]
-        if not low_performing_bmcs['Animal_Welfare'].empty:
-            low_performing_bmcs['Animal_Welfare']['Reason'] = 'Low Animal Welfare Score'
-
-    
-    WOMEN_EMPOWERMENT_THRESHOLD = 55.0
-    if 'Women_Empowerment_Participation_Rate_BMC' in latest_bmc_df.columns:
-        low_performing_bmcs['Women_Empowerment'] = latest_bmc_df[
-            latest_bmc_df['Women_Empowerment_Participation_Rate_BMC'] < WOMEN_EMPOWERMENT_THRESHOLD]
-        if not low_performing_bmcs['Women_Empowerment'].empty:
-            low_performing_bmcs['Women_Empowerment']['Reason'] = 'Low Women Empowerment Rate'
-
-    return low_performing_bmcs
-
-
-def generate_actionable_targets(low_bmcs_dict: Dict[str, pd.DataFrame]) -> List[str]:
-    """
-    Generates actionable insights and suggested targets for low-performing BMCs.
-    This is a simplified example. Real logic would be more complex.
-    """
-    action_items = []
-    for kpi, df in low_bmcs_dict.items():
-        if not df.empty:
-            for index, row in df.iterrows():
-                bmc_id = row['BMC_ID']
-                district = row['District']
-
-                if kpi == 'Quality':
-                    current_fat = row.get('Quality_Fat_Percentage', 'N/A')
-                    current_snf = row.get('Quality_SNF_Percentage', 'N/A')
-                    adulteration = row.get('Quality_Adulteration_Flag', 'N/A')
-                    action_items.append(
-                        f"BMC {bmc_id} (District: {district}) has **Low Quality** (Fat: {current_fat}%, SNF: {current_snf}%, Adulteration: {adulteration}). "
-                        f"**Action:** Field team to visit for quality checks, farmer awareness on clean milk production. "
-                        f"**Target:** Increase Fat to >3.8% and SNF to >8.0% within 1 month."
-                    )
-                elif kpi == 'Utilization':
-                    current_util = row.get('Utilization_Percentage_Calculated', 'N/A')
-                    target_util = row.get('Utilization_Target_Percentage', '80')
-                    action_items.append(
-                        f"BMC {bmc_id} (District: {district}) has **Low Utilization** ({current_util:.2f}%). "
-                        f"**Action:** Identify reasons for low collection, farmer mobilization, improve logistics. "
-                        f"**Target:** Increase utilization to {target_util}% (or +5% points) within 2 months."
-                    )
-                elif kpi == 'Animal_Welfare':
-                    current_score = row.get('Animal_Welfare_Compliance_Score_BMC', 'N/A')
-                    action_items.append(
-                        f"BMC {bmc_id} (District: {district}) has **Low Animal Welfare Score** ({current_score}). "
-                        f"**Action:** Conduct farmer training on animal health, hygiene, and shelter. "
-                        f"**Target:** Improve average animal welfare score to >4.5 within 3 months."
-                    )
-                elif kpi == 'Women_Empowerment':
-                    current_rate = row.get('Women_Empowerment_Participation_Rate_BMC', 'N/A')
-                    action_items.append(
-                        f"BMC {bmc_id} (District: {district}) has **Low Women Empowerment Participation** ({current_rate:.2f}%). "
-                        f"**Action:** Organize women's self-help group meetings, promote female farmer participation. "
-                        f"**Target:** Increase women empowerment participation rate to >65% within 3 months."
-                    )
-    return action_items
-
-
 # --- Main Application Logic ---
-farmer_df, bmc_df, field_team_df, training_df, summary_df = load_data()
+data_version, (farmer_df, bmc_df, field_team_df, training_df, summary_df) = load_versioned_data()
 
 # Initialize session state for workplans if not already present
-if 'workplans_df' not in st.session_state:
-    st.session_state.workplans_df = load_workplans()
+if 'workplan_store' not in st.session_state:
+    st.session_state.workplan_store = WorkplanStore(load_workplans())
+    st.session_state.workplan_exports = ExportCache()
 if 'is_admin' not in st.session_state:
     st.session_state.is_admin = False
 if 'admin_email_input' not in st.session_state:
@@ -284,6 +203,26 @@ if 'admin_email_input' not in st.session_state:
 
 
 st.title("Ksheersagar Dairy Performance Dashboard & Workplan")
+
+@st.fragment(run_every=2)
+def ingestion_status():
+    """Polls the ingestion queue; reruns the page once a job this session watched has published."""
+    job = ingest_jobs.latest_job()
+    if job is None:
+        return
+    if job.status in ingest_jobs.ACTIVE_STATUSES:
+        st.progress(job.progress, text=f"Ingesting workbooks in the background: {job.message}")
+        st.session_state.watched_ingest_job = job.id
+    elif job.status == "failed":
+        st.error(f"Workbook ingestion failed: {job.error}")
+        if st.button("Retry ingestion"):
+            ingest_jobs.submit(job.version, retry=True)
+    elif st.session_state.get("watched_ingest_job") == job.id:
+        st.session_state.watched_ingest_job = None
+        st.rerun()
+
+if os.path.exists(EXCEL_FILE_PATH):
+    ingestion_status()
 st.markdown("---")
 
 # --- Admin Login Section (UPDATED) ---
@@ -324,21 +263,17 @@ with st.form("daily_workplan_form"):
         st.markdown(f"**{activity}**")
         col_target, col_achieved = st.columns(2)
         
-        # Filter for existing data for this specific activity, member, and date
-        existing_entry = st.session_state.workplans_df.loc[
-            (st.session_state.workplans_df['Date'] == workplan_date) &
-            (st.session_state.workplans_df['Field Team Member'] == selected_member) &
-            (st.session_state.workplans_df['Activity'] == activity)
-        ]
+        # Indexed lookup of existing data for this specific activity, member, and date
+        existing_entry = st.session_state.workplan_store.get(workplan_date, selected_member, activity)
 
         with col_target:
             target_key = f"{selected_member}_{activity}_target_{workplan_date}"
-            default_target = int(existing_entry['Target'].iloc[0]) if not existing_entry.empty else 0
+            default_target = existing_entry[0] if existing_entry else 0
             current_targets[activity] = st.number_input(f"Target for {activity}", min_value=0, value=default_target, key=target_key)
         
         with col_achieved:
             achieved_key = f"{selected_member}_{activity}_achieved_{workplan_date}"
-            default_achieved = int(existing_entry['Achieved'].iloc[0]) if not existing_entry.empty else 0
+            default_achieved = existing_entry[1] if existing_entry else 0
             
             current_achieved[activity] = st.number_input(
                 f"Achieved for {activity}",
@@ -364,15 +299,9 @@ with st.form("daily_workplan_form"):
         
         new_workplan_df = pd.DataFrame(new_workplan_entries)
 
-        # Remove existing entries for the selected member and date to update
-        st.session_state.workplans_df = st.session_state.workplans_df[
-            ~((st.session_state.workplans_df['Date'] == workplan_date) &
-              (st.session_state.workplans_df['Field Team Member'] == selected_member))
-        ]
-        
-        # Concatenate the updated/new entries
-        st.session_state.workplans_df = pd.concat([st.session_state.workplans_df, new_workplan_df], ignore_index=True)
-        save_workplans(st.session_state.workplans_df)
+        # Upsert the entries in place in the indexed store
+        st.session_state.workplan_store.upsert(new_workplan_df)
+        save_workplans(new_workplan_df) # Only the changed rows are journaled
         st.rerun() # Rerun to refresh the display
 
 st.markdown("---")
@@ -381,9 +310,7 @@ st.header("Workplan Tracking and Download")
 # Filter and display workplans
 display_date = st.date_input("View Workplans for Date", datetime.date.today(), key="display_date")
 
-filtered_workplans = st.session_state.workplans_df[
-    st.session_state.workplans_df['Date'] == display_date
-].sort_values(by=['Field Team Member', 'Activity'])
+filtered_workplans = st.session_state.workplan_store.day(display_date).sort_values(by=['Field Team Member', 'Activity'])
 
 if not filtered_workplans.empty:
     st.subheader(f"Workplans for {display_date.strftime('%Y-%m-%d')}")
@@ -394,14 +321,18 @@ else:
 # Download options
 st.subheader("Download Workplan Data")
 
-col_download_daily, col_download_weekly, col_download_monthly = st.columns(3)
+export_format = st.selectbox("Export format", list(EXPORT_FORMATS), key="export_format")
+workplan_store = st.session_state.workplan_store
+workplan_exports = st.session_state.workplan_exports
+
+col_download_daily, col_download_weekly, col_download_monthly, col_download_quarterly = st.columns(4)
 
 with col_download_daily:
     st.download_button(
-        label="Download Daily Workplans (CSV)",
-        data=st.session_state.workplans_df.to_csv(index=False).encode('utf-8'),
-        file_name="daily_workplans.csv",
-        mime="text/csv",
+        label=f"Download Daily Workplans ({export_format})",
+        data=workplan_exports.lazy("daily", export_format, workplan_store, workplan_store.to_frame),
+        file_name=file_name("daily_workplans", export_format),
+        mime=mime_type(export_format),
     )
 
 with col_download_weekly:
@@ -410,23 +341,17 @@ with col_download_weekly:
     start_of_week = selected_week - datetime.timedelta(days=selected_week.weekday())
     end_of_week = start_of_week + datetime.timedelta(days=6)
     
-    weekly_data = st.session_state.workplans_df[
-        (st.session_state.workplans_df['Date'] >= start_of_week) &
-        (st.session_state.workplans_df['Date'] <= end_of_week)
-    ]
+    weekly_summary = workplan_store.aggregates.rollup("week", selected_week)
     
-    if not weekly_data.empty:
-        weekly_summary = weekly_data.groupby(['Field Team Member', 'Activity']).agg(
-            Total_Target=('Target', 'sum'),
-            Total_Achieved=('Achieved', 'sum')
-        ).reset_index()
-        
-        csv = weekly_summary.to_csv(index=False).encode('utf-8')
+    if not weekly_summary.empty:
         st.download_button(
-            label="Download Weekly Summary (CSV)",
-            data=csv,
-            file_name=f"weekly_workplan_summary_{start_of_week.strftime('%Y%m%d')}_to_{end_of_week.strftime('%Y%m%d')}.csv",
-            mime="text/csv",
+            label=f"Download Weekly Summary ({export_format})",
+            data=workplan_exports.lazy(
+                f"week:{period_key(selected_week, 'week')}", export_format, workplan_store,
+                partial(workplan_store.aggregates.rollup, "week", selected_week),
+            ),
+            file_name=file_name(f"weekly_workplan_summary_{start_of_week.strftime('%Y%m%d')}_to_{end_of_week.strftime('%Y%m%d')}", export_format),
+            mime=mime_type(export_format),
         )
     else:
         st.info("No data for this week.")
@@ -435,28 +360,39 @@ with col_download_monthly:
     st.markdown("#### Monthly Summary")
     selected_month = st.date_input("Select a date in the month for monthly download", datetime.date.today(), key="monthly_date")
     
-    # Ensure the 'Date' column is treated as datetime objects for month/year comparison
-    monthly_data = st.session_state.workplans_df[
-        (st.session_state.workplans_df['Date'].apply(lambda x: x.month) == selected_month.month) &
-        (st.session_state.workplans_df['Date'].apply(lambda x: x.year) == selected_month.year)
-    ]
+    monthly_summary = workplan_store.aggregates.rollup("month", selected_month)
     
-    if not monthly_data.empty:
-        monthly_summary = monthly_data.groupby(['Field Team Member', 'Activity']).agg(
-            Total_Target=('Target', 'sum'),
-            Total_Achieved=('Achieved', 'sum')
-        ).reset_index()
-        
-        csv = monthly_summary.to_csv(index=False).encode('utf-8')
+    if not monthly_summary.empty:
         st.download_button(
-            label="Download Monthly Summary (CSV)",
-            data=csv,
-            file_name=f"monthly_workplan_summary_{selected_month.strftime('%Y%m')}.csv",
-            mime="text/csv",
+            label=f"Download Monthly Summary ({export_format})",
+            data=workplan_exports.lazy(
+                f"month:{period_key(selected_month, 'month')}", export_format, workplan_store,
+                partial(workplan_store.aggregates.rollup, "month", selected_month),
+            ),
+            file_name=file_name(f"monthly_workplan_summary_{selected_month.strftime('%Y%m')}", export_format),
+            mime=mime_type(export_format),
         )
     else:
         st.info("No data for this month.")
 
+with col_download_quarterly:
+    st.markdown("#### Quarterly Summary")
+    selected_quarter = st.date_input("Select a date in the quarter for quarterly download", datetime.date.today(), key="quarterly_date")
+    quarterly_summary = workplan_store.aggregates.rollup("quarter", selected_quarter)
+    
+    if not quarterly_summary.empty:
+        st.download_button(
+            label=f"Download Quarterly Summary ({export_format})",
+            data=workplan_exports.lazy(
+                f"quarter:{period_key(selected_quarter, 'quarter')}", export_format, workplan_store,
+                partial(workplan_store.aggregates.rollup, "quarter", selected_quarter),
+            ),
+            file_name=file_name(f"quarterly_workplan_summary_{period_key(selected_quarter, 'quarter')}", export_format),
+            mime=mime_type(export_format),
+        )
+    else:
+        st.info("No data for this quarter.")
+
 st.markdown("---")
 
 
@@ -472,19 +408,106 @@ st.subheader("📈 Training Summary Totals")
 st.dataframe(summary_df, use_container_width=True)
 
 
+training_cube, summary_cube = load_training_cubes(data_version, training_df, summary_df)
+training_months = training_cube.months()
+if training_months:
+    st.subheader("🗓️ Training Trends")
+    start_month, end_month = st.select_slider(
+        "Month range",
+        options=training_months,
+        value=(training_months[0], training_months[-1]),
+        format_func=lambda month: month.strftime("%b'%y"),
+    )
+    filter_col1, filter_col2 = st.columns(2)
+    with filter_col1:
+        selected_topics = st.multiselect("Topics", training_cube.topics(), default=training_cube.topics())
+    with filter_col2:
+        selected_segments = st.multiselect("Segments", training_cube.segments(), default=training_cube.segments())
+    topic_filter, segment_filter = tuple(selected_topics), tuple(selected_segments)
+
+    st.line_chart(training_cube.monthly(start_month, end_month, topic_filter, segment_filter))
+    st.dataframe(training_cube.totals(start_month, end_month, topic_filter, segment_filter)[["Trainings"]], use_container_width=True)
+
+    year_over_year = training_cube.year_over_year(topic_filter, segment_filter)
+    if year_over_year.shape[1] > 1:
+        st.caption("Year-over-year trainings by calendar month")
+        st.dataframe(year_over_year, use_container_width=True)
+
+summary_totals = summary_cube.totals()
 col1, col2 = st.columns(2)
 
 with col1:
     if st.checkbox("Show Total Trainings per Topic"):
-        chart_data = summary_df.set_index("Training_Topic")["Total_Training"]
-        st.bar_chart(chart_data)
+        if summary_totals.empty:
+            st.info("No monthly training summary available.")
+        else:
+            st.bar_chart(summary_totals["Trainings"])
 
 with col2:
     if st.checkbox("Show Total Farmers Reached per Topic"):
-        farmer_data = summary_df.set_index("Training_Topic")["No_of_Farmers"]
-        st.bar_chart(farmer_data)
+        if summary_totals["Farmers_Reached"].isna().all():
+            st.info("No farmers-reached figures available.")
+        else:
+            st.bar_chart(summary_totals["Farmers_Reached"])
 
 
+st.markdown("---")
+st.header("Partner Comparison")
+
+partner_reports = None
+partner_reports_pending = False
+if data_version != FALLBACK_VERSION:
+    try:
+        partner_reports = load_partner_reports(data_version)
+    except LookupError:
+        report_job = ingest_jobs.latest_job(data_version)
+        if report_job is None or report_job.status == "done":
+            # The dataset is published but its reports are gone (e.g. pruned): queue them again.
+            report_job = ingest_jobs.submit(data_version)
+            start_ingest_worker().wake()
+        if report_job.status == "failed":
+            st.error(f"Error consolidating partner reports: {report_job.error}")
+        else:
+            st.info("Partner reports are being consolidated in the background; they appear here once ingestion finishes.")
+            partner_reports_pending = True
+    except Exception as e:
+        st.error(f"Error loading partner reports: {e}")
+
+if partner_reports is None or not partner_reports.partners():
+    if not partner_reports_pending:
+        st.info("Partner comparison needs the Ksheersagar workbook and compiled partner reports.")
+else:
+    partner_months = partner_reports.months()
+    partner_metrics = partner_reports.metrics()
+    compare_col1, compare_col2 = st.columns(2)
+    with compare_col1:
+        compare_metric = st.selectbox(
+            "Metric",
+            partner_metrics,
+            index=partner_metrics.index("Milk Received - Actual Vol") if "Milk Received - Actual Vol" in partner_metrics else 0,
+        )
+        compare_source = st.radio("Source", [KPI_SHEET_SOURCE, COMPILED_SOURCE], horizontal=True)
+    with compare_col2:
+        compare_partner_list = st.multiselect(
+            "Partners",
+            partner_reports.partners(),
+            default=[partner for partner in partner_reports.partners() if partner != "ALL DP"],
+        )
+        compare_start, compare_end = st.select_slider(
+            "Partner month range",
+            options=partner_months,
+            value=(partner_months[0], partner_months[-1]),
+            format_func=lambda month: month.strftime("%b'%y"),
+        )
+    comparison = compare_partners(
+        data_version, compare_metric, tuple(compare_partner_list), compare_start, compare_end, compare_source
+    )
+    if comparison.empty:
+        st.info("No readings for this metric, partner selection and month range.")
+    else:
+        st.line_chart(comparison)
+        st.dataframe(comparison, use_container_width=True)
+
 st.markdown("---")
 st.header("Data Overview & KPI Analysis")
 
@@ -498,23 +521,54 @@ with st.expander("Show Raw Data Previews"):
     st.subheader("Field Team & Training Data")
     st.dataframe(field_team_df.head())
 
+with st.expander("Show Ingestion Timing Report"):
+    try:
+        timings = load_shared_dataset(data_version).frame("ingest_timings")
+        st.dataframe(timings, use_container_width=True, hide_index=True)
+        st.caption(
+            f"In-memory size after dtype compaction: {timings['After_MB'].sum():.2f} MB "
+            f"(from {timings['Before_MB'].sum():.2f} MB)."
+        )
+        watcher = start_workbook_watcher()
+        if watcher.last_error:
+            st.warning(f"Workbook watcher: last refresh failed ({watcher.last_error}).")
+        elif watcher.last_refresh:
+            st.caption(f"Workbook changes last detected at {datetime.datetime.fromtimestamp(watcher.last_refresh):%H:%M:%S}.")
+        completed = ingest_jobs.last_completed()
+        for issue in completed.issues if completed else []:
+            st.warning(issue)
+    except Exception as e:
+        st.info(f"No ingestion report available: {e}")
+
 st.markdown("---")
 st.header("KPI Performance Analysis")
 
-low_performing_bmcs = analyze_bmcs(bmc_df, farmer_df)
+try:
+    kpi_registry = load_registry()
+except (OSError, ValueError, TypeError) as e:
+    st.error(f"Error loading KPI thresholds: {e}. Falling back to built-in thresholds.")
+    kpi_registry = parse_registry({})
+latest_bmc_df = load_bmc_view(data_version, bmc_df).latest()
+kpi_report = evaluate_latest(latest_bmc_df, kpi_registry)
+low_performing_bmcs = kpi_report.by_kpi()
 
 if any(not df.empty for df in low_performing_bmcs.values()):
     st.subheader("Low Performing BMCs Identified:")
     for kpi, df in low_performing_bmcs.items():
         if not df.empty:
             st.write(f"#### {kpi.replace('_', ' ').title()} KPI Concerns:")
-            st.dataframe(df[['BMC_ID', 'BMC_Name', 'District', 'Reason']].set_index('BMC_ID'))
+            st.dataframe(df.set_index('BMC_ID'))
             st.markdown("---")
 else:
     st.success("All BMCs are performing well across the defined KPIs based on current data!")
 
+rolling_columns = [col for col in ROLLING_COLUMNS if col in latest_bmc_df.columns and latest_bmc_df[col].notna().any()]
+if rolling_columns:
+    with st.expander("Rolling 7/30-Day BMC Averages"):
+        st.dataframe(latest_bmc_df[['BMC_ID'] + rolling_columns].set_index('BMC_ID').round(2))
+
 st.header("Actionable Insights & Targets for Field Team")
-action_items = generate_actionable_targets(low_performing_bmcs)
+action_items = kpi_report.action_items()
 
 if action_items:
     for item in action_items:
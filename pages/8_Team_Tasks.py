@@ -0,0 +1,90 @@
+import math
+from datetime import date, timedelta
+
+import streamlit as st
+
+import data_manager
+
+st.set_page_config(layout="wide", page_title="Team Tasks")
+
+KANBAN_STATUSES = ["To Do", "In Progress", "Done"]
+DUE_WINDOWS = ["Any time", "Overdue", "Due this week", "Custom range"]
+SORT_LABELS = {"Due Date": "due_date", "Employee": "employee", "Status": "status", "Task Name": "name", "Task ID": "id"}
+PAGE_SIZES = [25, 50, 100, 250]
+
+st.title("🗂️ Team Tasks")
+st.markdown("Tasks across every employee, filtered by reporting line, status, due date and text.")
+st.markdown("---")
+
+st.sidebar.header("Filters")
+managers = data_manager.fetch_managers()
+manager = st.sidebar.selectbox("Reporting Line", ["Everyone", *managers])
+include_manager = st.sidebar.checkbox("Include the manager's own tasks", value=False, disabled=manager == "Everyone")
+statuses = st.sidebar.multiselect("Status", KANBAN_STATUSES, default=KANBAN_STATUSES)
+due_window = st.sidebar.radio("Due Date", DUE_WINDOWS)
+
+today = date.today()
+due_from, due_to = None, None
+if due_window == "Overdue":
+    # Finished work is never overdue.
+    statuses = [status for status in statuses if status != "Done"]
+    due_to = today - timedelta(days=1)
+elif due_window == "Due this week":
+    due_from = today - timedelta(days=today.weekday())
+    due_to = due_from + timedelta(days=6)
+elif due_window == "Custom range":
+    selected_range = st.sidebar.date_input("Due between", value=(today, today + timedelta(days=30)))
+    if len(selected_range) == 2:
+        due_from, due_to = selected_range
+
+search = st.sidebar.text_input("Search task name or description")
+st.sidebar.markdown("---")
+sort_label = st.sidebar.selectbox("Sort by", list(SORT_LABELS))
+descending = st.sidebar.checkbox("Descending", value=False)
+page_size = st.sidebar.selectbox("Tasks per page", PAGE_SIZES, index=1)
+
+filters = dict(
+    statuses=statuses,
+    due_from=due_from,
+    due_to=due_to,
+    manager=None if manager == "Everyone" else manager,
+    include_manager=include_manager,
+    text=search,
+    sort=SORT_LABELS[sort_label],
+    descending=descending,
+    limit=page_size,
+)
+
+page = st.session_state.get("team_tasks_page", 1)
+result = data_manager.query_tasks(**filters, offset=(page - 1) * page_size)
+page_count = max(1, math.ceil(result.total / page_size))
+if page > page_count:
+    # The filters narrowed the result below the page being viewed; show its last page instead.
+    page = st.session_state["team_tasks_page"] = page_count
+    result = data_manager.query_tasks(**filters, offset=(page - 1) * page_size)
+
+st.metric("Matching Tasks", result.total)
+if result.total == 0:
+    st.info("No tasks match these filters.")
+    st.stop()
+
+st.dataframe(
+    result.tasks,
+    hide_index=True,
+    use_container_width=True,
+    column_config={
+        "id": st.column_config.NumberColumn("Task ID", format="%d"),
+        "employee": "Employee",
+        "name": "Task Name",
+        "description": "Description",
+        "status": "Status",
+        "due_date": st.column_config.DateColumn("Due Date", format="YYYY-MM-DD"),
+    },
+)
+
+page_col, caption_col = st.columns([1, 3])
+with page_col:
+    st.number_input("Page", min_value=1, max_value=page_count, step=1, key="team_tasks_page")
+with caption_col:
+    first = (page - 1) * page_size + 1
+    st.caption(f"Showing {first}–{first + len(result.tasks) - 1} of {result.total} (page {page} of {page_count})")
@@ -0,0 +1,219 @@
+# TrackerPMU/partner_reports.py
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from training_cube import parse_month
+from version_dirs import VersionLease, prune, publish_dir
+from workbook_cache import load_workbook
+
+REPORTS_DIR = ".partner_reports"
+PARTITION_COLUMNS = ["Partner", "Year"]
+REPORT_COLUMNS = ["Partner", "Year", "Month", "Metric", "Value", "Source"]
+# Row order of consolidated and queried reports; a total order, so it never depends on how
+# the rows were split across workbooks or partition files.
+REPORT_ORDER = ["Partner", "Month", "Metric", "Source"]
+KPI_SHEET_SOURCE = "Monthly KPI sheet"
+COMPILED_SOURCE = "Compiled report"
+
+# Row labels that start the month header of a partner KPI sheet.
+HEADER_LABELS = {"particular", "particulars"}
+# Partner sheets label a few metrics differently; everything maps onto the ALL DP wording.
+METRIC_ALIASES = {
+    "Compliant Milk Vol - ACTUAL": "Total Compliant Milk - ACTUAL",
+    "Compliant Milk Vol - PLAN": "Total Compliant Milk - PLAN",
+    "Total Installed Capacity per day": "Installed BMC Capacity per day",
+    "AW Farm Functional % - Actual": "AW Farm Functional %",
+}
+# The "(from LR till Aug'23)" suffix differs per partner and is not part of the metric.
+_LR_SUFFIX = re.compile(r"\(from LR till [^)]*\)", re.IGNORECASE)
+_COMPILED_REPORT = re.compile(r"^(?P<partner>.+?)CompiledReport", re.IGNORECASE)
+
+# Daily compiled-report columns rolled up into the same metrics as the KPI sheets:
+# metric -> (aggregation, candidate column names across partners).
+COMPILED_METRICS: Dict[str, Tuple[str, List[str]]] = {
+    "Milk Received - Actual Vol": ("sum", ["Milk Qty. (LTR)", "Total Milk"]),
+    "No. of CBMCs": ("nunique", ["BMC Code", "BMC"]),
+    "Total Non Compliant - AB": ("sum", ["Antibiotic Positive Qty", "AB Positive Milk"]),
+    "Total Seggregated Milk": ("sum", ["Seg Vol", "Segregated Milk"]),
+    "Eligible milk volume for QBI": ("sum", ["QBI Vol", "QBI Volume"]),
+}
+
+
+def canonical_metric(label) -> str:
+    metric = re.sub(r"\s+", " ", _LR_SUFFIX.sub("(from LR)", str(label))).strip()
+    return METRIC_ALIASES.get(metric, metric)
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(columns=REPORT_COLUMNS)
+
+
+def _finish(df: pd.DataFrame, partner: str, source: str) -> pd.DataFrame:
+    df = df[df["Value"].notna()]
+    return df.assign(Partner=partner, Year=df["Month"].dt.year, Source=source)[REPORT_COLUMNS]
+
+
+def kpi_sheet_rows(sheet: pd.DataFrame, partner: str) -> pd.DataFrame:
+    """
+    Melts a wide partner KPI sheet (metric rows x month columns under a "Particular(s)" header
+    row) into long rows. Yearly totals and calendar-year blocks are dropped.
+    """
+    for label_col in range(min(sheet.shape[1], 3)):
+        labels = sheet.iloc[:, label_col].astype(str).str.strip().str.lower()
+        header_rows = labels.index[labels.isin(HEADER_LABELS)]
+        if len(header_rows):
+            break
+    else:
+        return _empty()
+    header = sheet.index.get_loc(header_rows[0])
+    months = {i: parse_month(value) for i, value in enumerate(sheet.iloc[header]) if not pd.isna(value)}
+    months = {i: month for i, month in months.items() if month is not None}
+    if not months:
+        return _empty()
+
+    body = sheet.iloc[header + 1:]
+    metrics = body.iloc[:, label_col]
+    body = body[metrics.notna()]
+    values = body.iloc[:, list(months)].apply(pd.to_numeric, errors="coerce")
+    values.columns = list(months.values())
+    values.index = body.iloc[:, label_col].map(canonical_metric)
+    long = values.rename_axis(index="Metric", columns="Month").stack(future_stack=True).rename("Value").reset_index()
+    # A metric repeated within one sheet keeps its first reading.
+    long = long.drop_duplicates(["Metric", "Month"])
+    return _finish(long, partner, KPI_SHEET_SOURCE)
+
+
+def compiled_report_rows(report: pd.DataFrame, partner: str) -> pd.DataFrame:
+    """Rolls a daily per-BMC compiled report up to monthly rows of the shared metrics."""
+    if "Date" not in report.columns:
+        return _empty()
+    dates = pd.to_datetime(report["Date"], errors="coerce")
+    report = report.assign(Month=dates.dt.to_period("M").dt.to_timestamp())[dates.notna()]
+    frames = []
+    for metric, (how, candidates) in COMPILED_METRICS.items():
+        column = next((col for col in candidates if col in report.columns), None)
+        if column is None:
+            continue
+        source = report[column] if how == "nunique" else pd.to_numeric(report[column], errors="coerce")
+        monthly = source.groupby(report["Month"]).agg(how)
+        frames.append(pd.DataFrame({"Metric": metric, "Month": monthly.index, "Value": monthly.to_numpy(float)}))
+    if not frames:
+        return _empty()
+    return _finish(pd.concat(frames, ignore_index=True), partner, COMPILED_SOURCE)
+
+
+def consolidate(paths: Iterable[str]) -> pd.DataFrame:
+    """
+    Aligns every partner sheet in `paths` to one long schema keyed by partner: the per-partner
+    KPI sheets of the Ksheersagar workbook (named after the partner) and the compiled reports
+    (partner taken from the "<Partner>CompiledReport" file name).
+    """
+    frames = []
+    for path in paths:
+        match = _COMPILED_REPORT.match(os.path.basename(path))
+        for sheet_name, sheet in load_workbook(path).items():
+            if match:
+                frames.append(compiled_report_rows(sheet, match.group("partner").strip()))
+            else:
+                frames.append(kpi_sheet_rows(sheet, sheet_name.strip()))
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return _empty()
+    report = pd.concat(frames, ignore_index=True)
+    return report.astype({"Year": "int32", "Value": "float64"}).sort_values(REPORT_ORDER, ignore_index=True)
+
+
+def build_reports(paths: List[str], version: str) -> "PartnerReports":
+    """
+    Writes the consolidated rows as Parquet partitioned by partner and year under a version
+    directory (staged, then renamed into place), unless another process already has.
+    """
+    if not os.path.isdir(os.path.join(REPORTS_DIR, version)):
+        report = consolidate(paths)
+
+        def write(staging: str):
+            ds.write_dataset(
+                pa.Table.from_pandas(report, preserve_index=False),
+                staging,
+                format="parquet",
+                partitioning=PARTITION_COLUMNS,
+                partitioning_flavor="hive",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+
+        if publish_dir(REPORTS_DIR, version, write):
+            prune(REPORTS_DIR, keep=version)
+    return PartnerReports(version)
+
+
+def published_reports(version: str) -> Optional["PartnerReports"]:
+    """Handle on a version build_reports has already written, or None; nothing is consolidated here."""
+    try:
+        return PartnerReports(version)
+    except FileNotFoundError:
+        return None
+
+
+class PartnerReports:
+    """
+    Read handle on one consolidated version. Filters on partner and year prune whole
+    partition directories, so a comparison only opens the files it needs. The version is kept
+    on disk while the handle is alive; opening a pruned version raises FileNotFoundError.
+    """
+
+    def __init__(self, version: str):
+        self.version = version
+        self._dir = os.path.join(REPORTS_DIR, version)
+        self._lease = VersionLease(REPORTS_DIR, version)
+
+    def _dataset(self) -> ds.Dataset:
+        return ds.dataset(self._dir, format="parquet", partitioning="hive")
+
+    def partners(self) -> List[str]:
+        # Partition directory names are URI-encoded ("ALL%20DP").
+        return sorted(unquote(name.split("=", 1)[1]) for name in os.listdir(self._dir) if name.startswith("Partner="))
+
+    def _distinct(self, column: str) -> list:
+        values = self._dataset().to_table(columns=[column]).column(column)
+        return sorted(pc.unique(values).to_pylist())
+
+    def metrics(self) -> List[str]:
+        return self._distinct("Metric")
+
+    def months(self) -> List[pd.Timestamp]:
+        return [pd.Timestamp(month) for month in self._distinct("Month")]
+
+    def query(
+        self,
+        partners: Optional[List[str]] = None,
+        metrics: Optional[List[str]] = None,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        sources: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Rows for the given partners, metrics, month range and sources."""
+        expression = ds.scalar(True)
+        if partners is not None:
+            expression &= ds.field("Partner").isin(partners)
+        if metrics is not None:
+            expression &= ds.field("Metric").isin(metrics)
+        if sources is not None:
+            expression &= ds.field("Source").isin(sources)
+        if start is not None:
+            expression &= (ds.field("Year") >= start.year) & (ds.field("Month") >= pa.scalar(start, pa.timestamp("ns")))
+        if end is not None:
+            expression &= (ds.field("Year") <= end.year) & (ds.field("Month") <= pa.scalar(end, pa.timestamp("ns")))
+        table = self._dataset().to_table(columns=REPORT_COLUMNS, filter=expression)
+        return table.to_pandas().sort_values(REPORT_ORDER, ignore_index=True)
+
+    def compare(self, metric: str, partners: List[str], start=None, end=None, source: str = KPI_SHEET_SOURCE) -> pd.DataFrame:
+        """One metric as a Month x Partner table, for side-by-side charts."""
+        rows = self.query(partners, [metric], start, end, [source])
+        return rows.pivot_table(index="Month", columns="Partner", values="Value", aggfunc="sum")
@@ -0,0 +1,105 @@
+# TrackerPMU/shared_dataset.py
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from version_dirs import VersionLease, prune, publish_dir
+
+DATASET_DIR = ".shared_dataset"
+CURRENT_FILE = "CURRENT"
+
+
+def dataset_version(*parts: str) -> str:
+    """A version id derived from whatever identifies the source data (e.g. workbook hashes)."""
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _frame_file(version_dir: str, name: str) -> str:
+    return os.path.join(version_dir, f"{name}.arrow")
+
+
+def _read_current() -> Optional[str]:
+    try:
+        with open(os.path.join(DATASET_DIR, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _point_current(version: str):
+    """Swaps the CURRENT pointer in one rename, so readers see the old or the new version, never a mix."""
+    fd, tmp_path = tempfile.mkstemp(dir=DATASET_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(DATASET_DIR, CURRENT_FILE))
+
+
+def publish(frames: Dict[str, pd.DataFrame], version: str) -> str:
+    """
+    Writes `frames` as uncompressed Arrow IPC files under a new version directory, then makes
+    it current. Publishing a version that already exists (e.g. from another process) only
+    moves the pointer.
+    """
+    def write(staging: str):
+        for name, df in frames.items():
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(_frame_file(staging, name), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+    publish_dir(DATASET_DIR, version, write)
+    _point_current(version)
+    prune(DATASET_DIR, keep=version)
+    return version
+
+
+class SharedDataset:
+    """
+    Read-only handle on one published version. Tables are memory-mapped, so every process
+    on the host shares the same page-cache copy; DataFrames are built once per handle and
+    shared by every session that holds it, and must not be modified. The version is kept on
+    disk while the handle is alive; opening a pruned version raises FileNotFoundError.
+    """
+
+    def __init__(self, version: str):
+        self.version = version
+        self._dir = os.path.join(DATASET_DIR, version)
+        self._lease = VersionLease(DATASET_DIR, version)
+        self._tables: Dict[str, pa.Table] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return sorted(name[:-len(".arrow")] for name in os.listdir(self._dir) if name.endswith(".arrow"))
+
+    def table(self, name: str) -> pa.Table:
+        """The named table, mapped zero-copy from its Arrow IPC file."""
+        with self._lock:
+            if name not in self._tables:
+                source = pa.memory_map(_frame_file(self._dir, name), "r")
+                self._tables[name] = pa.ipc.open_file(source).read_all()
+            return self._tables[name]
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """The named table as a DataFrame; numeric columns stay views over the mapped buffers."""
+        table = self.table(name)
+        with self._lock:
+            if name not in self._frames:
+                self._frames[name] = table.to_pandas(split_blocks=True)
+            return self._frames[name]
+
+
+def current() -> Optional[SharedDataset]:
+    """Handle on the current version, or None when nothing has been published yet."""
+    version = _read_current()
+    if version is None:
+        return None
+    try:
+        return SharedDataset(version)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,138 @@
+# TrackerPMU/sheet_index.py
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+import pandas as pd
+
+from workbook_cache import CACHE_DIR, load_headers, workbook_key, write_json
+
+# A sheet that only matches a role's identifier (the old substring rule) still qualifies,
+# but any sheet carrying the role's expected columns outranks it.
+IDENTIFIER_WEIGHT = 0.1
+
+# Parsed dtypes worth replaying on later parses; anything else is left to inference.
+HINTABLE_DTYPES = {"int64", "float64", "str", "object"}
+
+
+class RoleSignature(NamedTuple):
+    """What a sheet playing a role looks like: a name fragment and its expected columns."""
+    identifier: str
+    columns: List[str]
+
+
+class SheetIndex(NamedTuple):
+    """Sheet-to-role mapping and dtype hints for one version of a workbook."""
+    roles: Dict[str, str]  # role -> sheet name
+    scores: Dict[str, Dict[str, float]]  # role -> sheet name -> score
+    dtypes: Dict[str, Dict[str, str]]  # sheet name -> column -> dtype
+
+
+def normalize_column(name) -> str:
+    """Column name reduced to lowercase alphanumerics, so "BMC ID" and "BMC_ID" compare equal."""
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def score_sheet(columns: List[str], signature: RoleSignature) -> float:
+    """Share of the signature's columns present in the sheet, plus IDENTIFIER_WEIGHT on an identifier match."""
+    present = {normalize_column(col) for col in columns}
+    expected = {normalize_column(col) for col in signature.columns}
+    score = len(expected & present) / len(expected) if expected else 0.0
+    identifier = signature.identifier.lower()
+    if identifier and any(identifier in str(col).lower() for col in columns):
+        score += IDENTIFIER_WEIGHT
+    return round(score, 4)
+
+
+def classify_sheets(
+    headers: Dict[str, List[str]],
+    signatures: Dict[str, RoleSignature],
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, float]]]:
+    """Assigns each role the best-scoring sheet; on a tie the later sheet wins, as before."""
+    roles: Dict[str, str] = {}
+    scores: Dict[str, Dict[str, float]] = {}
+    for role, signature in signatures.items():
+        scores[role] = {sheet: score_sheet(columns, signature) for sheet, columns in headers.items()}
+        best = max(scores[role].values(), default=0.0)
+        if best > 0:
+            roles[role] = [sheet for sheet, score in scores[role].items() if score == best][-1]
+    return roles, scores
+
+
+def _signatures_key(signatures: Dict[str, RoleSignature]) -> str:
+    payload = json.dumps({role: list(sig) for role, sig in sorted(signatures.items())})
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _index_file(path: str) -> str:
+    return os.path.join(CACHE_DIR, f"{os.path.basename(path)}.index.json")
+
+
+def _read_index(path: str) -> dict:
+    try:
+        with open(_index_file(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_index(path: str, signatures: Dict[str, RoleSignature]) -> SheetIndex:
+    """
+    Returns the workbook's sheet index, classifying sheets from their header rows only.
+    The sidecar is keyed by the workbook hash and the signatures; dtype hints of sheets whose
+    header is unchanged carry over from the previous version of the workbook.
+    """
+    sha256 = workbook_key(path)
+    signatures_key = _signatures_key(signatures)
+    stored = _read_index(path)
+    if stored.get("sha256") == sha256 and stored.get("signatures") == signatures_key:
+        return SheetIndex(stored["roles"], stored["scores"], _hints(stored, load_headers(path)))
+
+    headers = load_headers(path)
+    roles, scores = classify_sheets(headers, signatures)
+    index = {
+        "sha256": sha256,
+        "signatures": signatures_key,
+        "roles": roles,
+        "scores": scores,
+        "dtypes": stored.get("dtypes", {}),
+    }
+    write_json(_index_file(path), index)
+    return SheetIndex(roles, scores, _hints(index, headers))
+
+
+def _hints(index: dict, headers: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+    """Dtype hints for sheets whose recorded header still matches the workbook's."""
+    return {
+        sheet: entry["dtypes"]
+        for sheet, entry in index.get("dtypes", {}).items()
+        if headers.get(sheet) == entry["columns"]
+    }
+
+
+def record_dtypes(path: str, frames: Dict[str, pd.DataFrame]):
+    """Stores the parsed dtypes of `frames` (sheet -> DataFrame) as hints for later parses."""
+    index = _read_index(path)
+    if not index:
+        return
+    dtypes = index.setdefault("dtypes", {})
+    for sheet, df in frames.items():
+        dtypes[sheet] = {
+            "columns": [str(col) for col in df.columns],
+            "dtypes": {str(col): str(dtype) for col, dtype in df.dtypes.items() if str(dtype) in HINTABLE_DTYPES},
+        }
+    write_json(_index_file(path), index)
+
+
+def role_sheets(index: SheetIndex) -> List[str]:
+    """Distinct sheets that play at least one role, in first-seen order."""
+    return list(dict.fromkeys(index.roles.values()))
+
+
+def signature_from_csv(identifier: str, csv_text: str) -> RoleSignature:
+    """Builds a signature from the header line of an embedded CSV sample."""
+    header = csv_text.strip().splitlines()[0]
+    return RoleSignature(identifier, [col.strip() for col in header.split(",")])
+
@@ -0,0 +1,99 @@
+# TrackerPMU/single_flight.py
+import functools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "inflight", "refreshing")
+
+    def __init__(self):
+        self.value: Any = None
+        self.loaded_at: Optional[float] = None  # None until a first load has succeeded
+        self.inflight: Optional[Future] = None  # first load (or reload after invalidate) in progress
+        self.refreshing = False  # background revalidation in progress
+
+
+class SingleFlight:
+    """
+    Process-wide memo for a loader shared by every session thread. Concurrent misses on a
+    key run the loader once and the other callers wait for that result. Once `ttl` seconds
+    have passed, the stale value keeps being returned while a single background thread
+    reloads it. Failures are not cached: waiters of a failed first load get the exception,
+    and a failed revalidation keeps serving the stale value (see `last_error`).
+    """
+
+    def __init__(self, loader: Callable, ttl: Optional[float] = None):
+        self._loader = loader
+        self._ttl = ttl
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self.last_error: Optional[BaseException] = None
+        functools.update_wrapper(self, loader)
+
+    @staticmethod
+    def _key(args: tuple, kwargs: dict) -> Hashable:
+        return args, tuple(sorted(kwargs.items()))
+
+    def __call__(self, *args, **kwargs):
+        key = self._key(args, kwargs)
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            if entry.loaded_at is not None:
+                if self._stale(entry) and not entry.refreshing:
+                    entry.refreshing = True
+                    threading.Thread(target=self._revalidate, args=(key, entry, args, kwargs), daemon=True).start()
+                return entry.value
+            leader = entry.inflight is None
+            if leader:
+                entry.inflight = Future()
+            flight = entry.inflight
+        if leader:
+            self._load(entry, flight, args, kwargs)
+        return flight.result()
+
+    def _stale(self, entry: _Entry) -> bool:
+        return self._ttl is not None and time.monotonic() - entry.loaded_at >= self._ttl
+
+    def _load(self, entry: _Entry, flight: Future, args: tuple, kwargs: dict):
+        try:
+            value = self._loader(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                entry.inflight = None
+            flight.set_exception(e)
+            return
+        with self._lock:
+            entry.value, entry.loaded_at, entry.inflight = value, time.monotonic(), None
+        flight.set_result(value)
+
+    def _revalidate(self, key: Hashable, entry: _Entry, args: tuple, kwargs: dict):
+        try:
+            value = self._loader(*args, **kwargs)
+        except Exception as e:
+            self.last_error = e
+            with self._lock:
+                entry.refreshing = False
+            return
+        with self._lock:
+            # An invalidate() during the reload dropped this entry; don't resurrect it.
+            if self._entries.get(key) is entry:
+                entry.value, entry.loaded_at = value, time.monotonic()
+            entry.refreshing = False
+        self.last_error = None
+
+    def invalidate(self, *args, **kwargs):
+        """Drops one key; the next call reloads it (coalesced) instead of serving stale data."""
+        with self._lock:
+            self._entries.pop(self._key(args, kwargs), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def single_flight(ttl: Optional[float] = None) -> Callable[[Callable], SingleFlight]:
+    """Decorator form of SingleFlight: `@single_flight(ttl=3600)`."""
+    return lambda loader: SingleFlight(loader, ttl)
@@ -0,0 +1,94 @@
+# TrackerPMU/test_bmc_kpis.py
+import pandas as pd
+import pytest
+
+import bmc_kpis
+
+
+def _config(threshold):
+    return {"rule": [{"kpi": "Quality", "metric": "Quality_Fat_Percentage", "threshold": threshold, "reason": "Low Fat"}]}
+
+
+def test_unchanged_rules_are_reused_across_reloads():
+    first = bmc_kpis.parse_registry(_config(3.5))
+    second = bmc_kpis.parse_registry(_config(3.5))
+
+    assert first.checks[0] is second.checks[0]
+
+
+def test_compiled_rule_cache_is_bounded():
+    for i in range(bmc_kpis.COMPILED_CHECK_CACHE_SIZE + 50):
+        bmc_kpis.parse_registry(_config(3.0 + i / 1000))
+
+    assert bmc_kpis.compile_check.cache_info().currsize <= bmc_kpis.COMPILED_CHECK_CACHE_SIZE
+
+
+def test_overrides_replace_the_rule_threshold():
+    config = {**_config(3.5), "overrides": {"district": {"Pune": {"Quality_Fat_Percentage": 3.0}}}}
+    latest = pd.DataFrame({
+        "BMC_ID": ["BMC001", "BMC002"],
+        "BMC_Name": ["Nandgaon BMC", "Satara BMC"],
+        "District": ["Pune", "Satara"],
+        "Quality_Fat_Percentage": [3.2, 3.2],
+    })
+
+    report = bmc_kpis.evaluate_latest(latest, bmc_kpis.parse_registry(config))
+
+    assert report.by_kpi()["Quality"]["BMC_ID"].tolist() == ["BMC002"]
+
+
+def test_by_kpi_lists_bmcs_in_rule_order():
+    latest = pd.DataFrame({
+        "BMC_ID": ["BMC001", "BMC002", "BMC003"],
+        "BMC_Name": ["A", "B", "C"],
+        "District": ["Pune"] * 3,
+        "Quality_Fat_Percentage": [3.9, 3.2, 3.1],
+        "Quality_SNF_Percentage": [7.5, 8.2, 7.0],
+        "Quality_Adulteration_Flag": ["No", "No", "No"],
+    })
+
+    report = bmc_kpis.evaluate_latest(latest, bmc_kpis.parse_registry({}))
+
+    # Fat breaches first (BMC002, BMC003), then SNF-only breaches (BMC001).
+    assert report.by_kpi()["Quality"]["BMC_ID"].tolist() == ["BMC002", "BMC003", "BMC001"]
+
+
+def test_shipped_rules_use_each_bmcs_own_targets():
+    latest = pd.DataFrame({
+        "BMC_ID": ["BMC001", "BMC002", "BMC003"],
+        "BMC_Name": ["A", "B", "C"],
+        "District": ["Pune"] * 3,
+        "Quality_Fat_Percentage": [3.6, 3.6, 3.4],
+        "Quality_Target_Fat": [3.8, None, 3.2],
+        "Utilization_Percentage_Calculated": [75.0, 75.0, 75.0],
+        "Utilization_Target_Percentage": [80, 70, None],
+    })
+
+    report = bmc_kpis.evaluate_latest(latest, bmc_kpis.load_registry(bmc_kpis.THRESHOLDS_FILE))
+
+    fat = report.violations[report.violations["Metric"] == "Quality_Fat_Percentage"]
+    # BMC001 misses its own 3.8 target; BMC002 has none and clears the rule's 3.5; BMC003 beats its 3.2.
+    assert fat["BMC_ID"].tolist() == ["BMC001"] and fat["Threshold"].tolist() == [3.8]
+    assert report.by_kpi()["Utilization"]["BMC_ID"].tolist() == ["BMC001"]
+
+
+def test_action_fields_are_formatted_per_value():
+    config = {**_config(3.5), "actions": {"Quality": "{BMC_ID:>7}|{Quality_Fat_Percentage:.1%}|{Capacity:,d}|{District:.3}"}}
+    latest = pd.DataFrame({
+        "BMC_ID": ["BMC001", "BMC002"],
+        "District": ["Pune", "Satara"],
+        "Quality_Fat_Percentage": [0.034, 0.02],
+        "Capacity": [1200.0, 15000.0],
+    })
+
+    items = bmc_kpis.evaluate_latest(latest, bmc_kpis.parse_registry(config)).action_items()
+
+    assert items == [" BMC001|3.4%|1,200|Pun", " BMC002|2.0%|15,000|Sat"]
+    assert bmc_kpis.render("{Quality_Fat_Percentage:.2f}", latest.iloc[:1].assign(Quality_Fat_Percentage=None)) == ["N/A"]
+
+
+def test_malformed_action_template_is_rejected_at_load():
+    with pytest.raises(ValueError, match="Quality"):
+        bmc_kpis.parse_registry({"actions": {"Quality": "Fat {Quality_Fat_Percentage:.2q}"}})
+    with pytest.raises(ValueError, match="Utilization"):
+        bmc_kpis.parse_registry({"actions": {"Utilization": "BMC {BMC_ID"}})
@@ -0,0 +1,92 @@
+# TrackerPMU/test_bmc_latest.py
+import pandas as pd
+
+from bmc_kpis import evaluate_kpis
+from bmc_latest import BmcLatestView, latest_per_bmc
+
+
+def _readings(rows):
+    return pd.DataFrame(rows, columns=["BMC_ID", "Date", "Quality_Fat_Percentage", "Quality_SNF_Percentage"])
+
+
+def test_latest_skips_undated_readings():
+    readings = _readings([
+        ("BMC001", "2025-06-01", 3.9, 8.2),
+        ("BMC001", None, 1.0, 8.2),
+        ("BMC002", "2025-06-02", 3.2, 8.2),
+        ("BMC002", "not a date", 1.0, 8.2),
+        ("BMC003", "", 1.0, 8.2),
+        ("BMC003", "2025-06-03", 4.1, 8.2),
+    ])
+
+    latest = latest_per_bmc(readings)
+
+    assert latest["BMC_ID"].tolist() == ["BMC001", "BMC002", "BMC003"]
+    assert latest["Quality_Fat_Percentage"].tolist() == [3.9, 3.2, 4.1]
+    assert latest["Date"].notna().all()
+
+
+def test_latest_keeps_undated_reading_of_bmc_without_dates():
+    readings = _readings([
+        ("BMC001", "2025-06-01", 3.9, 8.2),
+        ("BMC001", "2025-06-05", 3.7, 8.2),
+        ("BMC004", None, 3.6, 8.2),
+    ])
+
+    latest = latest_per_bmc(readings)
+
+    assert latest["BMC_ID"].tolist() == ["BMC001", "BMC004"]
+    assert latest["Quality_Fat_Percentage"].tolist() == [3.7, 3.6]
+
+
+def test_quality_flags_ignore_undated_readings():
+    readings = _readings([
+        ("BMC001", "2025-06-01", 3.9, 8.2),
+        ("BMC001", None, 1.0, 8.2),
+        ("BMC002", "2025-06-01", 3.2, 8.2),
+        ("BMC002", None, 1.0, 8.2),
+        ("BMC003", "2025-06-01", 4.1, 8.2),
+        ("BMC003", None, 1.0, 8.2),
+    ])
+
+    flagged = evaluate_kpis(readings).by_kpi()["Quality"]
+
+    assert flagged["BMC_ID"].tolist() == ["BMC002"]
+
+
+def test_view_append_does_not_replace_latest_with_undated_reading():
+    view = BmcLatestView(_readings([("BMC001", "2025-06-01", 3.9, 8.2)]))
+
+    view.append(_readings([("BMC001", None, 1.0, 8.2)]))
+
+    assert view.latest()["Quality_Fat_Percentage"].tolist() == [3.9]
+
+
+def test_sync_appends_only_new_readings():
+    history = _readings([
+        ("BMC001", "2025-06-01", 3.9, 8.2),
+        ("BMC002", "2025-06-01", 3.2, 8.1),
+    ])
+    grown = pd.concat([history, _readings([("BMC001", "2025-06-02", 3.5, 8.0), ("BMC003", "2025-06-02", 4.0, 8.3)])], ignore_index=True)
+    view = BmcLatestView()
+    view.sync(history, "v1")
+    appended = []
+    view._append = lambda readings, append=view._append: appended.append(readings) or append(readings)
+
+    view.sync(grown, "v2")
+    view.sync(grown, "v2")
+
+    [new_rows] = appended
+    pd.testing.assert_frame_equal(new_rows, grown.iloc[2:])
+    pd.testing.assert_frame_equal(view.latest(), BmcLatestView(grown).latest())
+    pd.testing.assert_frame_equal(view.rolling(), BmcLatestView(grown).rolling())
+
+
+def test_sync_rebuilds_when_earlier_readings_change():
+    view = BmcLatestView()
+    view.sync(_readings([("BMC001", "2025-06-01", 3.9, 8.2), ("BMC002", "2025-06-01", 3.2, 8.1)]), "v1")
+    edited = _readings([("BMC001", "2025-06-01", 3.1, 8.2)])
+
+    view.sync(edited, "v2")
+
+    pd.testing.assert_frame_equal(view.latest(), BmcLatestView(edited).latest())
@@ -0,0 +1,38 @@
+# TrackerPMU/test_compact_dtypes.py
+import numpy as np
+import pandas as pd
+
+from compact_dtypes import compact_frame, memory_bytes
+
+
+def test_compact_frame_narrows_without_changing_values():
+    df = pd.DataFrame({
+        "BMC_ID": [f"BMC{i:03d}" for i in range(100)],
+        "District": ["Pune", "Satara"] * 50,
+        "Adulteration": ["Yes", "No"] * 50,
+        "Capacity": np.arange(100, dtype=np.int64) * 10,
+        "Fat": np.full(100, 3.5),
+        "SNF": np.linspace(7.0, 8.5, 100),
+    })
+
+    compacted = compact_frame(df)
+
+    assert isinstance(compacted["District"].dtype, pd.CategoricalDtype)
+    assert compacted["Adulteration"].dtype == bool
+    assert compacted["Capacity"].dtype == np.int16
+    assert compacted["Fat"].dtype == np.float32
+    assert compacted["SNF"].dtype == np.float64  # not exactly representable in float32
+    assert compacted["BMC_ID"].tolist() == df["BMC_ID"].tolist()
+    pd.testing.assert_frame_equal(
+        compacted.astype({"District": object, "Fat": float}),
+        df.assign(Adulteration=df["Adulteration"] == "Yes").astype({"District": object}),
+        check_dtype=False,
+    )
+    assert memory_bytes(compacted) < memory_bytes(df)
+
+
+def test_blank_flags_become_nullable_booleans():
+    flags = compact_frame(pd.DataFrame({"Flag": ["Yes", None, "no"]}))["Flag"]
+
+    assert str(flags.dtype) == "boolean"
+    assert flags.tolist()[0] is True and flags.isna().tolist() == [False, True, False]
@@ -0,0 +1,256 @@
+# TrackerPMU/test_data_manager.py
+import sqlite3
+import threading
+from datetime import date
+
+import pandas as pd
+import pytest
+
+
+def _names(task_db, employee):
+    return {task["id"]: task["name"] for task in task_db.fetch_tasks(employee=employee)}
+
+
+def test_apply_task_changes_updates_and_deletes_together(task_db):
+    first = task_db.insert_task("Pari Sharma", "First", "", date(2025, 7, 1))
+    second = task_db.insert_task("Pari Sharma", "Second", "", date(2025, 7, 2))
+
+    updated, deleted = task_db.apply_task_changes(
+        {first: {"status": "Done", "due_date": date(2025, 8, 1)}, second: {"name": "Ignored"}}, [second]
+    )
+
+    assert (updated, deleted) == (1, 1)
+    tasks = task_db.fetch_tasks(employee="Pari Sharma")
+    assert [(task["id"], task["status"], task["due_date"]) for task in tasks] == [(first, "Done", date(2025, 8, 1))]
+
+
+def test_apply_task_changes_rolls_back_on_failure(task_db):
+    first = task_db.insert_task("Pari Sharma", "First", "Keep me", date(2025, 7, 1))
+    second = task_db.insert_task("Pari Sharma", "Second", "", date(2025, 7, 2))
+
+    with pytest.raises(sqlite3.IntegrityError):
+        task_db.apply_task_changes({first: {"name": "Renamed"}, second: {"description": None}}, [])
+
+    assert _names(task_db, "Pari Sharma") == {first: "First", second: "Second"}
+
+
+def test_apply_task_changes_rejects_unknown_fields(task_db):
+    task_id = task_db.insert_task("Pari Sharma", "First", "", date(2025, 7, 1))
+
+    with pytest.raises(ValueError):
+        task_db.apply_task_changes({task_id: {"employee": "Ranu Laddha"}})
+
+    assert _names(task_db, "Ranu Laddha") == {}
+
+
+def _grid(task_db, employee):
+    """The bulk editor's grid: every task of the employee, none selected."""
+    tasks = task_db.fetch_tasks(employee=employee)
+    return pd.DataFrame(tasks, columns=["id", *task_db.EDITABLE_TASK_FIELDS]).assign(selected=False)
+
+
+def test_bulk_task_changes_applies_edits_and_skips_unchanged_rows(task_db):
+    ids = [task_db.insert_task("Pari Sharma", name, "", date(2025, 7, 1)) for name in ["A", "B", "C", "D"]]
+    original = _grid(task_db, "Pari Sharma")
+    edited = original.copy()
+    rows = {task_id: i for i, task_id in enumerate(original["id"])}
+    edited.loc[rows[ids[0]], "name"] = "A renamed"
+    edited.loc[rows[ids[1]], "description"] = None
+    edited.loc[[rows[ids[1]], rows[ids[2]]], "selected"] = True
+    # The grid hands dates back as Timestamps; an unchanged date must not count as an edit.
+    edited["due_date"] = pd.to_datetime(edited["due_date"])
+
+    updates, deletes = task_db.bulk_task_changes(original, edited, "Move due date", "Done", 7)
+    updated, deleted = task_db.apply_task_changes(updates, deletes)
+
+    assert updates == {
+        ids[0]: {"name": "A renamed"},
+        ids[1]: {"due_date": date(2025, 7, 8)},
+        ids[2]: {"due_date": date(2025, 7, 8)},
+    }
+    assert (updated, deleted) == (3, 0)
+    tasks = {task["id"]: task for task in task_db.fetch_tasks(employee="Pari Sharma")}
+    assert [tasks[task_id]["due_date"] for task_id in ids] == [date(2025, 7, 1), date(2025, 7, 8), date(2025, 7, 8), date(2025, 7, 1)]
+    assert tasks[ids[0]]["name"] == "A renamed" and tasks[ids[1]]["description"] == ""
+
+
+def test_bulk_task_changes_status_and_delete_actions(task_db):
+    ids = [task_db.insert_task("Pari Sharma", name, "", date(2025, 7, 1)) for name in ["A", "B", "C"]]
+    original = _grid(task_db, "Pari Sharma")
+    selected = original.assign(selected=original["id"].isin(ids[:2]))
+
+    assert task_db.bulk_task_changes(original, original, "Set status", "Done", 0) == ({}, [])
+    assert task_db.bulk_task_changes(original, selected, "Delete", "Done", 0) == ({}, ids[:2])
+    updates, deletes = task_db.bulk_task_changes(original, selected, "Set status", "Done", 0)
+    task_db.apply_task_changes(updates, deletes)
+
+    statuses = {task["id"]: task["status"] for task in task_db.fetch_tasks(employee="Pari Sharma")}
+    assert statuses == {ids[0]: "Done", ids[1]: "Done", ids[2]: "To Do"}
+
+
+def test_apply_task_changes_rejects_unknown_status(task_db):
+    first = task_db.insert_task("Pari Sharma", "First", "", date(2025, 7, 1))
+    second = task_db.insert_task("Pari Sharma", "Second", "", date(2025, 7, 2))
+    original = _grid(task_db, "Pari Sharma")
+    edited = original.assign(name=["First renamed", "Second"], status=["To Do", "Blocked"])
+
+    with pytest.raises(ValueError, match="Blocked"):
+        task_db.apply_task_changes(*task_db.bulk_task_changes(original, edited, "No bulk action", "Done", 0))
+
+    tasks = task_db.fetch_tasks(employee="Pari Sharma")
+    assert [(task["id"], task["name"], task["status"]) for task in tasks] == [(first, "First", "To Do"), (second, "Second", "To Do")]
+
+
+def _seed_column(task_db, employee, due_dates, status="To Do"):
+    return [task_db.insert_task(employee, f"Task {i}", "", due, status) for i, due in enumerate(due_dates)]
+
+
+def test_fetch_task_page_walks_column_in_order(task_db):
+    due_dates = [date(2025, 7, 1 + i % 5) for i in range(23)]
+    _seed_column(task_db, "Pari Sharma", due_dates)
+    _seed_column(task_db, "Pari Sharma", [date(2025, 7, 2)], status="Done")
+    expected = [task["id"] for task in task_db.fetch_tasks(employee="Pari Sharma", status="To Do")]
+
+    seen, offsets, cursor = [], [], None
+    while True:
+        page = task_db.fetch_task_page("Pari Sharma", "To Do", after=cursor, limit=10)
+        offsets.append(page.offset)
+        seen.extend(task["id"] for task in page.tasks)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == expected
+    assert offsets == [0, 10, 20]
+
+
+def test_fetch_task_page_cursor_survives_changes_before_it(task_db):
+    ids = _seed_column(task_db, "Pari Sharma", [date(2025, 7, day) for day in range(1, 7)])
+    first = task_db.fetch_task_page("Pari Sharma", "To Do", limit=3)
+
+    # Cards on the first page move away; the next page still starts after the cursor.
+    task_db.update_task_status(ids[0], "Done")
+    task_db.delete_task(ids[1])
+    second = task_db.fetch_task_page("Pari Sharma", "To Do", after=first.next_cursor, limit=3)
+
+    assert [task["id"] for task in second.tasks] == ids[3:]
+    assert second.offset == 1
+    assert second.next_cursor is None
+
+
+def test_summarize_tasks_by_status(task_db):
+    _seed_column(task_db, "Pari Sharma", [date(2025, 6, 1), date(2025, 6, 20), date(2025, 7, 5)])
+
+    summaries = task_db.summarize_tasks_by_status("Pari Sharma", ["To Do", "Done"], today=date(2025, 6, 15))
+
+    assert summaries["To Do"] == {"count": 3, "overdue": 1, "next_due": date(2025, 6, 20)}
+    assert summaries["Done"] == {"count": 0, "overdue": 0, "next_due": None}
+
+
+def test_task_ids_are_never_reused(task_db):
+    first = task_db.insert_task("Pari Sharma", "First", "", date(2025, 7, 1))
+    second = task_db.insert_task("Pari Sharma", "Second", "", date(2025, 7, 2))
+    task_db.delete_task(second)
+
+    assert task_db.get_next_task_id() == second + 1
+    assert task_db.insert_task("Pari Sharma", "Third", "", date(2025, 7, 3)) == second + 1
+    assert first < second
+
+
+def test_task_ids_are_unique_across_threads(task_db):
+    ids = []
+    lock = threading.Lock()
+
+    def insert():
+        for i in range(20):
+            task_id = task_db.insert_task("Pari Sharma", f"Task {i}", "", date(2025, 7, 1))
+            with lock:
+                ids.append(task_id)
+
+    threads = [threading.Thread(target=insert) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(ids)) == 100
+
+
+def test_allocate_ids_reserves_a_block(task_db):
+    with task_db.transaction() as conn:
+        block = task_db.allocate_ids(conn, "tasks", 10)
+
+    assert len(block) == 10
+    assert task_db.get_next_task_id() == block[-1] + 1
+
+
+@pytest.fixture
+def team(task_db):
+    """A few tasks spread over Shifali Sharma's reports, Kuntal Dutta's team and Shifali herself."""
+    tasks = [
+        ("Bhavya Kharoo", "Milk audit at Nandgaon", "Check 50% of cans", "To Do", date(2025, 6, 10)),
+        ("Pari Sharma", "BMC visit", "Audit chilling logs", "In Progress", date(2025, 6, 18)),
+        ("Ranu Laddha", "Farmer training", "", "Done", date(2025, 6, 5)),
+        ("Gautam Bagada", "Milk audit at Lonikand", "", "To Do", date(2025, 6, 12)),
+    ]
+    for employee, name, description, status, due in tasks:
+        task_db.insert_task(employee, name, description, due, status)
+    return task_db
+
+
+def _employees(result):
+    return sorted(result.tasks["employee"])
+
+
+def test_query_tasks_by_reporting_line(team):
+    reports = team.query_tasks(manager="Shifali Sharma")
+    with_manager = team.query_tasks(manager="Shifali Sharma", include_manager=True)
+
+    assert _employees(reports) == ["Bhavya Kharoo", "Pari Sharma", "Ranu Laddha"]
+    # The seed gives Shifali Sharma two tasks of her own.
+    assert with_manager.total == reports.total + 2
+    # Indirect reports are included: Kuntal Dutta's team sits under Rupesh Mukherjee.
+    assert "Gautam Bagada" in set(team.query_tasks(manager="Rupesh Mukherjee").tasks["employee"])
+
+
+def test_query_tasks_overdue_across_reports(team):
+    overdue = team.query_tasks(
+        statuses=["To Do", "In Progress"], due_to=date(2025, 6, 14), manager="Shifali Sharma"
+    )
+
+    assert overdue.tasks["name"].tolist() == ["Milk audit at Nandgaon"]
+
+
+def test_query_tasks_free_text(team):
+    assert sorted(team.query_tasks(text="milk audit").tasks["name"]) == ["Milk audit at Lonikand", "Milk audit at Nandgaon"]
+    assert team.query_tasks(text="chilling").tasks["name"].tolist() == ["BMC visit"]
+    # Short strings and LIKE wildcards are matched literally.
+    assert team.query_tasks(text="50%").tasks["name"].tolist() == ["Milk audit at Nandgaon"]
+    assert team.query_tasks(text="%").total == 1
+
+
+def test_query_tasks_text_index_follows_edits(team):
+    task_id = int(team.query_tasks(text="chilling").tasks["id"][0])
+
+    team.apply_task_changes({task_id: {"description": "Review collection routes"}})
+
+    assert team.query_tasks(text="chilling").total == 0
+    assert team.query_tasks(text="collection routes").tasks["id"].tolist() == [task_id]
+
+
+def test_query_tasks_pages_do_not_overlap(team):
+    pages = [team.query_tasks(sort="employee", descending=True, limit=2, offset=offset) for offset in range(0, 10, 2)]
+    ids = [task_id for page in pages for task_id in page.tasks["id"]]
+
+    assert len(ids) == len(set(ids)) == pages[0].total
+
+
+def test_query_tasks_rejects_unknown_sort(team):
+    with pytest.raises(ValueError):
+        team.query_tasks(sort="due_date; DROP TABLE tasks")
+
+
+def test_query_tasks_text_without_fts(team, monkeypatch):
+    monkeypatch.setattr(team, "_has_fts", False)
+
+    assert sorted(team.query_tasks(text="milk audit").tasks["name"]) == ["Milk audit at Lonikand", "Milk audit at Nandgaon"]
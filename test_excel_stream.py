@@ -0,0 +1,70 @@
+# TrackerPMU/test_excel_stream.py
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import write_workbook
+from excel_stream import iter_sheet_chunks, iter_sheets, read_headers, read_sheets
+
+WORKBOOK = os.path.join(os.path.dirname(__file__), "SDDPLCompiledReport_June.xlsx")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return write_workbook(tmp_path / "book.xlsx", {
+        "BMC": pd.DataFrame({"BMC_ID": ["BMC001", "BMC002", None], "Fat": [3.5, 4, None], "Code": ["7", "8", "9"]}),
+        "Training": pd.DataFrame({"Topic": ["AW"], "Aug'23": [92]}),
+    })
+
+
+def test_read_sheets_matches_read_excel(workbook):
+    expected = pd.read_excel(workbook, sheet_name=None)
+
+    parsed = read_sheets(workbook)
+
+    assert list(parsed) == list(expected)
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(parsed[name], frame, check_dtype=False)
+
+
+def test_read_sheets_only_requested_sheets_and_columns(workbook):
+    parsed = read_sheets(workbook, ["BMC"], columns={"BMC": ["BMC_ID", "Fat"]})
+
+    assert list(parsed) == ["BMC"]
+    assert list(parsed["BMC"].columns) == ["BMC_ID", "Fat"]
+    assert read_headers(workbook) == {"BMC": ["BMC_ID", "Fat", "Code"], "Training": ["Topic", "Aug'23"]}
+
+
+@pytest.mark.skipif(not os.path.exists(WORKBOOK), reason="sample compiled report not present")
+def test_read_sheets_matches_read_excel_on_compiled_report():
+    expected = pd.read_excel(WORKBOOK, sheet_name=None)
+
+    parsed = read_sheets(WORKBOOK)
+
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(parsed[name], frame, check_dtype=False)
+
+
+def test_iter_sheet_chunks_yields_bounded_typed_chunks(tmp_path):
+    path = write_workbook(tmp_path / "book.xlsx", {
+        "BMC": pd.DataFrame({"BMC_ID": [f"BMC{i:03d}" for i in range(7)], "Fat": [3.5, 4, 3.8, 4.1, 3.9, 4.2, 3.6]}),
+    })
+
+    chunks = list(iter_sheet_chunks(path, "BMC", columns=["Fat"], dtypes={"Fat": "float32"}, chunksize=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert all(list(chunk.columns) == ["Fat"] and chunk["Fat"].dtype == "float32" for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), read_sheets(path, ["BMC"], columns={"BMC": ["Fat"]})["BMC"], check_dtype=False
+    )
+
+
+def test_iter_sheets_streams_each_sheet_in_turn(workbook, tmp_path):
+    seen = {name: [len(chunk) for chunk in chunks] for name, chunks in iter_sheets(workbook, chunksize=2)}
+
+    assert seen == {"BMC": [2, 1], "Training": [1]}
+    # An empty sheet still yields one chunk carrying its header.
+    empty = write_workbook(tmp_path / "empty.xlsx", {"Farmers": pd.DataFrame(columns=["Farmer_ID", "Cattle"])})
+    [(name, chunks)] = list((name, list(chunks)) for name, chunks in iter_sheets(empty))
+    assert name == "Farmers" and len(chunks) == 1 and list(chunks[0].columns) == ["Farmer_ID", "Cattle"]
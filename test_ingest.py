@@ -0,0 +1,82 @@
+# TrackerPMU/test_ingest.py
+import os
+
+import pandas as pd
+import pytest
+
+import workbook_cache
+from conftest import write_workbook
+from ingest import TIMING_COLUMNS, ingest_workbooks, validate_ingestion
+from sheet_index import RoleSignature
+
+SIGNATURES = {
+    "farmer": RoleSignature("Farmer", ["Farmer_ID", "Village", "Cattle_Count"]),
+    "bmc": RoleSignature("BMC", ["BMC_ID", "District", "Quality_Fat_Percentage"]),
+}
+FARMERS = 4000
+
+
+@pytest.fixture
+def workbooks(tmp_path, monkeypatch):
+    """Two small workbooks in the working directory, where spawned workers find the same cache."""
+    monkeypatch.chdir(tmp_path)
+    farmers = pd.DataFrame({
+        "Farmer_ID": [f"F{i:04d}" for i in range(FARMERS)],
+        "Village": ["Nandgaon", "Lonikand"] * (FARMERS // 2),
+        "Cattle_Count": [i % 12 for i in range(FARMERS)],
+    })
+    bmcs = pd.DataFrame({"BMC_ID": ["BMC001", "BMC002"], "District": ["Pune", "Pune"], "Quality_Fat_Percentage": [3.5, 3.9]})
+    return [
+        write_workbook("KSHEERSAGAR LTD File.xlsx", {"Farmers": farmers, "BMCs": bmcs, "Notes": pd.DataFrame({"Note": ["x"]})}),
+        write_workbook("Govind.xlsx", {"BMC": bmcs.assign(Quality_Fat_Percentage=[4.1, 3.2])}),
+    ]
+
+
+def test_role_sheets_fan_out_to_worker_processes(workbooks):
+    progress = []
+
+    result = ingest_workbooks(workbooks, SIGNATURES, max_workers=2, progress=lambda done, total: progress.append((done, total)))
+
+    assert result.roles == {
+        "KSHEERSAGAR LTD File.xlsx": {"farmer": "Farmers", "bmc": "BMCs"},
+        "Govind.xlsx": {"bmc": "BMC"},
+    }
+    timings = result.timings.set_index(["Workbook", "Sheet"])
+    assert list(result.timings.columns) == TIMING_COLUMNS
+    assert sorted(timings.index) == [("Govind.xlsx", "BMC"), ("KSHEERSAGAR LTD File.xlsx", "BMCs"), ("KSHEERSAGAR LTD File.xlsx", "Farmers")]
+    pids = {int(source.split("pid ")[1].split(")")[0]) for source in timings["Source"]}
+    assert os.getpid() not in pids
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    farmers = result.role_frame("KSHEERSAGAR LTD File.xlsx", "farmer")
+    assert farmers["Cattle_Count"].tolist() == [i % 12 for i in range(FARMERS)]
+    assert result.role_frame("Govind.xlsx", "farmer").empty
+    assert validate_ingestion(result, SIGNATURES, "Govind.xlsx") == ["Govind.xlsx: no sheet found for the farmer role."]
+
+
+def test_timing_report_sizes_and_cached_reruns(workbooks):
+    ingest_workbooks(workbooks, SIGNATURES, max_workers=2)
+
+    rerun = ingest_workbooks(workbooks, SIGNATURES).timings.set_index(["Workbook", "Sheet"])
+
+    assert set(rerun["Source"]) == {"cache"}
+    farmers = rerun.loc[("KSHEERSAGAR LTD File.xlsx", "Farmers")]
+    assert (farmers["Rows"], farmers["Columns"]) == (FARMERS, 3)
+    # Categorical villages and narrow cattle counts shrink the farmer sheet; compaction never grows a frame.
+    assert farmers["After_MB"] < farmers["Before_MB"]
+    assert (rerun["After_MB"] <= rerun["Before_MB"]).all()
+
+
+def test_worker_failure_is_raised_and_other_sheets_stay_cached(workbooks):
+    # A directory where the Farmers sheet's cache file belongs makes that worker's write fail.
+    path = workbooks[0]
+    headers = workbook_cache.load_headers(path)
+    entry_dir = workbook_cache._entry_dir(workbook_cache.workbook_key(path))
+    os.makedirs(workbook_cache._sheet_file(entry_dir, list(headers).index("Farmers")))
+
+    with pytest.raises(OSError):
+        ingest_workbooks(workbooks, SIGNATURES, max_workers=2)
+
+    assert workbook_cache.is_sheet_cached(path, "BMCs")
+    assert workbook_cache.is_sheet_cached(workbooks[1], "BMC")
+    assert not workbook_cache.is_sheet_cached(path, "Farmers")
@@ -0,0 +1,54 @@
+# TrackerPMU/test_ingest_jobs.py
+import time
+
+
+def _expire_heartbeat(job_queue, job_id):
+    with job_queue.transaction() as conn:
+        conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ?", (time.time() - job_queue.STALE_SECONDS - 1, job_id))
+
+
+def test_submit_dedupes_active_and_failed_versions(job_queue):
+    job = job_queue.submit("v1")
+    assert job_queue.submit("v1").id == job.id
+
+    claimed = job_queue.claim("worker-a")
+    assert job_queue.fail(claimed.id, "worker-a", "boom")
+    assert job_queue.submit("v1").id == job.id
+    assert job_queue.submit("v1", retry=True).id != job.id
+
+
+def test_stale_worker_cannot_overwrite_reclaimed_job(job_queue):
+    job = job_queue.submit("v1")
+    assert job_queue.claim("worker-a").id == job.id
+    _expire_heartbeat(job_queue, job.id)
+
+    reclaimed = job_queue.claim("worker-b")
+    assert reclaimed.id == job.id and reclaimed.worker == "worker-b"
+
+    assert not job_queue.report_progress(job.id, "worker-a", 0.5, "Late")
+    assert not job_queue.fail(job.id, "worker-a", "Lost the claim")
+    assert job_queue.complete(job.id, "worker-b", [])
+    assert not job_queue.complete(job.id, "worker-a", ["stale"])
+
+    finished = job_queue.latest_job("v1")
+    assert (finished.status, finished.issues, finished.error) == ("done", [], None)
+
+
+def test_heartbeat_keeps_silent_job_claimed(job_queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "STALE_SECONDS", 0.3)
+    stolen = []
+
+    def run(job, report):
+        # A long phase without progress reports, longer than the stale window.
+        time.sleep(0.8)
+        stolen.append(job_queue.claim("worker-b"))
+        return []
+
+    worker = job_queue.IngestWorker(run, heartbeat_interval=0.05)
+    job_queue.submit("v1")
+
+    job = worker.run_once()
+
+    assert stolen == [None]
+    assert job_queue.latest_job("v1").status == "done"
+    assert job_queue.latest_job("v1").worker == worker.id == job.worker
@@ -0,0 +1,92 @@
+# TrackerPMU/test_partner_reports.py
+import pandas as pd
+import pytest
+
+import partner_reports
+from partner_reports import COMPILED_SOURCE, KPI_SHEET_SOURCE, REPORT_COLUMNS, REPORT_ORDER
+
+
+def _report(rows):
+    report = pd.DataFrame(rows, columns=["Partner", "Month", "Metric", "Value", "Source"])
+    report["Month"] = pd.to_datetime(report["Month"])
+    report["Year"] = report["Month"].dt.year.astype("int32")
+    return report[REPORT_COLUMNS]
+
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    """Builds a report version from the given rows instead of from workbooks."""
+    monkeypatch.setattr(partner_reports, "REPORTS_DIR", str(tmp_path / "reports"))
+
+    def build(rows, version="v1"):
+        monkeypatch.setattr(partner_reports, "consolidate", lambda paths: _report(rows))
+        return partner_reports.build_reports([], version)
+    return build
+
+
+def test_kpi_sheet_rows_melts_months_under_header():
+    sheet = pd.DataFrame([
+        ["Govind monthly KPIs", None, None, None],
+        ["Particulars", "Jun'25", "Jul'25", "Total"],
+        ["Compliant Milk Vol - ACTUAL", 100, 120, 220],
+        ["No. of CBMCs", 4, None, 4],
+    ])
+
+    rows = partner_reports.kpi_sheet_rows(sheet, "Govind")
+
+    assert rows[["Metric", "Month", "Value"]].values.tolist() == [
+        ["Total Compliant Milk - ACTUAL", pd.Timestamp("2025-06-01"), 100.0],
+        ["Total Compliant Milk - ACTUAL", pd.Timestamp("2025-07-01"), 120.0],
+        ["No. of CBMCs", pd.Timestamp("2025-06-01"), 4.0],
+    ]
+    assert set(rows["Source"]) == {KPI_SHEET_SOURCE}
+
+
+def test_query_order_is_independent_of_partitions(reports):
+    rows = [
+        ("SDDPL", "2025-06-01", "Milk Received - Actual Vol", 10.0, KPI_SHEET_SOURCE),
+        ("Govind", "2024-12-01", "Milk Received - Actual Vol", 5.0, KPI_SHEET_SOURCE),
+        ("Govind", "2025-06-01", "Milk Received - Actual Vol", 7.0, KPI_SHEET_SOURCE),
+        ("Govind", "2025-06-01", "Milk Received - Actual Vol", 8.0, COMPILED_SOURCE),
+    ]
+
+    result = reports(rows).query()
+
+    expected = _report(rows).sort_values(REPORT_ORDER, ignore_index=True)
+    assert result[["Partner", "Month", "Source", "Value"]].values.tolist() == (
+        expected[["Partner", "Month", "Source", "Value"]].values.tolist()
+    )
+    assert result["Source"].tolist()[1:3] == [COMPILED_SOURCE, KPI_SHEET_SOURCE]
+
+
+def test_compare_prunes_to_partners_and_months(reports):
+    handle = reports([
+        ("SDDPL", "2025-06-01", "No. of CBMCs", 3.0, KPI_SHEET_SOURCE),
+        ("ALL DP", "2025-06-01", "No. of CBMCs", 9.0, KPI_SHEET_SOURCE),
+        ("ALL DP", "2025-05-01", "No. of CBMCs", 8.0, KPI_SHEET_SOURCE),
+    ])
+
+    table = handle.compare("No. of CBMCs", ["ALL DP"], start=pd.Timestamp("2025-06-01"))
+
+    assert handle.partners() == ["ALL DP", "SDDPL"]
+    assert table.to_dict() == {"ALL DP": {pd.Timestamp("2025-06-01"): 9.0}}
+
+
+def test_older_handle_keeps_its_version_after_prunes(reports):
+    rows = [("SDDPL", "2025-06-01", "No. of CBMCs", 3.0, KPI_SHEET_SOURCE)]
+    held = reports(rows, "v1")
+
+    for version in ["v2", "v3", "v4"]:
+        reports(rows, version)
+
+    assert held.partners() == ["SDDPL"]
+    assert held.query()["Value"].tolist() == [3.0]
+
+
+def test_published_reports_only_opens_built_versions(reports):
+    assert partner_reports.published_reports("v1") is None
+
+    reports([("SDDPL", "2025-06-01", "No. of CBMCs", 3.0, KPI_SHEET_SOURCE)], "v1")
+
+    assert partner_reports.published_reports("v1").partners() == ["SDDPL"]
+    assert partner_reports.published_reports("v2") is None
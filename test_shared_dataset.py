@@ -0,0 +1,65 @@
+# TrackerPMU/test_shared_dataset.py
+import os
+
+import pandas as pd
+import pytest
+
+import shared_dataset
+
+
+@pytest.fixture(autouse=True)
+def _empty_dataset(dataset_dir):
+    pass
+
+
+def test_nothing_published():
+    assert shared_dataset.current() is None
+
+
+def test_publish_round_trips_frames():
+    bmc = pd.DataFrame({"BMC_ID": ["BMC001", "BMC002"], "Fat": [3.5, 3.2]}).astype({"BMC_ID": "category"})
+
+    shared_dataset.publish({"bmc": bmc, "empty": pd.DataFrame({"A": []})}, "v1")
+    dataset = shared_dataset.current()
+
+    assert dataset.version == "v1"
+    assert dataset.names() == ["bmc", "empty"]
+    pd.testing.assert_frame_equal(dataset.frame("bmc"), bmc)
+    assert dataset.frame("bmc") is dataset.frame("bmc")
+
+
+def test_republishing_moves_the_pointer_and_prunes(dataset_dir):
+    for version in ["v1", "v2", "v3"]:
+        shared_dataset.publish({"bmc": pd.DataFrame({"Fat": [float(version[1])]})}, version)
+    old = shared_dataset.SharedDataset("v2")
+
+    shared_dataset.publish({"ignored": pd.DataFrame()}, "v2")
+
+    assert shared_dataset.current().version == "v2"
+    assert old.frame("bmc")["Fat"].tolist() == [2.0]
+    assert sorted(name for name in os.listdir(dataset_dir) if name.startswith("v")) == ["v2", "v3"]
+
+
+def test_versions_with_live_handles_survive_pruning(dataset_dir):
+    shared_dataset.publish({"bmc": pd.DataFrame({"Fat": [1.0]})}, "v1")
+    held = shared_dataset.SharedDataset("v1")
+
+    for version in ["v2", "v3", "v4"]:
+        shared_dataset.publish({"bmc": pd.DataFrame({"Fat": [float(version[1])]})}, version)
+
+    assert held.frame("bmc")["Fat"].tolist() == [1.0]
+    assert sorted(name for name in os.listdir(dataset_dir) if name.startswith("v")) == ["v1", "v3", "v4"]
+
+    del held
+    shared_dataset.publish({"bmc": pd.DataFrame({"Fat": [5.0]})}, "v5")
+    assert sorted(name for name in os.listdir(dataset_dir) if name.startswith("v")) == ["v4", "v5"]
+    with pytest.raises(FileNotFoundError):
+        shared_dataset.SharedDataset("v1")
+
+
+def test_failed_publish_leaves_no_staging_directory(dataset_dir):
+    with pytest.raises(Exception):
+        shared_dataset.publish({"bmc": pd.DataFrame({"Mixed": [1, "a"]})}, "v1")
+
+    assert os.listdir(dataset_dir) == []
+    assert shared_dataset.current() is None
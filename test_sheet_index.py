@@ -0,0 +1,61 @@
+# TrackerPMU/test_sheet_index.py
+import pandas as pd
+import pytest
+
+import sheet_index
+from conftest import write_workbook
+from sheet_index import RoleSignature
+
+SIGNATURES = {
+    "bmc": RoleSignature("BMC", ["BMC ID", "Date", "Milk Volume (L)"]),
+    "farmer": RoleSignature("Farmer", ["Farmer ID", "Village"]),
+}
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(cache_dir):
+    pass
+
+
+def test_expected_columns_outrank_an_identifier_only_match():
+    headers = {
+        "Summary": ["BMC count", "Notes"],
+        "Collections": ["bmc_id", "DATE", "Milk Volume (L)"],
+        "Members": ["Farmer ID", "Village", "Name"],
+    }
+
+    roles, scores = sheet_index.classify_sheets(headers, SIGNATURES)
+
+    assert roles == {"bmc": "Collections", "farmer": "Members"}
+    assert scores["bmc"]["Summary"] == sheet_index.IDENTIFIER_WEIGHT
+    assert scores["bmc"]["Collections"] == 1.1
+
+
+def test_roles_without_any_match_are_left_out():
+    roles, _ = sheet_index.classify_sheets({"Sheet1": ["a", "b"]}, SIGNATURES)
+    assert roles == {}
+
+
+def test_index_is_cached_and_dtype_hints_follow_unchanged_headers(tmp_path):
+    path = str(tmp_path / "field.xlsx")
+    bmc = pd.DataFrame({"BMC ID": ["B1", "B2"], "Date": ["2025-01-01", "2025-01-02"], "Milk Volume (L)": [10.5, 12.0]})
+    farmers = pd.DataFrame({"Farmer ID": ["F1"], "Village": ["Anand"]})
+    write_workbook(path, {"BMC": bmc, "Farmers": farmers})
+
+    index = sheet_index.load_index(path, SIGNATURES)
+    assert index.roles == {"bmc": "BMC", "farmer": "Farmers"}
+    assert sheet_index.role_sheets(index) == ["BMC", "Farmers"]
+    assert index.dtypes == {}
+
+    sheet_index.record_dtypes(path, {"BMC": bmc, "Farmers": farmers})
+    hints = sheet_index.load_index(path, SIGNATURES).dtypes
+    assert hints["BMC"]["Milk Volume (L)"] == "float64"
+
+    # A new version whose Farmers header changed keeps only the BMC hints.
+    write_workbook(path, {"BMC": bmc, "Farmers": farmers.assign(Phone=["123"])})
+    assert set(sheet_index.load_index(path, SIGNATURES).dtypes) == {"BMC"}
+
+
+def test_signature_from_csv_reads_the_header_line():
+    signature = sheet_index.signature_from_csv("BMC", "\nBMC ID, Date ,Milk Volume (L)\nB1,2025-01-01,10\n")
+    assert signature == RoleSignature("BMC", ["BMC ID", "Date", "Milk Volume (L)"])
@@ -0,0 +1,102 @@
+# TrackerPMU/test_single_flight.py
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight, single_flight
+
+
+def test_concurrent_misses_run_the_loader_once():
+    calls = []
+    release = threading.Event()
+
+    def load(key):
+        calls.append(key)
+        release.wait(5)
+        return key * 2
+
+    cached = SingleFlight(load)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached(21))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [21]
+    assert results == [42] * 20
+
+
+def test_failed_load_is_not_cached():
+    attempts = []
+
+    @single_flight()
+    def load():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("workbook locked")
+        return "loaded"
+
+    with pytest.raises(RuntimeError):
+        load()
+    assert load() == "loaded"
+    assert len(attempts) == 2
+
+
+def test_stale_value_is_served_while_revalidating():
+    versions = iter(["v1", "v2"])
+    revalidated = threading.Event()
+
+    def load():
+        value = next(versions)
+        if value == "v2":
+            revalidated.set()
+        return value
+
+    cached = SingleFlight(load, ttl=0.05)
+    assert cached() == "v1"
+    time.sleep(0.1)
+
+    assert cached() == "v1"  # stale, while a background reload runs
+    assert revalidated.wait(5)
+    for _ in range(50):
+        if cached() == "v2":
+            break
+        time.sleep(0.01)
+    assert cached() == "v2"
+
+
+def test_failed_revalidation_keeps_stale_value():
+    state = {"fail": False}
+
+    def load():
+        if state["fail"]:
+            raise OSError("file gone")
+        return "v1"
+
+    cached = SingleFlight(load, ttl=0.01)
+    assert cached() == "v1"
+    state["fail"] = True
+    time.sleep(0.05)
+
+    assert cached() == "v1"
+    for _ in range(100):
+        if cached.last_error is not None:
+            break
+        time.sleep(0.01)
+    assert isinstance(cached.last_error, OSError)
+
+
+def test_invalidate_reloads_one_key():
+    calls = []
+    cached = SingleFlight(lambda key: calls.append(key) or len(calls))
+
+    assert cached("a") == 1
+    assert cached("b") == 2
+    cached.invalidate("a")
+
+    assert cached("a") == 3
+    assert cached("b") == 2
@@ -0,0 +1,81 @@
+# TrackerPMU/test_training_cube.py
+import threading
+
+import pandas as pd
+
+import training_cube
+from training_cube import TrainingCube, build_cube, parse_month
+
+
+def _wide():
+    return pd.DataFrame({
+        "Training_Topic": ["AW Training", "AW Training (Women)", "Total"],
+        "Aug'23": [10, 4, 14],
+        "Sept'23": [5, None, 5],
+        "Aug'24": [20, 6, 26],
+        "Total_Training": [35, 10, 45],
+        "No_of_Farmers": [700, 100, 800],
+    })
+
+
+def test_parse_month_spellings():
+    assert parse_month("Aug'23") == pd.Timestamp("2023-08-01")
+    assert parse_month("Sept'22") == pd.Timestamp("2022-09-01")
+    assert parse_month("July-2024") == pd.Timestamp("2024-07-01")
+    assert parse_month("Total_Training") is None
+
+
+def test_build_cube_splits_segments_and_drops_totals():
+    cube = build_cube(_wide())
+
+    assert set(cube["Topic"]) == {"AW Training"}
+    assert cube.groupby("Segment", observed=True)["Trainings"].sum().to_dict() == {"All": 35, "Women": 10}
+    # 700 farmers over 35 trainings: 20 per training.
+    first = cube[(cube["Segment"] == "All") & (cube["Month"] == pd.Timestamp("2023-08-01"))]
+    assert first["Farmers_Reached"].tolist() == [200.0]
+
+
+def test_slices_and_year_over_year():
+    cube = TrainingCube.from_wide(_wide())
+
+    totals = cube.totals(start=pd.Timestamp("2023-08-01"), end=pd.Timestamp("2023-12-01"), segments=("All",))
+    yoy = cube.year_over_year()
+
+    assert totals["Trainings"].to_dict() == {"AW Training": 15}
+    assert yoy.loc["Aug"].to_dict() == {2023: 14, 2024: 26}
+    assert cube.totals() is cube.totals()
+
+
+def test_fractional_training_counts_are_rounded():
+    wide = pd.DataFrame({"Training_Topic": ["AW Training"], "Aug'23": [2.6], "Sep'23": [3.2], "Oct'23": ["4"]})
+
+    cube = build_cube(wide)
+
+    assert cube["Trainings"].tolist() == [3, 3, 4]
+
+
+def test_payload_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(training_cube, "PAYLOAD_CACHE_SIZE", 2)
+    cube = TrainingCube.from_wide(_wide())
+    aug, sep = pd.Timestamp("2023-08-01"), pd.Timestamp("2023-09-01")
+
+    first = cube.totals(start=aug)
+    cube.totals(start=sep)
+    assert cube.totals(start=aug) is first  # refreshed, so the next miss evicts start=sep
+    cube.monthly()
+
+    assert cube.totals(start=aug) is first
+    assert len(cube._payloads) == 2
+
+
+def test_concurrent_sessions_share_one_payload():
+    cube = TrainingCube.from_wide(_wide())
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cube.monthly(segments=("All",)))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and all(result is results[0] for result in results)
@@ -0,0 +1,112 @@
+# TrackerPMU/test_workbook_cache.py
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import excel_stream
+import workbook_cache
+from conftest import write_workbook
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(cache_dir):
+    pass
+
+
+def _write(path, bmc_fat):
+    write_workbook(path, {
+        "BMC": pd.DataFrame({"BMC_ID": ["BMC001", "BMC002"], "Fat": bmc_fat}),
+        "Farmers": pd.DataFrame({"Farmer_ID": ["F001"], "Cattle": [5]}),
+    })
+
+
+def _count_parsed_sheets(monkeypatch):
+    parsed = []
+    iter_sheets = excel_stream.iter_sheets
+
+    def counting(*args, **kwargs):
+        for name, chunks in iter_sheets(*args, **kwargs):
+            parsed.append(name)
+            yield name, chunks
+    monkeypatch.setattr(excel_stream, "iter_sheets", counting)
+    return parsed
+
+
+def test_sheets_are_parsed_once(tmp_path, monkeypatch):
+    path = tmp_path / "book.xlsx"
+    _write(path, [3.5, 3.2])
+    parsed = _count_parsed_sheets(monkeypatch)
+
+    first = workbook_cache.load_workbook(str(path), sheet_names=["BMC"])
+    assert workbook_cache.is_sheet_cached(str(path), "BMC")
+    assert not workbook_cache.is_sheet_cached(str(path), "Farmers")
+    second = workbook_cache.load_workbook(str(path))
+
+    assert parsed == ["BMC", "Farmers"]
+    pd.testing.assert_frame_equal(first["BMC"], second["BMC"])
+    assert workbook_cache.load_headers(str(path)) == {"BMC": ["BMC_ID", "Fat"], "Farmers": ["Farmer_ID", "Cattle"]}
+
+
+def test_changed_workbook_only_reparses_changed_sheets(tmp_path, monkeypatch):
+    path = tmp_path / "book.xlsx"
+    _write(path, [3.5, 3.2])
+    workbook_cache.load_workbook(str(path))
+    parsed = _count_parsed_sheets(monkeypatch)
+
+    _write(path, [3.9, 3.2])
+    loaded = workbook_cache.load_workbook(str(path))
+
+    assert parsed == ["BMC"]
+    assert loaded["BMC"]["Fat"].tolist() == [3.9, 3.2]
+    assert loaded["Farmers"]["Cattle"].tolist() == [5]
+
+
+def test_column_selection(tmp_path):
+    path = tmp_path / "book.xlsx"
+    _write(path, [3.5, 3.2])
+
+    loaded = workbook_cache.load_workbook(str(path), columns={"BMC": ["Fat"]})
+
+    assert list(loaded["BMC"].columns) == ["Fat"]
+    assert list(loaded["Farmers"].columns) == ["Farmer_ID", "Cattle"]
+
+
+def test_unreadable_cached_sheet_is_reparsed_even_if_already_pruned(tmp_path, monkeypatch):
+    path = tmp_path / "book.xlsx"
+    _write(path, [3.5, 3.2])
+    workbook_cache.load_workbook(str(path))
+
+    read_table = workbook_cache.feather.read_table
+
+    def pruned_while_reading(file_path, **kwargs):
+        # A concurrent prune deletes the file between the isfile check and the read.
+        monkeypatch.setattr(workbook_cache.feather, "read_table", read_table)
+        os.remove(file_path)
+        raise FileNotFoundError(file_path)
+    monkeypatch.setattr(workbook_cache.feather, "read_table", pruned_while_reading)
+
+    loaded = workbook_cache.load_workbook(str(path), sheet_names=["BMC"])
+
+    assert loaded["BMC"]["Fat"].tolist() == [3.5, 3.2]
+
+
+def test_sheets_are_streamed_into_the_cache_chunk_by_chunk(tmp_path, monkeypatch):
+    # Column types shift between chunks: whole numbers then decimals, numbers then text, blanks then dates.
+    path = write_workbook(tmp_path / "book.xlsx", {"BMC": pd.DataFrame({
+        "Collected": list(range(4)) + [1.5] * 5,
+        "Code": list(range(4)) + ["A1"] * 5,
+        "Audited": [None] * 4 + [pd.Timestamp("2025-06-01")] * 5,
+        "Remarks": [None] * 9,
+    })})
+    iter_sheets = excel_stream.iter_sheets
+    monkeypatch.setattr(excel_stream, "iter_sheets", lambda *args, **kwargs: iter_sheets(*args, **kwargs, chunksize=2))
+
+    loaded = workbook_cache.load_workbook(path)["BMC"]
+
+    expected = workbook_cache.normalize_frame(excel_stream.read_sheets(path)["BMC"])
+    pd.testing.assert_frame_equal(loaded, expected)
+    [feather_file] = [p for p in (tmp_path / "cache").rglob("*.feather")]
+    with pa.memory_map(str(feather_file)) as source:
+        assert pa.ipc.open_file(source).num_record_batches == 5
@@ -0,0 +1,82 @@
+# TrackerPMU/test_workbook_watcher.py
+import os
+
+import pytest
+
+from workbook_watcher import WorkbookWatcher
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "book.xlsx"
+    path.write_bytes(b"v1")
+    return str(path)
+
+
+def _write(path, data, mtime_ns):
+    with open(path, "wb") as f:
+        f.write(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def watcher(workbook, calls):
+    """A watcher driven by hand that has already handled the workbook's first settled state."""
+    watcher = WorkbookWatcher(lambda: [workbook], calls.append)
+    watcher.run_once()
+    assert watcher.run_once() == [workbook]
+    calls.clear()
+    return watcher
+
+
+def test_file_still_being_written_does_not_trigger(watcher, workbook, calls):
+    start = os.stat(workbook).st_mtime_ns
+    for i in range(1, 4):
+        _write(workbook, b"v2" * i, start + i * 10**9)
+        assert watcher.run_once() == []
+
+    assert watcher.run_once() == [workbook]
+    assert calls == [[workbook]]
+
+
+def test_settled_change_triggers_once(watcher, workbook, calls):
+    _write(workbook, b"v2", os.stat(workbook).st_mtime_ns + 10**9)
+
+    results = [watcher.run_once() for _ in range(4)]
+
+    assert results == [[], [workbook], [], []]
+    assert calls == [[workbook]]
+    assert watcher.last_refresh is not None
+
+
+def test_deleted_file_is_ignored_until_restored(watcher, workbook, calls):
+    before = os.stat(workbook).st_mtime_ns
+    os.remove(workbook)
+
+    assert [watcher.run_once() for _ in range(3)] == [[], [], []]
+    assert calls == [] and watcher.last_error is None
+
+    # Restored with its old timestamp (e.g. `cp -p` from a backup): still picked up once.
+    _write(workbook, b"v1", before)
+    assert [watcher.run_once() for _ in range(3)] == [[], [workbook], []]
+
+
+def test_failed_callback_is_retried_on_the_next_poll(workbook):
+    attempts = []
+
+    def on_change(paths):
+        attempts.append(paths)
+        if len(attempts) == 1:
+            raise OSError("workbook locked")
+
+    watcher = WorkbookWatcher(lambda: [workbook], on_change)
+    watcher.run_once()
+
+    assert watcher.run_once() == [] and watcher.last_error == "OSError: workbook locked"
+    assert watcher.run_once() == [workbook] and watcher.last_error is None
+    assert attempts == [[workbook], [workbook]]
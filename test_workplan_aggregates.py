@@ -0,0 +1,74 @@
+# TrackerPMU/test_workplan_aggregates.py
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from conftest import workplan_rows
+from workplan_aggregates import PERIODS, SUMMARY_COLUMNS, WorkplanAggregates, period_key, period_keys
+from workplan_store import WorkplanStore
+
+MEMBERS = ["Asha", "Ravi", "Subhrat"]
+ACTIVITIES = ["BMC Visits", "Farmer Trainings"]
+
+
+def _assert_matches_groupby(store: WorkplanStore, days):
+    """Every rollup equals the same totals recomputed from scratch with a plain groupby over every entry."""
+    df = store.to_frame()
+    for period in PERIODS:
+        keys = df["Date"].map(lambda d: period_key(d, period))
+        fresh = df.groupby([keys, "Field Team Member", "Activity"])[["Target", "Achieved"]].sum()
+        # One day per period is enough: every day in a period shares its rollup.
+        for key, day in {period_key(day, period): day for day in days}.items():
+            expected = fresh.loc[key] if key in fresh.index.get_level_values(0) else fresh.iloc[:0].droplevel(0)
+            expected = expected.reset_index().rename(columns={"Target": "Total_Target", "Achieved": "Total_Achieved"})
+            pd.testing.assert_frame_equal(store.aggregates.rollup(period, day), expected[SUMMARY_COLUMNS], check_dtype=False)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_totals_match_a_fresh_groupby(seed):
+    rng = random.Random(seed)
+    # Spans a year end and quarter ends, where ISO weeks and calendar periods disagree.
+    days = [date(2024, 12, 20) + timedelta(days=i) for i in range(120)]
+    store = WorkplanStore(workplan_rows(*[
+        (rng.choice(days), rng.choice(MEMBERS), rng.choice(ACTIVITIES), rng.randint(0, 9), rng.randint(0, 9))
+        for _ in range(60)
+    ]))
+
+    for _ in range(150):
+        day, member, activity = rng.choice(days), rng.choice(MEMBERS), rng.choice(ACTIVITIES)
+        if rng.random() < 0.3:
+            store.delete(day, member, activity)
+        else:
+            # New entries and overwrites of existing ones, including zero counts.
+            store.upsert(workplan_rows((day, member, activity, rng.randint(0, 9), rng.randint(0, 9))))
+
+    _assert_matches_groupby(store, days)
+
+
+def test_deleting_the_last_entry_drops_the_row():
+    store = WorkplanStore(workplan_rows(
+        (date(2025, 7, 14), "Ravi", "BMC Visits", 0, 0),
+        (date(2025, 7, 15), "Ravi", "BMC Visits", 3, 2),
+    ))
+
+    assert store.delete(date(2025, 7, 15), "Ravi", "BMC Visits")
+    assert not store.delete(date(2025, 7, 15), "Ravi", "BMC Visits")
+
+    # An entry saved with zero counts still shows; a deleted one does not.
+    assert store.aggregates.rollup("week", date(2025, 7, 15)).values.tolist() == [["Ravi", "BMC Visits", 0, 0]]
+    assert store.aggregates.rollup("day", date(2025, 7, 15)).empty
+    assert store.to_frame()["Date"].tolist() == [date(2025, 7, 14)]
+    assert len(store) == 1
+
+
+def test_period_keys_match_period_key():
+    days = pd.Series(pd.date_range("2024-12-28", "2025-01-06"))
+
+    for period in PERIODS:
+        assert period_keys(days, period).tolist() == [period_key(day.date(), period) for day in days]
+
+
+def test_empty_history():
+    assert WorkplanAggregates(workplan_rows()).rollup("month", date(2025, 7, 1)).empty
@@ -0,0 +1,94 @@
+# TrackerPMU/test_workplan_export.py
+import gzip
+import io
+from datetime import date
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import workplan_export
+from conftest import workplan_rows
+from workplan_export import EXPORT_FORMATS, ExportCache, file_name, mime_type, serialize
+from workplan_store import WorkplanStore
+
+
+@pytest.fixture
+def store():
+    return WorkplanStore(workplan_rows(
+        (date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3),
+        (date(2025, 7, 15), "Asha", "Farmer Trainings", 2, 1),
+    ))
+
+
+def _read(payload: bytes, fmt: str) -> pd.DataFrame:
+    if fmt == "CSV":
+        return pd.read_csv(io.BytesIO(payload))
+    if fmt == "CSV (gzip)":
+        return pd.read_csv(io.BytesIO(gzip.decompress(payload)))
+    if fmt == "Parquet":
+        return pd.read_parquet(io.BytesIO(payload))
+    return pd.read_excel(io.BytesIO(payload))
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_every_format_round_trips_across_chunks(store, fmt, monkeypatch):
+    monkeypatch.setattr(workplan_export, "CHUNK_ROWS", 1)
+    df = store.to_frame().assign(Date=lambda frame: frame["Date"].astype(str))
+
+    read_back = _read(serialize(df, fmt), fmt)
+
+    pd.testing.assert_frame_equal(read_back, df, check_dtype=False)
+    assert file_name("daily_workplans", fmt).startswith("daily_workplans.")
+    assert mime_type(fmt) == EXPORT_FORMATS[fmt][1]
+
+
+def test_excel_export_has_one_header_row(store):
+    sheet = openpyxl.load_workbook(io.BytesIO(serialize(store.to_frame(), "Excel"))).active
+    assert [cell.value for cell in sheet[1]] == list(store.to_frame().columns)
+    assert sheet.max_row == 3
+
+
+def test_unknown_format_is_rejected(store):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        serialize(store.to_frame(), "PDF")
+
+
+def test_payloads_are_reused_until_the_revision_moves(store):
+    cache = ExportCache()
+    builds = []
+
+    def build():
+        builds.append(store.revision)
+        return store.to_frame()
+
+    first = cache.get("daily", "CSV", store, build)
+    assert cache.get("daily", "CSV", store, build) is first
+    cache.get("daily", "Parquet", store, build)
+    assert builds == [0, 0]
+
+    store.upsert(workplan_rows((date(2025, 7, 16), "Ravi", "BMC Visits", 1, 1)))
+    assert cache.get("daily", "CSV", store, build) != first
+    assert builds == [0, 0, 1]
+
+
+def test_a_save_between_render_and_click_is_not_cached_under_the_old_revision(store):
+    cache = ExportCache()
+    download = cache.lazy("daily", "CSV", store, store.to_frame)  # rendered at revision 0
+
+    store.upsert(workplan_rows((date(2025, 7, 16), "Ravi", "BMC Visits", 1, 1)))
+    clicked = _read(download(), "CSV")
+
+    assert len(clicked) == 3
+    # The payload is cached under the revision it was built from, so the next render reuses it.
+    assert cache.get("daily", "CSV", store, lambda: pytest.fail("should be cached")) == download()
+
+
+def test_nothing_is_serialized_until_clicked(store, monkeypatch):
+    calls = []
+    monkeypatch.setattr(workplan_export, "serialize", lambda df, fmt: calls.append(fmt) or b"")
+
+    download = ExportCache().lazy("daily", "Excel", store, store.to_frame)
+    assert calls == []
+    download()
+    assert calls == ["Excel"]
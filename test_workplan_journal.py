@@ -0,0 +1,100 @@
+# TrackerPMU/test_workplan_journal.py
+import multiprocessing
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import workplan_journal
+from conftest import workplan_rows
+
+
+def test_journaled_upserts_replay_over_the_snapshot(tmp_path):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3)).to_csv(snapshot, index=False)
+
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 6, 6)))
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 15), "Asha", "Farmer Trainings", 2, 1)))
+
+    loaded = workplan_journal.load(snapshot)
+    assert loaded.values.tolist() == [
+        [date(2025, 7, 14), "Ravi", "BMC Visits", 6, 6],
+        [date(2025, 7, 15), "Asha", "Farmer Trainings", 2, 1],
+    ]
+
+
+def test_torn_final_journal_line_is_skipped(tmp_path):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3)))
+    with open(snapshot + ".journal", "a") as f:
+        f.write('{"Date": "2025-07-15", "Field Team')
+
+    assert workplan_journal.load(snapshot).values.tolist() == [[date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3]]
+
+
+def test_save_after_a_torn_line_is_not_lost(tmp_path):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3)))
+    with open(snapshot + ".journal", "a") as f:
+        f.write('{"Date": "2025-07-15", "Field Team')
+
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 16), "Asha", "Farmer Trainings", 2, 1)))
+
+    assert workplan_journal.load(snapshot).values.tolist() == [
+        [date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3],
+        [date(2025, 7, 16), "Asha", "Farmer Trainings", 2, 1],
+    ]
+    with open(snapshot + ".journal") as f:
+        assert len(f.read().splitlines()) == 2
+
+
+@pytest.mark.parametrize("target", [None, float("nan"), "", 2.5])
+def test_blank_or_fractional_counts_are_rejected_before_writing(tmp_path, target):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    rows = workplan_rows(
+        (date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3),
+        (date(2025, 7, 15), "Ravi", "BMC Visits", target, 3),
+    )
+
+    with pytest.raises(ValueError, match="Target for Ravi / BMC Visits"):
+        workplan_journal.append(snapshot, rows)
+
+    assert workplan_journal.load(snapshot).empty
+
+
+def test_whole_number_counts_are_coerced(tmp_path):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 5.0, "3")))
+
+    assert workplan_journal.load(snapshot).values.tolist() == [[date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3]]
+
+
+def test_compact_folds_the_journal_into_the_snapshot(tmp_path):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3)))
+    workplan_journal.append(snapshot, workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 7, 4)))
+    before = workplan_journal.load(snapshot)
+
+    workplan_journal.compact(snapshot)
+
+    assert (tmp_path / "daily_workplans.csv.journal").stat().st_size == 0
+    pd.testing.assert_frame_equal(workplan_journal.load(snapshot), before, check_dtype=False)
+
+
+def _save(snapshot, member):
+    for day in range(1, 21):
+        workplan_journal.append(snapshot, workplan_rows((date(2025, 7, day), member, "BMC Visits", day, day)))
+
+
+def test_concurrent_processes_do_not_interleave_writes(tmp_path):
+    snapshot = str(tmp_path / "daily_workplans.csv")
+    context = multiprocessing.get_context("spawn")
+    savers = [context.Process(target=_save, args=(snapshot, f"Member {i}")) for i in range(4)]
+    for saver in savers:
+        saver.start()
+    for saver in savers:
+        saver.join()
+
+    loaded = workplan_journal.load(snapshot)
+    assert len(loaded) == 80
+    assert sorted(loaded.groupby("Field Team Member").size().tolist()) == [20] * 4
@@ -0,0 +1,66 @@
+# TrackerPMU/test_workplan_store.py
+from datetime import date
+
+import pandas as pd
+
+from conftest import workplan_rows
+from workplan_journal import WORKPLAN_COLUMNS
+from workplan_store import WorkplanStore
+
+
+def test_upsert_replaces_entries_and_keeps_totals_current():
+    store = WorkplanStore(workplan_rows(
+        (date(2025, 7, 14), "Ravi", "BMC Visits", 5, 3),
+        (date(2025, 7, 15), "Ravi", "BMC Visits", 4, 4),
+    ))
+
+    store.upsert(workplan_rows(
+        (date(2025, 7, 15), "Ravi", "BMC Visits", 6, 5),
+        (date(2025, 7, 16), "Asha", "Farmer Trainings", 2, 1),
+    ))
+
+    assert len(store) == 3
+    assert store.revision == 1
+    assert store.get(date(2025, 7, 15), "Ravi", "BMC Visits") == (6, 5)
+    assert store.get(date(2025, 7, 15), "Asha", "BMC Visits") is None
+    week = store.aggregates.rollup("week", date(2025, 7, 15))
+    assert week.values.tolist() == [["Asha", "Farmer Trainings", 2, 1], ["Ravi", "BMC Visits", 11, 8]]
+
+
+def test_aggregates_match_a_rebuild_after_upserts():
+    store = WorkplanStore()
+    store.upsert(workplan_rows((date(2025, 3, 31), "Ravi", "BMC Visits", 5, 3)))
+    store.upsert(workplan_rows((date(2025, 4, 1), "Ravi", "BMC Visits", 4, 4)))
+    store.upsert(workplan_rows((date(2025, 3, 31), "Ravi", "BMC Visits", 1, 1)))
+
+    rebuilt = WorkplanStore(store.to_frame())
+    for period in ["day", "week", "month", "quarter"]:
+        for day in [date(2025, 3, 31), date(2025, 4, 1)]:
+            pd.testing.assert_frame_equal(store.aggregates.rollup(period, day), rebuilt.aggregates.rollup(period, day))
+
+
+def test_views_are_in_date_order():
+    store = WorkplanStore()
+    store.upsert(workplan_rows((date(2025, 7, 16), "Ravi", "BMC Visits", 1, 1)))
+    store.upsert(workplan_rows((date(2025, 7, 14), "Ravi", "BMC Visits", 2, 2)))
+
+    assert store.to_frame()["Date"].tolist() == [date(2025, 7, 14), date(2025, 7, 16)]
+    assert store.day(date(2025, 7, 14))["Target"].tolist() == [2]
+    assert store.day(date(2025, 7, 15)).empty
+
+
+def test_range_slices_dates_inclusively():
+    store = WorkplanStore(workplan_rows(
+        (date(2025, 7, 31), "Ravi", "BMC Visits", 1, 1),
+        (date(2025, 8, 1), "Ravi", "BMC Visits", 2, 2),
+        (date(2025, 8, 15), "Asha", "Farmer Trainings", 3, 3),
+    ))
+    store.upsert(workplan_rows((date(2025, 8, 10), "Asha", "BMC Visits", 4, 4)))
+
+    august = store.range(date(2025, 8, 1), date(2025, 8, 31))
+
+    assert august["Date"].tolist() == [date(2025, 8, 1), date(2025, 8, 10), date(2025, 8, 15)]
+    assert august["Target"].tolist() == [2, 4, 3]
+    assert store.range(date(2025, 8, 2), date(2025, 8, 9)).empty
+    assert store.range(date(2025, 8, 15), date(2025, 8, 15))["Field Team Member"].tolist() == ["Asha"]
+    assert list(store.range(date(2026, 1, 1), date(2026, 1, 31)).columns) == WORKPLAN_COLUMNS
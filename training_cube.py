@@ -0,0 +1,143 @@
+# TrackerPMU/training_cube.py
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CUBE_COLUMNS = ["Topic", "Segment", "Month", "Trainings", "Farmers_Reached"]
+MONTH_FORMATS = [f"{month}{sep}{year}" for month in ("%b", "%B") for year in ("%y", "%Y") for sep in ("'", "-", " ")]
+TOTAL_ROW_LABELS = {"total", "grand total"}
+WOMEN_SUFFIX = re.compile(r"\s*\(women\)\s*$", re.IGNORECASE)
+# Derived tables kept per cube; filter combinations beyond this evict the least recently used.
+PAYLOAD_CACHE_SIZE = 128
+
+
+def parse_month(label) -> Optional[pd.Timestamp]:
+    """Month start for a wide-format column label such as "Aug'23" or "Sept'22"; None for other columns."""
+    text = re.sub(r"^Sept\b", "Sep", str(label).strip())
+    for fmt in MONTH_FORMATS:
+        try:
+            return pd.Timestamp(pd.to_datetime(text, format=fmt))
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def build_cube(wide: pd.DataFrame, topic_column: str = "Training_Topic") -> pd.DataFrame:
+    """
+    Melts a wide topic x month training table into long (Topic, Segment, Month) rows.
+    "(Women)" topic suffixes become the Women segment, "Total" rows are dropped (totals are
+    recomputed from the cube), and Farmers_Reached is allocated per month from the row's
+    No_of_Farmers / Total_Training ratio when the table has those columns. Fractional
+    training counts are rounded to the nearest whole training.
+    """
+    months = {col: parse_month(col) for col in wide.columns}
+    month_columns = [col for col, month in months.items() if month is not None]
+    if topic_column not in wide.columns or not month_columns:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+
+    labels = wide[topic_column].astype(str).str.strip()
+    rows = wide[~labels.str.lower().isin(TOTAL_ROW_LABELS) & wide[topic_column].notna()]
+    labels = labels[rows.index]
+    is_women = labels.str.contains(WOMEN_SUFFIX)
+    topics = labels.str.replace(WOMEN_SUFFIX, "", regex=True).to_numpy(object)
+    segments = np.where(is_women, "Women", "All")
+
+    values = np.rint(rows[month_columns].apply(pd.to_numeric, errors="coerce").to_numpy(float))
+    if "No_of_Farmers" in rows.columns and "Total_Training" in rows.columns:
+        farmers = pd.to_numeric(rows["No_of_Farmers"], errors="coerce").to_numpy(float)
+        totals = pd.to_numeric(rows["Total_Training"], errors="coerce").to_numpy(float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_training = np.where(totals > 0, farmers / totals, np.nan)
+    else:
+        per_training = np.full(len(rows), np.nan)
+
+    width = len(month_columns)
+    cube = pd.DataFrame({
+        "Topic": np.repeat(topics, width),
+        "Segment": np.repeat(segments, width),
+        "Month": np.tile(np.array([months[col] for col in month_columns], dtype="datetime64[ns]"), len(rows)),
+        "Trainings": values.ravel(),
+        "Farmers_Reached": (values * per_training[:, None]).ravel(),
+    })
+    cube = cube[cube["Trainings"].notna()]
+    cube = cube.astype({"Topic": "category", "Segment": "category", "Trainings": "int64"})
+    return cube.sort_values(["Month", "Topic", "Segment"], kind="stable").reset_index(drop=True)
+
+
+Filters = Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp], Optional[Tuple[str, ...]], Optional[Tuple[str, ...]]]
+
+
+class TrainingCube:
+    """
+    Long-format training cube sorted by month. Date ranges are resolved by binary search,
+    and every derived table (totals, monthly trend, year-over-year) is cached per filter set,
+    so chart payloads are built once per dataset version rather than on every rerun. The
+    cache is bounded (PAYLOAD_CACHE_SIZE) and shared by every session holding the cube.
+    """
+
+    def __init__(self, cube: pd.DataFrame):
+        self.cube = cube
+        self._months = cube["Month"].to_numpy(dtype="datetime64[ns]")
+        self._payloads: "OrderedDict[Tuple[str, Filters], pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_wide(cls, wide: pd.DataFrame, topic_column: str = "Training_Topic") -> "TrainingCube":
+        return cls(build_cube(wide, topic_column))
+
+    def months(self) -> List[pd.Timestamp]:
+        return [pd.Timestamp(month) for month in np.unique(self._months)]
+
+    def topics(self) -> List[str]:
+        return sorted(self.cube["Topic"].dropna().unique().tolist())
+
+    def segments(self) -> List[str]:
+        return sorted(self.cube["Segment"].dropna().unique().tolist())
+
+    def _slice(self, filters: Filters) -> pd.DataFrame:
+        start, end, topics, segments = filters
+        lo = 0 if start is None else np.searchsorted(self._months, np.datetime64(start, "ns"), side="left")
+        hi = len(self._months) if end is None else np.searchsorted(self._months, np.datetime64(end, "ns"), side="right")
+        frame = self.cube.iloc[lo:hi]
+        if topics is not None:
+            frame = frame[frame["Topic"].isin(topics)]
+        if segments is not None:
+            frame = frame[frame["Segment"].isin(segments)]
+        return frame
+
+    def _cached(self, kind: str, filters: Filters, build: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        key = (kind, filters)
+        with self._lock:
+            if key in self._payloads:
+                self._payloads.move_to_end(key)
+                return self._payloads[key]
+            payload = self._payloads[key] = build(self._slice(filters))
+            if len(self._payloads) > PAYLOAD_CACHE_SIZE:
+                self._payloads.popitem(last=False)
+            return payload
+
+    def totals(self, start=None, end=None, topics=None, segments=None) -> pd.DataFrame:
+        """Trainings and farmers reached per topic over the filtered range."""
+        return self._cached("totals", (start, end, topics, segments), lambda frame: (
+            frame.groupby("Topic", observed=True)[["Trainings", "Farmers_Reached"]].sum(min_count=1)
+        ))
+
+    def monthly(self, start=None, end=None, topics=None, segments=None) -> pd.DataFrame:
+        """Trainings per month (rows) and topic (columns), for trend charts."""
+        return self._cached("monthly", (start, end, topics, segments), lambda frame: (
+            frame.pivot_table(index="Month", columns="Topic", values="Trainings", aggfunc="sum", observed=True)
+        ))
+
+    def year_over_year(self, topics=None, segments=None) -> pd.DataFrame:
+        """Trainings per calendar month (rows) and year (columns) across the whole cube."""
+        def build(frame: pd.DataFrame) -> pd.DataFrame:
+            table = frame.assign(Year=frame["Month"].dt.year, Month_No=frame["Month"].dt.month).pivot_table(
+                index="Month_No", columns="Year", values="Trainings", aggfunc="sum"
+            )
+            table.index = [pd.Timestamp(2000, month, 1).strftime("%b") for month in table.index]
+            return table
+        return self._cached("yoy", (None, None, topics, segments), build)
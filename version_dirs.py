@@ -0,0 +1,85 @@
+# TrackerPMU/version_dirs.py
+import contextlib
+import os
+import shutil
+import tempfile
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, only KEEP_PREVIOUS protects older readers
+    fcntl = None
+
+# Versions kept on disk besides the current one, for readers still on an older handle.
+# Versions a live handle holds a lease on are kept as well.
+KEEP_PREVIOUS = 1
+
+
+def _lease_path(root: str, version: str) -> str:
+    # Beside the version directory, not in it, so opening a lease never recreates a pruned directory.
+    return os.path.join(root, f".{version}.lease")
+
+
+def publish_dir(root: str, version: str, write: Callable[[str], None]) -> bool:
+    """
+    Creates `root/version` by calling `write` on a staging directory and renaming it into
+    place, so readers never see a partial version. Returns False when the version already
+    existed or another process published it first.
+    """
+    version_dir = os.path.join(root, version)
+    if os.path.isdir(version_dir):
+        return False
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=root, prefix=".staging-")
+    try:
+        write(staging)
+        os.rename(staging, version_dir)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(version_dir):
+            raise
+        return False
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return True
+
+
+def prune(root: str, keep: str):
+    """Removes all but the newest KEEP_PREVIOUS versions besides `keep`, skipping any a live handle leases."""
+    versions = [
+        name for name in os.listdir(root)
+        if name != keep and not name.startswith(".") and os.path.isdir(os.path.join(root, name))
+    ]
+    versions.sort(key=lambda name: os.path.getmtime(os.path.join(root, name)), reverse=True)
+    for name in versions[KEEP_PREVIOUS:]:
+        lease_path = _lease_path(root, name)
+        with open(lease_path, "a") as lease:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lease, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # still read by a handle in this or another process
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(lease_path)
+
+
+class VersionLease:
+    """
+    A shared lock on one version directory, held for as long as the read handle that owns it
+    (it is released when the handle is garbage collected). Raises FileNotFoundError when the
+    version has already been pruned.
+    """
+
+    def __init__(self, root: str, version: str):
+        lease = open(_lease_path(root, version), "a")
+        if fcntl is not None:
+            fcntl.flock(lease, fcntl.LOCK_SH)
+        # A prune may have removed the directory between the open and the lock.
+        if not os.path.isdir(os.path.join(root, version)):
+            lease.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(_lease_path(root, version))
+            raise FileNotFoundError(os.path.join(root, version))
+        self._file = lease
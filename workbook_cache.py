@@ -0,0 +1,382 @@
+# TrackerPMU/workbook_cache.py
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import excel_stream
+
+CACHE_DIR = ".workbook_cache"
+MANIFEST_FILE = "manifest.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """Returns the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stat_file(path: str) -> str:
+    name = os.path.basename(path)
+    return os.path.join(CACHE_DIR, f"{name}.stat.json")
+
+
+def write_json(path: str, payload: dict):
+    """Writes JSON through a temp file so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def workbook_key(path: str) -> str:
+    """
+    Returns the content hash of a workbook.
+    The hash is only recomputed when the file's mtime or size changes.
+    """
+    stat = os.stat(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    stat_path = _stat_file(path)
+    try:
+        with open(stat_path) as f:
+            known = json.load(f)
+        if known["mtime_ns"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+            return known["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    sha256 = file_digest(path)
+    write_json(stat_path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256})
+    return sha256
+
+
+def _entry_dir(sha256: str) -> str:
+    return os.path.join(CACHE_DIR, sha256[:16])
+
+
+def _column_names(columns) -> List[str]:
+    """Feather needs unique string column names; mirrors pandas' '.1' suffixing for clashes."""
+    names = []
+    seen = set()
+    for col in columns:
+        name = str(col)
+        candidate, n = name, 1
+        while candidate in seen:
+            candidate = f"{name}.{n}"
+            n += 1
+        seen.add(candidate)
+        names.append(candidate)
+    return names
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Makes a sheet frame storable as Arrow: string column names, and mixed-type
+    object columns (numbers next to labels) stored as text.
+    """
+    df = df.copy()
+    df.columns = _column_names(df.columns)
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    return df
+
+
+def _sheet_file(entry_dir: str, index: int) -> str:
+    return os.path.join(entry_dir, f"{index}.feather")
+
+
+def _entry_manifest(path: str, entry_dir: str, sha256: str) -> dict:
+    """Reads the entry's manifest (sheet names and header rows), creating it on first use."""
+    manifest_path = os.path.join(entry_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    digests = excel_stream.sheet_digests(path)
+    sheets = [
+        {"name": name, "columns": _column_names(header), "digest": digests.get(name)}
+        for name, header in excel_stream.read_headers(path).items()
+    ]
+    manifest = {"source": os.path.basename(path), "sha256": sha256, "sheets": sheets}
+    os.makedirs(entry_dir, exist_ok=True)
+    _adopt_unchanged_sheets(manifest, entry_dir)
+    write_json(manifest_path, manifest)
+    _prune_stale_entries(manifest["source"], sha256)
+    return manifest
+
+
+def _adopt_unchanged_sheets(manifest: dict, entry_dir: str):
+    """
+    Links the cached Feather files of sheets whose content digest matches a sheet in an older
+    version of the same workbook, so a re-uploaded workbook only reparses the sheets that changed.
+    """
+    wanted = {sheet["digest"]: index for index, sheet in enumerate(manifest["sheets"]) if sheet.get("digest")}
+    for name in os.listdir(CACHE_DIR):
+        old_dir = os.path.join(CACHE_DIR, name)
+        if not wanted or old_dir == entry_dir or not os.path.isfile(os.path.join(old_dir, MANIFEST_FILE)):
+            continue
+        try:
+            with open(os.path.join(old_dir, MANIFEST_FILE)) as f:
+                old = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if old.get("source") != manifest["source"]:
+            continue
+        for old_index, sheet in enumerate(old.get("sheets", [])):
+            index = wanted.get(sheet.get("digest"))
+            old_file = _sheet_file(old_dir, old_index)
+            if index is None or not os.path.isfile(old_file):
+                continue
+            try:
+                os.link(old_file, _sheet_file(entry_dir, index))
+            except FileExistsError:
+                pass
+            except OSError:
+                shutil.copyfile(old_file, _sheet_file(entry_dir, index))
+            del wanted[sheet["digest"]]
+
+
+def _common_type(name: str, current: pa.DataType, incoming: pa.DataType) -> pa.DataType:
+    """The type both chunks' values fit: numbers widen (int to float), anything else falls back to text."""
+    try:
+        schema = pa.unify_schemas(
+            [pa.schema([(name, current)]), pa.schema([(name, incoming)])], promote_options="permissive"
+        )
+        return schema.field(name).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.string()
+
+
+def _as_text(column: pa.ChunkedArray) -> pa.Array:
+    """Values as text the way normalize_frame writes them; whole floats print as the ints they were parsed from."""
+    return pa.array(
+        [None if v is None else str(int(v) if isinstance(v, float) and v.is_integer() else v) for v in column.to_pylist()],
+        pa.string(),
+    )
+
+
+def _conform(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Casts a chunk to the file's schema; columns it lacks or that are all null become typed nulls."""
+    arrays = []
+    for field in schema:
+        column = table.column(field.name) if field.name in table.column_names else None
+        if column is None or column.null_count == len(column):
+            arrays.append(pa.nulls(table.num_rows, field.type))
+        elif column.type == field.type:
+            arrays.append(column)
+        elif pa.types.is_string(field.type):
+            arrays.append(_as_text(column))
+        else:
+            arrays.append(column.cast(field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class _SheetWriter:
+    """
+    Writes a sheet's chunks to its Feather (Arrow IPC) file one record batch at a time, so a
+    parse never holds more than one chunk. Types are inferred per chunk; when a later chunk
+    needs a wider type than the file so far (decimals after whole numbers, text after numbers,
+    values in a so-far empty column), the schema widens and the written batches are recast.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.schema: Optional[pa.Schema] = None
+        self._empty: Set[str] = set()  # columns with no values so far
+        self._tmp_path = self._new_tmp()
+        self._writer = None
+
+    def _new_tmp(self) -> str:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.file_path), suffix=".tmp")
+        os.close(fd)
+        return tmp_path
+
+    def write(self, df: pd.DataFrame):
+        table = pa.Table.from_pandas(normalize_frame(df), preserve_index=False).replace_schema_metadata(None)
+        if self.schema is None:
+            self._empty = {name for name in table.column_names if table.column(name).null_count == len(table.column(name))}
+            self._open(table.schema)
+        else:
+            schema = self._widen(table)
+            if not schema.equals(self.schema):
+                self._rewrite(schema)
+        self._writer.write_table(_conform(table, self.schema))
+
+    def _widen(self, table: pa.Table) -> pa.Schema:
+        fields = []
+        for field in self.schema:
+            if field.name not in table.column_names:
+                fields.append(field)
+                continue
+            column = table.column(field.name)
+            if column.null_count == len(column):
+                fields.append(field)
+            elif field.name in self._empty:
+                self._empty.discard(field.name)
+                fields.append(pa.field(field.name, column.type))
+            else:
+                fields.append(pa.field(field.name, _common_type(field.name, field.type, column.type)))
+        for name in table.column_names:
+            if name not in self.schema.names:
+                column = table.column(name)
+                if column.null_count == len(column):
+                    self._empty.add(name)
+                fields.append(pa.field(name, column.type))
+        return pa.schema(fields)
+
+    def _open(self, schema: pa.Schema):
+        self.schema = schema
+        self._writer = pa.ipc.new_file(self._tmp_path, schema)
+
+    def _rewrite(self, schema: pa.Schema):
+        """Recasts the batches written so far into a new file with the wider schema."""
+        self._writer.close()
+        old_path, self._tmp_path = self._tmp_path, self._new_tmp()
+        self._open(schema)
+        with pa.memory_map(old_path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                self._writer.write_table(_conform(pa.Table.from_batches([reader.get_batch(i)]), schema))
+        os.remove(old_path)
+
+    def close(self):
+        self._writer.close()
+        os.replace(self._tmp_path, self.file_path)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._tmp_path)
+
+
+def _write_sheet(file_path: str, chunks: Iterable[pd.DataFrame]):
+    """Streams a sheet's parsed chunks into its Feather file; the file only appears once complete."""
+    writer = _SheetWriter(file_path)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def _parse_sheets(path: str, missing: Dict[str, str], dtypes: Optional[Dict[str, Dict[str, str]]]):
+    """Streams the `missing` sheets (name -> Feather file) into the cache in one pass over the workbook."""
+    pending = dict(missing)
+    try:
+        for name, chunks in excel_stream.iter_sheets(path, list(pending), dtypes=dtypes):
+            _write_sheet(pending[name], chunks)
+            del pending[name]
+    except (ValueError, TypeError):
+        if not dtypes:
+            raise
+        # A dtype no longer fits the data (e.g. text in a once-numeric column): infer the rest instead.
+        for name, chunks in excel_stream.iter_sheets(path, list(pending)):
+            _write_sheet(pending.pop(name), chunks)
+
+
+def _prune_stale_entries(source: str, keep_sha256: str):
+    """Removes cache entries built from older versions of the same workbook."""
+    for name in os.listdir(CACHE_DIR):
+        entry_dir = os.path.join(CACHE_DIR, name)
+        manifest_path = os.path.join(entry_dir, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            continue
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if manifest.get("source") == source and manifest.get("sha256") != keep_sha256:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+def load_headers(path: str) -> Dict[str, List[str]]:
+    """Returns each sheet's column names from the workbook's header rows, without loading sheet data."""
+    sha256 = workbook_key(path)
+    manifest = _entry_manifest(path, _entry_dir(sha256), sha256)
+    return {sheet["name"]: sheet["columns"] for sheet in manifest["sheets"]}
+
+
+def is_sheet_cached(path: str, sheet_name: str) -> bool:
+    """Tells whether a sheet of the current workbook version is already in the columnar cache."""
+    sha256 = workbook_key(path)
+    entry_dir = _entry_dir(sha256)
+    manifest = _entry_manifest(path, entry_dir, sha256)
+    for index, sheet in enumerate(manifest["sheets"]):
+        if sheet["name"] == sheet_name:
+            return os.path.isfile(_sheet_file(entry_dir, index))
+    return False
+
+
+def _read_cached(file_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    # Uncompressed Feather files are memory-mapped, so only the touched columns are paged in.
+    return feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+
+
+def load_workbook(
+    path: str,
+    sheet_names: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    dtypes: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Loads workbook sheets as DataFrames, going through the columnar cache.
+    Each sheet is parsed (with the streaming reader) only the first time it is requested
+    after the workbook changes; later loads from any process memory-map its Feather file.
+    `columns` optionally limits which columns are read per sheet, and `dtypes` gives
+    per-sheet column dtypes to apply when parsing instead of inferring them.
+    """
+    sha256 = workbook_key(path)
+    entry_dir = _entry_dir(sha256)
+    manifest = _entry_manifest(path, entry_dir, sha256)
+    columns = columns or {}
+
+    frames = {}
+    missing = {}
+    wanted_columns = {}
+    for index, sheet in enumerate(manifest["sheets"]):
+        name = sheet["name"]
+        if sheet_names is not None and name not in sheet_names:
+            continue
+        file_path = _sheet_file(entry_dir, index)
+        wanted = columns.get(name)
+        if wanted is not None:
+            wanted = [c for c in sheet["columns"] if c in wanted]
+        wanted_columns[name] = wanted
+        if os.path.isfile(file_path):
+            try:
+                frames[name] = _read_cached(file_path, wanted)
+                continue
+            except (OSError, pa.ArrowException):
+                # A concurrent prune may already have removed the file.
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(file_path)
+        missing[name] = file_path
+
+    if missing:
+        # Sheets not cached yet are streamed chunk by chunk into the cache, then mapped like the rest.
+        _parse_sheets(path, missing, dtypes)
+        for name, file_path in missing.items():
+            frames[name] = _read_cached(file_path, wanted_columns[name])
+    return {sheet["name"]: frames[sheet["name"]] for sheet in manifest["sheets"] if sheet["name"] in frames}
@@ -0,0 +1,91 @@
+# TrackerPMU/workbook_watcher.py
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+POLL_SECONDS = 2.0
+
+FileState = Optional[Tuple[int, int]]  # (mtime_ns, size), None when the file is missing
+
+
+def _state(path: str) -> FileState:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WorkbookWatcher:
+    """
+    Polls source workbooks and calls `on_change(paths)` from a background thread once a
+    changed file has settled (same mtime and size on two consecutive polls, so a copy or
+    upload still in progress is not picked up half-written). Polling is used rather than
+    inotify so it also works on network mounts and without extra dependencies.
+    """
+
+    def __init__(
+        self,
+        paths: Callable[[], List[str]],
+        on_change: Callable[[List[str]], None],
+        interval: float = POLL_SECONDS,
+    ):
+        self._paths = paths
+        self._on_change = on_change
+        self._interval = interval
+        self._handled: Dict[str, FileState] = {}
+        self._seen: Dict[str, FileState] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_refresh: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self) -> "WorkbookWatcher":
+        """
+        Starts polling. The first poll reports every existing workbook, so the caller can
+        reconcile anything that changed while nothing was watching.
+        """
+        if self._thread is None:
+            for path in self._paths():
+                self._seen[path] = _state(path)
+            self._thread = threading.Thread(target=self._run, name="workbook-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self) -> List[str]:
+        """Returns the workbooks that changed since they were last handled and have settled."""
+        changed = []
+        for path in self._paths():
+            state = _state(path)
+            settled = state == self._seen.get(path)
+            self._seen[path] = state
+            if state is None:
+                # Deleted: nothing to ingest, but a restored copy counts as a change again.
+                self._handled.pop(path, None)
+            elif settled and state != self._handled.get(path):
+                changed.append(path)
+        return changed
+
+    def run_once(self) -> List[str]:
+        """One poll: passes the settled changes to `on_change` and marks them handled once it succeeds."""
+        changed = self.poll_once()
+        if not changed:
+            return changed
+        try:
+            self._on_change(changed)
+        except Exception as e:  # keep watching; the next poll retries
+            self.last_error = f"{type(e).__name__}: {e}"
+            return []
+        for path in changed:
+            self._handled[path] = self._seen[path]
+        self.last_refresh = time.time()
+        self.last_error = None
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self.run_once()
@@ -0,0 +1,83 @@
+# TrackerPMU/workplan_aggregates.py
+from datetime import date
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+PERIODS = ["day", "week", "month", "quarter"]
+SUMMARY_COLUMNS = ['Field Team Member', 'Activity', 'Total_Target', 'Total_Achieved']
+
+Totals = Dict[Tuple[str, str], List[int]]  # (member, activity) -> [target, achieved, entries]
+
+
+def period_key(day: date, period: str) -> str:
+    """Key of the period containing `day`, e.g. '2025-W03', '2025-01', '2025Q1'."""
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        iso = day.isocalendar()
+        return f"{iso[0]}-W{iso[1]:02d}"
+    if period == "month":
+        return f"{day.year}-{day.month:02d}"
+    if period == "quarter":
+        return f"{day.year}Q{(day.month - 1) // 3 + 1}"
+    raise ValueError(f"Unknown period: {period}")
+
+
+def period_keys(dates: pd.Series, period: str) -> pd.Series:
+    """Vectorized period_key over a datetime64 Series."""
+    if period == "day":
+        return dates.dt.strftime('%Y-%m-%d')
+    if period == "week":
+        iso = dates.dt.isocalendar()
+        return iso['year'].astype(str) + "-W" + iso['week'].astype(str).str.zfill(2)
+    if period == "month":
+        return dates.dt.strftime('%Y-%m')
+    if period == "quarter":
+        return dates.dt.year.astype(str) + "Q" + dates.dt.quarter.astype(str)
+    raise ValueError(f"Unknown period: {period}")
+
+
+class WorkplanAggregates:
+    """
+    Target/Achieved totals per period, member and activity for every period in PERIODS.
+    Built once with vectorized group-bys, then kept current by applying per-entry deltas,
+    so a rollup costs O(members x activities) however much history is held.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._totals: Dict[str, Dict[str, Totals]] = {period: {} for period in PERIODS}
+        if df.empty:
+            return
+        dates = pd.to_datetime(df['Date'])
+        for period in PERIODS:
+            grouped = df.groupby(
+                [period_keys(dates, period), df['Field Team Member'], df['Activity']]
+            ).agg(target=('Target', 'sum'), achieved=('Achieved', 'sum'), entries=('Target', 'size'))
+            table = self._totals[period]
+            for (key, member, activity), (target, achieved, entries) in zip(grouped.index, grouped.to_numpy()):
+                table.setdefault(key, {})[(member, activity)] = [int(target), int(achieved), int(entries)]
+
+    def apply(self, day: date, member: str, activity: str, target_delta: int, achieved_delta: int, entries_delta: int):
+        """
+        Adds one entry's change in Target/Achieved to every period containing `day`.
+        `entries_delta` is 1 for a new entry and -1 for a deleted one; a member/activity
+        left with no entries in a period drops out of its rollup.
+        """
+        for period in PERIODS:
+            key = period_key(day, period)
+            totals = self._totals[period].setdefault(key, {})
+            cell = totals.setdefault((member, activity), [0, 0, 0])
+            cell[0] += target_delta
+            cell[1] += achieved_delta
+            cell[2] += entries_delta
+            if cell[2] <= 0:
+                del totals[(member, activity)]
+                if not totals:
+                    del self._totals[period][key]
+
+    def rollup(self, period: str, day: date) -> pd.DataFrame:
+        """Totals per member and activity for the period containing `day`."""
+        totals = self._totals[period].get(period_key(day, period), {})
+        rows = [(member, activity, target, achieved) for (member, activity), (target, achieved, _) in sorted(totals.items())]
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
@@ -0,0 +1,114 @@
+# TrackerPMU/workplan_export.py
+import gzip
+import io
+import threading
+from typing import Callable, Dict, Tuple
+
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from workplan_store import WorkplanStore
+
+# Rows serialized per chunk, so no full-size intermediate text or table is built.
+CHUNK_ROWS = 10000
+
+# Format label -> (file extension, MIME type)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        yield start, df.iloc[start:start + CHUNK_ROWS]
+
+
+def _write_csv(df: pd.DataFrame, out):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    for start, chunk in _chunks(df):
+        chunk.to_csv(text, header=start == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(df: pd.DataFrame, out):
+    writer = None
+    for _, chunk in _chunks(df):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+        writer.write_table(table)
+    writer.close()
+
+
+def _write_xlsx(df: pd.DataFrame, out):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Workplans")
+    sheet.append([str(col) for col in df.columns])
+    for _, chunk in _chunks(df):
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(out)
+
+
+def serialize(df: pd.DataFrame, fmt: str) -> bytes:
+    """Serializes a frame in one of EXPORT_FORMATS, writing it chunk by chunk."""
+    out = io.BytesIO()
+    if fmt == "CSV":
+        _write_csv(df, out)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=out, mode="wb") as compressed:
+            _write_csv(df, compressed)
+    elif fmt == "Parquet":
+        _write_parquet(df, out)
+    elif fmt == "Excel":
+        _write_xlsx(df, out)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return out.getvalue()
+
+
+def file_name(stem: str, fmt: str) -> str:
+    return f"{stem}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def mime_type(fmt: str) -> str:
+    return EXPORT_FORMATS[fmt][1]
+
+
+class ExportCache:
+    """
+    Serialized export payloads keyed by (name, format), each tagged with the workplan
+    revision it was built from. A payload is built the first time it is downloaded and
+    reused until the revision moves on; nothing is serialized on ordinary reruns.
+    """
+
+    def __init__(self):
+        self._payloads: Dict[Tuple[str, str], Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, fmt: str, store: WorkplanStore, build: Callable[[], pd.DataFrame]) -> bytes:
+        """
+        Returns the payload for the store's current revision, building it from `build()` if needed.
+        The revision is read and the frame built under the store's lock, so a save landing in
+        between can never be cached under the older revision.
+        """
+        with self._lock:
+            with store.lock:
+                revision = store.revision
+                cached = self._payloads.get((name, fmt))
+                if cached is not None and cached[0] == revision:
+                    return cached[1]
+                df = build()
+            payload = serialize(df, fmt)
+            self._payloads[(name, fmt)] = (revision, payload)
+            return payload
+
+    def lazy(self, name: str, fmt: str, store: WorkplanStore, build: Callable[[], pd.DataFrame]) -> Callable[[], bytes]:
+        """A zero-argument callable for st.download_button's deferred `data`; it reads the store when clicked."""
+        return lambda: self.get(name, fmt, store, build)
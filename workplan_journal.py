@@ -0,0 +1,150 @@
+# TrackerPMU/workplan_journal.py
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-writer deployments only
+    fcntl = None
+
+WORKPLAN_COLUMNS = ['Date', 'Field Team Member', 'Activity', 'Target', 'Achieved']
+WORKPLAN_KEY = ['Date', 'Field Team Member', 'Activity']
+
+# Fold the journal into the snapshot once it grows past this size.
+COMPACT_THRESHOLD_BYTES = 256 * 1024
+
+_compacting = threading.Lock()
+
+
+def _journal_path(snapshot_path: str) -> str:
+    return snapshot_path + ".journal"
+
+
+@contextmanager
+def _locked(snapshot_path: str, exclusive: bool):
+    """Holds an advisory lock shared by every process using this workplan store."""
+    with open(snapshot_path + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _count(entry: dict, column: str) -> int:
+    """A Target/Achieved cell as an int. Blank or fractional cells are rejected before anything is written."""
+    value = entry[column]
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = float("nan")
+    if not number.is_integer():
+        raise ValueError(
+            f"{column} for {entry['Field Team Member']} / {entry['Activity']} on {entry['Date']} "
+            f"must be a whole number, got {value!r}"
+        )
+    return int(number)
+
+
+def _record(row: dict) -> str:
+    entry = {col: row[col] for col in WORKPLAN_COLUMNS}
+    if isinstance(entry['Date'], date):
+        entry['Date'] = entry['Date'].isoformat()
+    entry['Target'] = _count(entry, 'Target')
+    entry['Achieved'] = _count(entry, 'Achieved')
+    return json.dumps(entry)
+
+
+def _drop_torn_tail(f):
+    """Cuts a partial last line left by an interrupted write, so the next record starts on a line of its own."""
+    end = f.seek(0, os.SEEK_END)
+    if end == 0:
+        return
+    f.seek(end - 1)
+    if f.read(1) == b"\n":
+        return
+    pos = end
+    while pos > 0:
+        start = max(0, pos - 4096)
+        f.seek(start)
+        newline = f.read(pos - start).rfind(b"\n")
+        if newline != -1:
+            f.truncate(start + newline + 1)
+            return
+        pos = start
+    f.truncate(0)
+
+
+def _replay(snapshot_path: str) -> pd.DataFrame:
+    """Snapshot rows followed by journal upserts; the last write for a key wins."""
+    frames = []
+    if os.path.exists(snapshot_path):
+        frames.append(pd.read_csv(snapshot_path))
+
+    journal_path = _journal_path(snapshot_path)
+    if os.path.exists(journal_path):
+        entries = []
+        with open(journal_path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # torn final line from an interrupted write
+        if entries:
+            frames.append(pd.DataFrame(entries, columns=WORKPLAN_COLUMNS))
+
+    if not frames:
+        return pd.DataFrame(columns=WORKPLAN_COLUMNS)
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df['Date'] = pd.to_datetime(df['Date']).dt.date
+    return df.drop_duplicates(subset=WORKPLAN_KEY, keep='last').reset_index(drop=True)
+
+
+def load(snapshot_path: str) -> pd.DataFrame:
+    """Loads all workplans: the compacted snapshot plus any journaled upserts since."""
+    with _locked(snapshot_path, exclusive=False):
+        return _replay(snapshot_path)
+
+
+def append(snapshot_path: str, rows: pd.DataFrame):
+    """
+    Journals upserted workplan rows. Cost is proportional to the rows changed, not the
+    history size, and the exclusive lock keeps concurrent savers from interleaving.
+    """
+    lines = "".join(_record(row) + "\n" for row in rows.to_dict('records')).encode()
+    journal_path = _journal_path(snapshot_path)
+    with _locked(snapshot_path, exclusive=True):
+        with open(journal_path, "a+b") as f:
+            _drop_torn_tail(f)
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        journal_size = os.path.getsize(journal_path)
+
+    if journal_size > COMPACT_THRESHOLD_BYTES:
+        threading.Thread(target=compact, args=(snapshot_path,), daemon=True).start()
+
+
+def compact(snapshot_path: str):
+    """Rewrites the snapshot with the journal folded in, then empties the journal."""
+    if not _compacting.acquire(blocking=False):
+        return  # a compaction is already running in this process
+    try:
+        with _locked(snapshot_path, exclusive=True):
+            df = _replay(snapshot_path)
+            directory = os.path.dirname(os.path.abspath(snapshot_path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                df.to_csv(f, index=False)
+            os.replace(tmp_path, snapshot_path)
+            open(_journal_path(snapshot_path), "w").close()
+    finally:
+        _compacting.release()
@@ -0,0 +1,104 @@
+# TrackerPMU/workplan_store.py
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from workplan_aggregates import WorkplanAggregates
+from workplan_journal import WORKPLAN_COLUMNS, WORKPLAN_KEY
+
+MemberActivity = Tuple[str, str]
+TargetAchieved = Tuple[int, int]
+
+
+class WorkplanStore:
+    """
+    Daily workplans indexed by date, then (member, activity).
+    Point lookups and day views are dict hits, arbitrary date ranges bisect a sorted date
+    list, week/month/quarter totals come from the incrementally maintained aggregates,
+    and upserts touch only the affected keys and period totals.
+    Upserts and deletes hold `lock`; a reader that needs a view consistent with `revision`
+    (e.g. a download built on another thread) holds it too.
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        self._by_date: Dict[date, Dict[MemberActivity, TargetAchieved]] = {}
+        self._dates: List[date] = []
+        self._size = 0
+        self.revision = 0
+        self.lock = threading.RLock()
+        df = df if df is not None else pd.DataFrame(columns=WORKPLAN_COLUMNS)
+        # As with upserts, the last row for a key wins; the aggregates must not count the others.
+        df = df.drop_duplicates(subset=WORKPLAN_KEY, keep='last')
+        self.aggregates = WorkplanAggregates(df)
+        if not df.empty:
+            self._index(df)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, day: date, member: str, activity: str) -> Optional[TargetAchieved]:
+        """Returns (Target, Achieved) for one entry, or None."""
+        return self._by_date.get(day, {}).get((member, activity))
+
+    def _index(self, df: pd.DataFrame) -> List[Tuple[date, str, str, int, int, int]]:
+        """Indexes rows and returns each one's (Target, Achieved, entry count) change."""
+        deltas = []
+        for day, member, activity, target, achieved in df[WORKPLAN_COLUMNS].itertuples(index=False):
+            entries = self._by_date.get(day)
+            if entries is None:
+                entries = self._by_date[day] = {}
+                insort(self._dates, day)
+            old_target, old_achieved = entries.get((member, activity), (0, 0))
+            is_new = (member, activity) not in entries
+            if is_new:
+                self._size += 1
+            entries[(member, activity)] = (int(target), int(achieved))
+            deltas.append((day, member, activity, int(target) - old_target, int(achieved) - old_achieved, int(is_new)))
+        return deltas
+
+    def upsert(self, df: pd.DataFrame):
+        """Inserts or replaces rows keyed by (Date, Field Team Member, Activity)."""
+        with self.lock:
+            for delta in self._index(df):
+                self.aggregates.apply(*delta)
+            self.revision += 1
+
+    def delete(self, day: date, member: str, activity: str) -> bool:
+        """Removes one entry; returns False when there was none."""
+        with self.lock:
+            entries = self._by_date.get(day, {})
+            if (member, activity) not in entries:
+                return False
+            target, achieved = entries.pop((member, activity))
+            if not entries:
+                del self._by_date[day]
+                self._dates.pop(bisect_left(self._dates, day))
+            self._size -= 1
+            self.aggregates.apply(day, member, activity, -target, -achieved, -1)
+            self.revision += 1
+            return True
+
+    def _frame(self, days: List[date]) -> pd.DataFrame:
+        rows = [
+            (day, member, activity, target, achieved)
+            for day in days
+            for (member, activity), (target, achieved) in self._by_date[day].items()
+        ]
+        return pd.DataFrame(rows, columns=WORKPLAN_COLUMNS)
+
+    def day(self, day: date) -> pd.DataFrame:
+        """All entries for one date."""
+        return self._frame([day] if day in self._by_date else [])
+
+    def range(self, start: date, end: date) -> pd.DataFrame:
+        """All entries with start <= Date <= end, in date order."""
+        lo = bisect_left(self._dates, start)
+        hi = bisect_right(self._dates, end)
+        return self._frame(self._dates[lo:hi])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Every entry, in date order."""
+        return self._frame(self._dates)